@@ -92,7 +92,13 @@ setuptools.setup(
     author_email="david@drmaciver.com",
     packages=setuptools.find_packages(SOURCE),
     package_dir={"": SOURCE},
-    package_data={"hypothesis": ["py.typed", "vendor/tlds-alpha-by-domain.txt"]},
+    package_data={
+        "hypothesis": [
+            "py.typed",
+            "vendor/tlds-alpha-by-domain.txt",
+            "internal/unicode_data/*.bin",
+        ]
+    },
     url="https://github.com/HypothesisWorks/hypothesis/tree/master/hypothesis-python",
     project_urls={
         "Website": "https://hypothesis.works",
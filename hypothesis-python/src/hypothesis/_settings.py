@@ -159,6 +159,9 @@ class settings(metaclass=settingsMeta):
         suppress_health_check: Collection["HealthCheck"] = not_set,  # type: ignore
         deadline: Union[None, int, float, datetime.timedelta] = not_set,  # type: ignore
         print_blob: bool = not_set,  # type: ignore
+        workers: int = not_set,  # type: ignore
+        persist_tree: bool = not_set,  # type: ignore
+        shrink_time_budget: Union[None, int, float, datetime.timedelta] = not_set,  # type: ignore
     ) -> None:
         if parent is not None:
             check_type(settings, parent, "parent")
@@ -651,6 +654,94 @@ The default is ``True`` if the ``CI`` or ``TF_BUILD`` env vars are set, ``False`
 """,
 )
 
+
+def _validate_workers(x):
+    check_type(int, x, name="workers")
+    if x < 1:
+        raise InvalidArgument(f"workers={x!r} must be at least one.")
+    return x
+
+
+settings._define_setting(
+    "workers",
+    default=1,
+    validator=_validate_workers,
+    description="""
+The number of processes to use when generating new examples.  If greater than
+one, and the platform supports forking, Hypothesis will run batches of
+generated test cases in a pool of forked worker processes, and merge their
+results back into the main process.  Failing and targeted examples are always
+re-run in the main process, and shrinking is single-process and deterministic.
+
+This is only worth enabling for tests where most of the time is spent in the
+body of the test rather than in data generation, and where the test does not
+depend on in-process side effects.
+""",
+)
+
+
+settings._define_setting(
+    "persist_tree",
+    default=False,
+    options=(True, False),
+    description="""
+If set to ``True``, and a database is in use, Hypothesis saves a summary of the
+test cases it has tried to the database at the end of each run, and uses it to
+steer the next run towards inputs that earlier runs have not tried.  This costs
+one extra database write per run, and is most useful for tests which are run
+often with the same database, such as in CI.
+""",
+)
+
+
+def _validate_shrink_time_budget(x):
+    if x is None:
+        return x
+    invalid_budget_error = InvalidArgument(
+        f"shrink_time_budget={x!r} (type {type(x).__name__}) must be a timedelta "
+        "object, an integer or float number of seconds, or None to shrink for "
+        "as long as it takes."
+    )
+    if isinstance(x, (int, float)):
+        if isinstance(x, bool):
+            raise invalid_budget_error
+        try:
+            x = duration(seconds=x)
+        except OverflowError:
+            raise InvalidArgument(
+                f"shrink_time_budget={x!r} is invalid, because it is too large to "
+                "represent as a timedelta. Use shrink_time_budget=None to disable "
+                "the limit."
+            ) from None
+    if isinstance(x, datetime.timedelta):
+        if x <= datetime.timedelta(0):
+            raise InvalidArgument(
+                f"shrink_time_budget={x!r} is invalid, because it must be positive. "
+                "Use phases to skip the shrink phase entirely."
+            )
+        return duration(seconds=x.total_seconds())
+    raise invalid_budget_error
+
+
+settings._define_setting(
+    "shrink_time_budget",
+    default=duration(minutes=5),
+    validator=_validate_shrink_time_budget,
+    description="""
+If set, a duration (as timedelta, or integer or float number of seconds) after
+which Hypothesis stops shrinking a failing example and reports the smallest
+example it has found so far.  If a database is in use, the next run resumes
+shrinking from where this one stopped, so a short budget still leads to a
+fully shrunk example over repeated runs.
+
+With a budget of a minute or less, Hypothesis runs its cheapest shrink passes
+to a fixed point before trying the others, so that as much progress as
+possible is made before the budget runs out.
+
+Set this to ``None`` to shrink for as long as it takes.
+""",
+)
+
 settings.lock_further_definitions()
 
 
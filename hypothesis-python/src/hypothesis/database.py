@@ -17,20 +17,24 @@ import abc
 import binascii
 import os
 import sys
+import time
 import warnings
+from contextlib import contextmanager
 from hashlib import sha384
-from typing import Iterable
+from typing import Dict, Iterable, Iterator, List, Tuple
 
 from hypothesis.configuration import mkdir_p, storage_directory
-from hypothesis.errors import HypothesisException, HypothesisWarning
+from hypothesis.errors import HypothesisException, HypothesisWarning, InvalidArgument
 from hypothesis.utils.conventions import not_set
 
 __all__ = [
+    "BufferedExampleDatabase",
     "DirectoryBasedExampleDatabase",
     "ExampleDatabase",
     "InMemoryExampleDatabase",
     "MultiplexedDatabase",
     "ReadOnlyDatabase",
+    "SQLiteExampleDatabase",
 ]
 
 
@@ -137,6 +141,26 @@ class ExampleDatabase(metaclass=_EDMeta):
         self.delete(src, value)
         self.save(dest, value)
 
+    def fetch_many(self, keys: Iterable[bytes]) -> Dict[bytes, List[bytes]]:
+        """Return a dict mapping each of ``keys`` to a list of all values
+        matching that key.  Equivalent to calling ``fetch`` for each key, but
+        may have a more efficient implementation."""
+        return {key: list(self.fetch(key)) for key in keys}
+
+    def save_many(self, items: Iterable[Tuple[bytes, bytes]]) -> None:
+        """Save each ``value`` under ``key`` for each ``(key, value)`` pair in
+        ``items``.  Equivalent to calling ``save`` for each pair, but may have
+        a more efficient implementation."""
+        for key, value in items:
+            self.save(key, value)
+
+    def delete_many(self, items: Iterable[Tuple[bytes, bytes]]) -> None:
+        """Remove each ``value`` from ``key`` for each ``(key, value)`` pair in
+        ``items``.  Equivalent to calling ``delete`` for each pair, but may
+        have a more efficient implementation."""
+        for key, value in items:
+            self.delete(key, value)
+
 
 class InMemoryExampleDatabase(ExampleDatabase):
     """A non-persistent example database, implemented in terms of a dict of sets.
@@ -220,6 +244,9 @@ class DirectoryBasedExampleDatabase(ExampleDatabase):
         # already checked for permissions, but there can still be other issues,
         # e.g. the disk is full
         mkdir_p(self._key_path(key))
+        self._save_value(key, value)
+
+    def _save_value(self, key, value):
         path = self._value_path(key, value)
         if not os.path.exists(path):
             suffix = binascii.hexlify(os.urandom(16)).decode("ascii")
@@ -232,6 +259,37 @@ class DirectoryBasedExampleDatabase(ExampleDatabase):
                 os.unlink(tmpname)
             assert not os.path.exists(tmpname)
 
+    def fetch_many(self, keys: Iterable[bytes]) -> Dict[bytes, List[bytes]]:
+        # Only list each key directory once, however often the key is given.
+        result: Dict[bytes, List[bytes]] = {}
+        for key in keys:
+            if key not in result:
+                result[key] = list(self.fetch(key))
+        return result
+
+    def save_many(self, items: Iterable[Tuple[bytes, bytes]]) -> None:
+        # Only try to create each key directory once, rather than for every
+        # value saved under that key.
+        by_key: Dict[bytes, List[bytes]] = {}
+        for key, value in items:
+            by_key.setdefault(key, []).append(value)
+        for key, values in by_key.items():
+            mkdir_p(self._key_path(key))
+            for value in values:
+                self._save_value(key, value)
+
+    def delete_many(self, items: Iterable[Tuple[bytes, bytes]]) -> None:
+        # Skip every value under a key whose directory doesn't exist with a
+        # single check, rather than failing to delete each of them.
+        by_key: Dict[bytes, List[bytes]] = {}
+        for key, value in items:
+            by_key.setdefault(key, []).append(value)
+        for key, values in by_key.items():
+            if not os.path.isdir(self._key_path(key)):
+                continue
+            for value in values:
+                self.delete(key, value)
+
     def move(self, src: bytes, dest: bytes, value: bytes) -> None:
         if src == dest:
             self.save(src, value)
@@ -249,6 +307,160 @@ class DirectoryBasedExampleDatabase(ExampleDatabase):
             pass
 
 
+class SQLiteExampleDatabase(ExampleDatabase):
+    """Store Hypothesis examples in a single SQLite database file.
+
+    This is a drop-in alternative to
+    :class:`~hypothesis.database.DirectoryBasedExampleDatabase` for large
+    projects, where one file per example can be slow on networked filesystems
+    and bloats caches on CI.  The database uses SQLite's write-ahead log, so
+    it is safe for several processes to share a database file, and you can
+    group many writes into a single transaction with
+    :meth:`~hypothesis.database.SQLiteExampleDatabase.batch`.
+
+    Keys are stored hashed in the same way as by
+    :class:`~hypothesis.database.DirectoryBasedExampleDatabase`, so that an
+    existing directory database can be imported with
+    :meth:`~hypothesis.database.SQLiteExampleDatabase.migrate_from`.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = str(path)
+        self._connection = None
+        self._connection_pid = None
+        self._batch_depth = 0
+
+    def __repr__(self) -> str:
+        return f"SQLiteExampleDatabase({self.path!r})"
+
+    @property
+    def _db(self):
+        # A connection can't be shared with a forked child process, so we
+        # open a new one the first time we're used in each process.
+        if self._connection is None or self._connection_pid != os.getpid():
+            import sqlite3
+
+            if self.path != ":memory:":
+                mkdir_p(os.path.dirname(os.path.abspath(self.path)))
+            connection = sqlite3.connect(
+                self.path, isolation_level=None, check_same_thread=False
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS examples ("
+                "key TEXT NOT NULL, value BLOB NOT NULL, PRIMARY KEY (key, value)"
+                ") WITHOUT ROWID"
+            )
+            self._connection = connection
+            self._connection_pid = os.getpid()
+            self._batch_depth = 0
+        return self._connection
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Context manager which runs every write inside it in a single
+        transaction, committed on exit, or rolled back if it exits with an
+        exception.  Batches may be nested, in which case the outermost batch
+        commits or rolls back."""
+        db = self._db
+        if self._batch_depth == 0:
+            db.execute("BEGIN")
+        self._batch_depth += 1
+        try:
+            yield
+        except BaseException:
+            if self._batch_depth == 1:
+                db.execute("ROLLBACK")
+            raise
+        else:
+            if self._batch_depth == 1:
+                db.execute("COMMIT")
+        finally:
+            self._batch_depth -= 1
+
+    def fetch(self, key: bytes) -> Iterable[bytes]:
+        rows = self._db.execute(
+            "SELECT value FROM examples WHERE key = ?", (_hash(key),)
+        ).fetchall()
+        for (value,) in rows:
+            yield bytes(value)
+
+    def save(self, key: bytes, value: bytes) -> None:
+        self._db.execute(
+            "INSERT OR IGNORE INTO examples VALUES (?, ?)", (_hash(key), bytes(value))
+        )
+
+    def delete(self, key: bytes, value: bytes) -> None:
+        self._db.execute(
+            "DELETE FROM examples WHERE key = ? AND value = ?",
+            (_hash(key), bytes(value)),
+        )
+
+    def move(self, src: bytes, dest: bytes, value: bytes) -> None:
+        with self.batch():
+            super().move(src, dest, value)
+
+    def fetch_many(self, keys: Iterable[bytes]) -> Dict[bytes, List[bytes]]:
+        keys = list(keys)
+        result: Dict[bytes, List[bytes]] = {key: [] for key in keys}
+        by_hash = {_hash(key): key for key in keys}
+        if not by_hash:
+            return result
+        rows = self._db.execute(
+            "SELECT key, value FROM examples WHERE key IN ({})".format(
+                ", ".join("?" * len(by_hash))
+            ),
+            list(by_hash),
+        ).fetchall()
+        for hashed_key, value in rows:
+            result[by_hash[hashed_key]].append(bytes(value))
+        return result
+
+    def save_many(self, items: Iterable[Tuple[bytes, bytes]]) -> None:
+        with self.batch():
+            self._db.executemany(
+                "INSERT OR IGNORE INTO examples VALUES (?, ?)",
+                [(_hash(key), bytes(value)) for key, value in items],
+            )
+
+    def delete_many(self, items: Iterable[Tuple[bytes, bytes]]) -> None:
+        with self.batch():
+            self._db.executemany(
+                "DELETE FROM examples WHERE key = ? AND value = ?",
+                [(_hash(key), bytes(value)) for key, value in items],
+            )
+
+    def migrate_from(self, other: DirectoryBasedExampleDatabase) -> None:
+        """Import every example from ``other``, a
+        :class:`~hypothesis.database.DirectoryBasedExampleDatabase`, into this
+        database in a single transaction.  ``other`` is left unchanged."""
+        if not isinstance(other, DirectoryBasedExampleDatabase):
+            raise InvalidArgument(
+                f"Can only migrate from a DirectoryBasedExampleDatabase, not {other!r}"
+            )
+        if not os.path.isdir(other.path):
+            return
+        with self.batch():
+            for hashed_key in os.listdir(other.path):
+                key_path = os.path.join(other.path, hashed_key)
+                if not os.path.isdir(key_path):
+                    continue
+                for name in os.listdir(key_path):
+                    # Skip any temporary files left by an interrupted save.
+                    if "." in name:
+                        continue
+                    try:
+                        with open(os.path.join(key_path, name), "rb") as i:
+                            value = i.read()
+                    except OSError:
+                        continue
+                    self._db.execute(
+                        "INSERT OR IGNORE INTO examples VALUES (?, ?)",
+                        (hashed_key, value),
+                    )
+
+
 class ReadOnlyDatabase(ExampleDatabase):
     """A wrapper to make the given database read-only.
 
@@ -270,12 +482,21 @@ class ReadOnlyDatabase(ExampleDatabase):
     def fetch(self, key: bytes) -> Iterable[bytes]:
         yield from self._wrapped.fetch(key)
 
+    def fetch_many(self, keys: Iterable[bytes]) -> Dict[bytes, List[bytes]]:
+        return self._wrapped.fetch_many(keys)
+
     def save(self, key: bytes, value: bytes) -> None:
         pass
 
     def delete(self, key: bytes, value: bytes) -> None:
         pass
 
+    def save_many(self, items: Iterable[Tuple[bytes, bytes]]) -> None:
+        pass
+
+    def delete_many(self, items: Iterable[Tuple[bytes, bytes]]) -> None:
+        pass
+
 
 class MultiplexedDatabase(ExampleDatabase):
     """A wrapper around multiple databases.
@@ -329,3 +550,115 @@ class MultiplexedDatabase(ExampleDatabase):
     def move(self, src: bytes, dest: bytes, value: bytes) -> None:
         for db in self._wrapped:
             db.move(src, dest, value)
+
+    def fetch_many(self, keys: Iterable[bytes]) -> Dict[bytes, List[bytes]]:
+        keys = list(keys)
+        result: Dict[bytes, List[bytes]] = {key: [] for key in keys}
+        seen: Dict[bytes, set] = {key: set() for key in keys}
+        for db in self._wrapped:
+            for key, values in db.fetch_many(keys).items():
+                for value in values:
+                    if value not in seen[key]:
+                        result[key].append(value)
+                        seen[key].add(value)
+        return result
+
+    def save_many(self, items: Iterable[Tuple[bytes, bytes]]) -> None:
+        items = list(items)
+        for db in self._wrapped:
+            db.save_many(items)
+
+    def delete_many(self, items: Iterable[Tuple[bytes, bytes]]) -> None:
+        items = list(items)
+        for db in self._wrapped:
+            db.delete_many(items)
+
+
+class BufferedExampleDatabase(ExampleDatabase):
+    """A write-behind wrapper around another database.
+
+    ``save``, ``delete``, and ``move`` operations are held in memory and
+    only written to the wrapped database when :meth:`flush` is called, or
+    once ``max_pending`` distinct writes or ``flush_interval`` seconds have
+    accumulated.  Later operations on the same key and value replace earlier
+    ones, so a value which is saved and then deleted again before the buffer
+    is flushed is only deleted from the wrapped database.  ``fetch`` takes
+    the pending operations into account.
+
+    Hypothesis uses this wrapper automatically for the duration of each test,
+    so that the many intermediate examples found while shrinking do not each
+    cost a separate write to the underlying database.
+    """
+
+    def __init__(
+        self,
+        db: ExampleDatabase,
+        *,
+        max_pending: int = 1000,
+        flush_interval: float = 60.0,
+    ) -> None:
+        assert isinstance(db, ExampleDatabase)
+        self._wrapped = db
+        self._max_pending = max_pending
+        self._flush_interval = flush_interval
+        # Maps (key, value) to True for a pending save or False for a pending
+        # delete.  Only the last operation on each pair matters.
+        self._pending: Dict[Tuple[bytes, bytes], bool] = {}
+        self._last_flush = time.monotonic()
+
+    def __repr__(self) -> str:
+        return f"BufferedExampleDatabase({self._wrapped!r})"
+
+    def _apply_pending(self, key, values):
+        result = [v for v in values if self._pending.get((key, v), True)]
+        present = set(result)
+        for (k, v), is_save in self._pending.items():
+            if is_save and k == key and v not in present:
+                result.append(v)
+                present.add(v)
+        return result
+
+    def fetch(self, key: bytes) -> Iterable[bytes]:
+        yield from self._apply_pending(key, self._wrapped.fetch(key))
+
+    def fetch_many(self, keys: Iterable[bytes]) -> Dict[bytes, List[bytes]]:
+        return {
+            key: self._apply_pending(key, values)
+            for key, values in self._wrapped.fetch_many(keys).items()
+        }
+
+    def save(self, key: bytes, value: bytes) -> None:
+        self.save_many([(key, value)])
+
+    def delete(self, key: bytes, value: bytes) -> None:
+        self.delete_many([(key, value)])
+
+    def save_many(self, items: Iterable[Tuple[bytes, bytes]]) -> None:
+        for key, value in items:
+            self._pending[(key, value)] = True
+        self._maybe_flush()
+
+    def delete_many(self, items: Iterable[Tuple[bytes, bytes]]) -> None:
+        for key, value in items:
+            self._pending[(key, value)] = False
+        self._maybe_flush()
+
+    def _maybe_flush(self):
+        if (
+            len(self._pending) >= self._max_pending
+            or time.monotonic() - self._last_flush >= self._flush_interval
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        """Write all pending operations to the wrapped database.  If that
+        raises, the operations are left pending, so that a later flush can
+        try them again."""
+        self._last_flush = time.monotonic()
+        deletes = [item for item, is_save in self._pending.items() if not is_save]
+        saves = [item for item, is_save in self._pending.items() if is_save]
+        if deletes:
+            self._wrapped.delete_many(deletes)
+        if saves:
+            self._wrapped.save_many(saves)
+        self._pending = {}
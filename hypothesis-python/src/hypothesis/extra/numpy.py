@@ -172,8 +172,15 @@ def order_check(name, floor, small, large):
     )
 
 
+# Every bit pattern of a dtype of these kinds is a value that from_dtype can
+# generate with its default arguments.
+RAW_DTYPE_KINDS = ("i", "u", "f", "c")
+
+
 class ArrayStrategy(SearchStrategy):
-    def __init__(self, element_strategy, shape, dtype, fill, unique):
+    def __init__(
+        self, element_strategy, shape, dtype, fill, unique, raw_elements=False
+    ):
         self.shape = tuple(shape)
         self.fill = fill
         self.array_size = int(np.prod(shape))
@@ -181,6 +188,9 @@ class ArrayStrategy(SearchStrategy):
         self.element_strategy = element_strategy
         self.unique = unique
         self._check_elements = dtype.kind not in ("O", "V")
+        # True if every bit pattern of our dtype is a value which our
+        # elements could generate, so that we can draw them as raw bytes.
+        self.raw_elements = raw_elements
 
     def set_element(self, data, result, idx, strategy=None):
         strategy = strategy or self.element_strategy
@@ -201,10 +211,38 @@ class ArrayStrategy(SearchStrategy):
                 % (val, strategy, self.dtype, result[idx], type(result[idx]))
             )
 
+    def draw_raw(self, data):
+        """Draw a dense array from the bytes of ``data`` in one call, for
+        elements which can take any bit pattern."""
+        n_bytes = self.array_size * self.dtype.itemsize
+        result = (
+            np.frombuffer(data.draw_bytes(n_bytes), dtype=self.dtype)
+            .reshape(self.shape)
+            .copy()
+        )
+        # Raw bytes almost never give the values that our elements strategy
+        # is good at finding, such as zero, infinity, or the edges of the
+        # dtype, so we also assign freshly drawn elements to a sparse set of
+        # indices.  Like the raw bytes, these shrink away to leave zeros.
+        flat = result.reshape(-1)
+        elements = cu.many(
+            data,
+            min_size=0,
+            max_size=self.array_size,
+            average_size=math.sqrt(self.array_size),
+        )
+        while elements.more():
+            i = cu.integer_range(data, 0, self.array_size - 1)
+            self.set_element(data, flat, i)
+        return result
+
     def do_draw(self, data):
         if 0 in self.shape:
             return np.zeros(dtype=self.dtype, shape=self.shape)
 
+        if self.raw_elements and self.fill.is_empty and not self.unique:
+            return self.draw_raw(data)
+
         # Because Numpy allocates memory for strings at array creation, if we have
         # an unsized string dtype we'll fill an object array and then cast it back.
         unsized_string_dtype = (
@@ -213,10 +251,13 @@ class ArrayStrategy(SearchStrategy):
 
         # This could legitimately be a np.empty, but the performance gains for
         # that would be so marginal that there's really not much point risking
-        # undefined behaviour shenanigans.
-        result = np.zeros(
-            shape=self.array_size, dtype=object if unsized_string_dtype else self.dtype
+        # undefined behaviour shenanigans.  We allocate the array in its final
+        # shape and fill in a flat view of it, so that we don't need to copy
+        # it at the end.
+        shaped = np.zeros(
+            shape=self.shape, dtype=object if unsized_string_dtype else self.dtype
         )
+        result = shaped.reshape(-1)
 
         if self.fill.is_empty:
             # We have no fill value (either because the user explicitly
@@ -314,22 +355,20 @@ class ArrayStrategy(SearchStrategy):
                 np.putmask(result, needs_fill, one_element)
 
         if unsized_string_dtype:
-            out = result.astype(self.dtype)
-            mismatch = out != result
+            out = shaped.astype(self.dtype)
+            mismatch = out != shaped
             if mismatch.any():
                 raise InvalidArgument(
                     "Array elements %r cannot be represented as dtype %r - instead "
                     "they becomes %r.  Use a more precise strategy, e.g. without "
                     "trailing null bytes, as this will be an error future versions."
-                    % (result[mismatch], self.dtype, out[mismatch])
+                    % (shaped[mismatch], self.dtype, out[mismatch])
                 )
-            result = out
+            shaped = out
 
-        result = result.reshape(self.shape).copy()
+        assert shaped.base is None
 
-        assert result.base is None
-
-        return result
+        return shaped
 
 
 @check_function
@@ -436,6 +475,7 @@ def arrays(
         )
     # From here on, we're only dealing with values and it's relatively simple.
     dtype = np.dtype(dtype)
+    raw_elements = elements is None and dtype.kind in RAW_DTYPE_KINDS
     if elements is None or isinstance(elements, Mapping):
         if dtype.kind in ("m", "M") and "[" not in dtype.str:
             # For datetime and timedelta dtypes, we have a tricky situation -
@@ -458,7 +498,7 @@ def arrays(
         shape,
     )
     fill = fill_for(elements=elements, unique=unique, fill=fill)
-    return ArrayStrategy(elements, shape, dtype, fill, unique)
+    return ArrayStrategy(elements, shape, dtype, fill, unique, raw_elements)
 
 
 @st.defines_strategy()
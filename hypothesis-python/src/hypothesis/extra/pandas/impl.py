@@ -107,6 +107,46 @@ def elements_and_dtype(elements, dtype, source=None):
     return elements, dtype
 
 
+def draw_series(draw, index, elements, dtype, fill, unique, raw_elements=False):
+    """Draw a :class:`pandas.Series` with ``index``, generating all of its
+    values at once as a numpy array.  ``fill`` must already have been
+    resolved by :func:`hypothesis.extra.numpy.fill_for`."""
+    if len(index) == 0:
+        if dtype is None:
+            dtype = draw(dtype_for_elements_strategy(elements))
+        return pandas.Series((), index=index, dtype=dtype)
+    values = draw(
+        npst.ArrayStrategy(
+            elements,
+            (len(index),),
+            np.dtype(object) if dtype is None else dtype,
+            fill,
+            unique,
+            raw_elements,
+        )
+    )
+    if dtype is None:
+        # Let pandas infer the dtype from the values, rather than leaving
+        # them in an object array.
+        values = list(values)
+    return pandas.Series(values, index=index, dtype=dtype)
+
+
+def column_series(values, dtype, index):
+    """Return a :class:`pandas.Series` of ``values`` with ``index``, which
+    are drawn one at a time from the elements of a column of ``dtype``."""
+    if not values:
+        return pandas.Series(np.zeros(shape=0, dtype=dtype), index=index)
+    if dtype is None:
+        return pandas.Series(values, index=index)
+    # We assign the values one at a time, rather than passing the list to
+    # numpy, so that values which are sequences aren't broadcast.
+    array = np.zeros(shape=len(values), dtype=dtype)
+    for i, value in enumerate(values):
+        array[i] = value
+    return pandas.Series(array, index=index)
+
+
 class ValueIndexStrategy(st.SearchStrategy):
     def __init__(self, elements, dtype, min_size, max_size, unique):
         super().__init__()
@@ -257,46 +297,23 @@ def series(
     else:
         st.check_strategy(index, "index")
 
+    raw_elements = elements is None
     elements, dtype = elements_and_dtype(elements, dtype)
+    raw_elements = raw_elements and dtype.kind in npst.RAW_DTYPE_KINDS
+    fill = npst.fill_for(elements=elements, unique=unique, fill=fill)
     index_strategy = index
 
     @st.composite
     def result(draw):
-        index = draw(index_strategy)
-
-        if len(index) > 0:
-            if dtype is not None:
-                result_data = draw(
-                    npst.arrays(
-                        dtype=dtype,
-                        elements=elements,
-                        shape=len(index),
-                        fill=fill,
-                        unique=unique,
-                    )
-                )
-            else:
-                result_data = list(
-                    draw(
-                        npst.arrays(
-                            dtype=object,
-                            elements=elements,
-                            shape=len(index),
-                            fill=fill,
-                            unique=unique,
-                        )
-                    )
-                )
-
-            return pandas.Series(result_data, index=index, dtype=dtype)
-        else:
-            return pandas.Series(
-                (),
-                index=index,
-                dtype=dtype
-                if dtype is not None
-                else draw(dtype_for_elements_strategy(elements)),
-            )
+        return draw_series(
+            draw,
+            draw(index_strategy),
+            elements=elements,
+            dtype=dtype,
+            fill=fill,
+            unique=unique,
+            raw_elements=raw_elements,
+        )
 
     return result()
 
@@ -500,6 +517,8 @@ def data_frames(
 
     rewritten_columns = []
     column_names = set()  # type: Set[str]
+    # Names of the columns whose elements can be drawn as raw bytes.
+    raw_columns = set()
 
     for i, c in enumerate(cols):
         check_type(column, c, f"columns[{i}]")
@@ -524,7 +543,10 @@ def data_frames(
 
         column_names.add(c.name)
 
+        raw_elements = c.elements is None
         c.elements, c.dtype = elements_and_dtype(c.elements, c.dtype, label)
+        if raw_elements and c.dtype.kind in npst.RAW_DTYPE_KINDS:
+            raw_columns.add(c.name)
 
         if c.dtype is None and rows is not None:
             raise InvalidArgument(
@@ -543,7 +565,6 @@ def data_frames(
         @st.composite
         def just_draw_columns(draw):
             index = draw(index_strategy)
-            local_index_strategy = st.just(index)
 
             data = OrderedDict((c.name, None) for c in rewritten_columns)
 
@@ -552,24 +573,30 @@ def data_frames(
             # enabled, the elements can be shrunk independently of the size,
             # so we can just shrink by shrinking the index then shrinking the
             # length and are generally much more free to move data around.
+            # Columns of numeric dtypes with the default elements can be
+            # drawn all at once, so we draw those whole as well.
 
-            # For columns with no filling the problem is harder, and drawing
-            # them like that would result in rows being very far apart from
-            # each other in the underlying data stream, which gets in the way
-            # of shrinking. So what we do is reorder and draw those columns
+            # For other columns with no filling the problem is harder, and
+            # drawing them like that would result in rows being very far apart
+            # from each other in the underlying data stream, which gets in the
+            # way of shrinking. So what we do is reorder and draw those columns
             # row wise, so that the values of each row are next to each other.
             # This makes life easier for the shrinker when deleting blocks of
             # data.
-            columns_without_fill = [c for c in rewritten_columns if c.fill.is_empty]
+            columns_without_fill = [
+                c
+                for c in rewritten_columns
+                if c.fill.is_empty and (c.unique or c.name not in raw_columns)
+            ]
 
             if columns_without_fill:
-                for c in columns_without_fill:
-                    data[c.name] = pandas.Series(
-                        np.zeros(shape=len(index), dtype=c.dtype), index=index
-                    )
+                # We collect the values of each column in a list and build
+                # the Series at the end, as setting each value in a Series
+                # is very slow.
+                values = {c.name: [] for c in columns_without_fill}
                 seen = {c.name: set() for c in columns_without_fill if c.unique}
 
-                for i in range(len(index)):
+                for _ in range(len(index)):
                     for c in columns_without_fill:
                         if c.unique:
                             for _ in range(5):
@@ -581,18 +608,21 @@ def data_frames(
                                 reject()
                         else:
                             value = draw(c.elements)
-                        data[c.name][i] = value
+                        values[c.name].append(value)
+
+                for c in columns_without_fill:
+                    data[c.name] = column_series(values[c.name], c.dtype, index)
 
             for c in rewritten_columns:
-                if not c.fill.is_empty:
-                    data[c.name] = draw(
-                        series(
-                            index=local_index_strategy,
-                            dtype=c.dtype,
-                            elements=c.elements,
-                            fill=c.fill,
-                            unique=c.unique,
-                        )
+                if data[c.name] is None:
+                    data[c.name] = draw_series(
+                        draw,
+                        index,
+                        elements=c.elements,
+                        dtype=c.dtype,
+                        fill=c.fill,
+                        unique=c.unique,
+                        raw_elements=c.name in raw_columns,
                     )
 
             return pandas.DataFrame(data, index=index)
@@ -604,18 +634,9 @@ def data_frames(
         def assign_rows(draw):
             index = draw(index_strategy)
 
-            result = pandas.DataFrame(
-                OrderedDict(
-                    (
-                        c.name,
-                        pandas.Series(
-                            np.zeros(dtype=c.dtype, shape=len(index)), dtype=c.dtype
-                        ),
-                    )
-                    for c in rewritten_columns
-                ),
-                index=index,
-            )
+            # As above, we collect the values of each column and build the
+            # DataFrame at the end, rather than setting each row in turn.
+            values = [[] for _ in rewritten_columns]
 
             fills = {}
 
@@ -626,7 +647,7 @@ def data_frames(
                 while all_seen[-1] is None:
                     all_seen.pop()
 
-            for row_index in range(len(index)):
+            for _ in range(len(index)):
                 for _ in range(5):
                     original_row = draw(rows)
                     row = original_row
@@ -682,10 +703,17 @@ def data_frames(
                                 f"complete row {original_row!r}"
                             )
                         row.append(draw(c.fill))
-                    result.iloc[row_index] = row
+                    for column_values, value in zip(values, row):
+                        column_values.append(value)
                     break
                 else:
                     reject()
-            return result
+            return pandas.DataFrame(
+                OrderedDict(
+                    (c.name, column_series(column_values, c.dtype, index))
+                    for c, column_values in zip(rewritten_columns, values)
+                ),
+                index=index,
+            )
 
         return assign_rows()
@@ -14,6 +14,7 @@
 # END HEADER
 
 import base64
+import json
 from inspect import signature
 
 import pytest
@@ -28,6 +29,7 @@ from hypothesis.statistics import collector, describe_statistics
 LOAD_PROFILE_OPTION = "--hypothesis-profile"
 VERBOSITY_OPTION = "--hypothesis-verbosity"
 PRINT_STATISTICS_OPTION = "--hypothesis-show-statistics"
+STATISTICS_JSON_OPTION = "--hypothesis-statistics-json"
 SEED_OPTION = "--hypothesis-seed"
 
 
@@ -80,6 +82,12 @@ else:
             help="Configure when statistics are printed",
             default=False,
         )
+        group.addoption(
+            STATISTICS_JSON_OPTION,
+            action="store",
+            metavar="PATH",
+            help="Write statistics for each test to PATH as JSON",
+        )
         group.addoption(
             SEED_OPTION,
             action="store",
@@ -197,6 +205,8 @@ else:
                 item.hypothesis_statistics = base64.b64encode(
                     describe_statistics(stats).encode()
                 ).decode()
+                if item.config.getoption(STATISTICS_JSON_OPTION):
+                    item.hypothesis_statistics_json = json.dumps(stats)
 
             with collector.with_value(note_statistics):
                 with with_reporter(store):
@@ -219,8 +229,25 @@ else:
                 # --junitxml not passed, or Pytest 4.5 (before add_global_property)
                 # We'll fail xunit2 xml schema checks, upgrade pytest if you care.
                 report.user_properties.append((name, item.hypothesis_statistics))
+        if hasattr(item, "hypothesis_statistics_json") and report.when == "teardown":
+            # Unlike the description above, we always attach this to the report
+            # so that it is passed back to the main process under xdist.
+            report.user_properties.append(
+                ("hypothesis-json-statistics", item.hypothesis_statistics_json)
+            )
 
     def pytest_terminal_summary(terminalreporter):
+        json_path = terminalreporter.config.getoption(STATISTICS_JSON_OPTION)
+        if json_path:
+            all_stats = []
+            for test_report in terminalreporter.stats.get("", []):
+                if test_report.when == "teardown":
+                    for name, value in test_report.user_properties:
+                        if name == "hypothesis-json-statistics":
+                            all_stats.append(json.loads(value))
+            with open(json_path, "w") as f:
+                json.dump(all_stats, f)
+
         if not terminalreporter.config.getoption(PRINT_STATISTICS_OPTION):
             return
         terminalreporter.section("Hypothesis Statistics")
@@ -15,7 +15,7 @@
 
 from contextlib import contextmanager
 from datetime import timedelta
-from typing import Iterable
+from typing import Dict, Iterable, List, Tuple
 
 from redis import Redis
 
@@ -81,3 +81,32 @@ class RedisExampleDatabase(ExampleDatabase):
         with self._pipeline(src, dest) as pipe:
             pipe.srem(self._prefix + src, value)
             pipe.sadd(self._prefix + dest, value)
+
+    def fetch_many(self, keys: Iterable[bytes]) -> Dict[bytes, List[bytes]]:
+        keys = list(keys)
+        with self._pipeline(*keys, auto_execute=False) as pipe:
+            for key in keys:
+                pipe.smembers(self._prefix + key)
+        results = pipe.execute()[: len(keys)]
+        return {key: list(values) for key, values in zip(keys, results)}
+
+    def save_many(self, items: Iterable[Tuple[bytes, bytes]]) -> None:
+        by_key = _group_by_key(items)
+        if by_key:
+            with self._pipeline(*by_key) as pipe:
+                for key, values in by_key.items():
+                    pipe.sadd(self._prefix + key, *values)
+
+    def delete_many(self, items: Iterable[Tuple[bytes, bytes]]) -> None:
+        by_key = _group_by_key(items)
+        if by_key:
+            with self._pipeline(*by_key) as pipe:
+                for key, values in by_key.items():
+                    pipe.srem(self._prefix + key, *values)
+
+
+def _group_by_key(items):
+    by_key = {}  # type: Dict[bytes, List[bytes]]
+    for key, value in items:
+        by_key.setdefault(key, []).append(value)
+    return by_key
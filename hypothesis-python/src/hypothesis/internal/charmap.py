@@ -13,32 +13,146 @@
 #
 # END HEADER
 
-import gzip
-import json
 import os
 import sys
 import tempfile
 import unicodedata
+from array import array
+from collections.abc import Mapping
 from typing import Dict, Tuple
 
 from hypothesis.configuration import mkdir_p, storage_directory
 from hypothesis.errors import InvalidArgument
+from hypothesis.internal.intervalsets import IntervalSet
 
-intervals = Tuple[Tuple[int, int], ...]
-cache_type = Dict[Tuple[Tuple[str, ...], int, int, intervals], intervals]
+cache_type = Dict[
+    Tuple[Tuple[str, ...], int, int, IntervalSet, IntervalSet], IntervalSet
+]
 
 
 def charmap_file():
-    return storage_directory(
-        "unicode_data", unicodedata.unidata_version, "charmap.json.gz"
+    return storage_directory("unicode_data", unicodedata.unidata_version, "charmap.bin")
+
+
+def bundled_charmap_file():
+    """Return the path of the charmap which ships with Hypothesis for the
+    running version of Unicode.  The file may not exist, if this version of
+    Python uses a version of Unicode we have not bundled a charmap for."""
+    return os.path.join(
+        os.path.dirname(__file__),
+        "unicode_data",
+        f"charmap-{unicodedata.unidata_version}.bin",
     )
 
 
+# Charmap files start with this, then the number of categories, then the
+# name (as a little-endian integer) and number of intervals of each category,
+# then the start and end of every interval in category order.  Every number
+# is a little-endian unsigned 32-bit integer, so a loaded file can be copied
+# into an array without parsing.
+CHARMAP_MAGIC = b"HYCM"
+
+
+class Charmap(Mapping):
+    """A read-only mapping from each Unicode category to a tuple of the
+    intervals of codepoints in it, backed by an array in the format of a
+    charmap file after the magic string.
+
+    Only the header is read up front.  The intervals of each category are
+    decoded the first time they are looked up, as most programs only ever
+    use a few categories."""
+
+    def __init__(self, values):
+        self.__values = values
+        self.__decoded = {}
+        self.__offsets = {}
+        n_categories = values[0]
+        header = values[1 : 2 * n_categories + 1].tolist()
+        offset = 2 * n_categories + 1
+        for code, n_intervals in zip(header[::2], header[1::2]):
+            category = code.to_bytes(2, "little").decode("ascii")
+            self.__offsets[category] = (offset, n_intervals)
+            offset += 2 * n_intervals
+        if offset != len(values):
+            raise ValueError("Truncated charmap file")
+
+    def __getitem__(self, category):
+        try:
+            return self.__decoded[category]
+        except KeyError:
+            pass
+        offset, n_intervals = self.__offsets[category]
+        bounds = iter(self.__values[offset : offset + 2 * n_intervals].tolist())
+        result = self.__decoded[category] = tuple(zip(bounds, bounds))
+        return result
+
+    def __iter__(self):
+        return iter(self.__offsets)
+
+    def __len__(self):
+        return len(self.__offsets)
+
+    def interval_count(self, category):
+        """Return ``len(self[category])``, without decoding the intervals."""
+        return self.__offsets[category][1]
+
+
+def _read_charmap_file(path):
+    with open(path, "rb") as f:
+        if f.read(len(CHARMAP_MAGIC)) != CHARMAP_MAGIC:
+            raise ValueError(f"{path} is not a charmap file")
+        values = array("I")
+        values.frombytes(f.read())
+    if sys.byteorder == "big":
+        values.byteswap()
+    return Charmap(values)
+
+
+def _encode_charmap(charmap):
+    """Return an array of the numbers in a charmap file for ``charmap``, a
+    mapping from categories to intervals, in native byte order."""
+    values = array("I", [len(charmap)])
+    for category, intervals in sorted(charmap.items()):
+        values.append(int.from_bytes(category.encode("ascii"), "little"))
+        values.append(len(intervals))
+    for _, intervals in sorted(charmap.items()):
+        for u, v in intervals:
+            values.append(u)
+            values.append(v)
+    return values
+
+
+def _write_charmap_file(path, charmap):
+    values = _encode_charmap(charmap)
+    if sys.byteorder == "big":
+        values.byteswap()
+    with open(path, "wb") as o:
+        o.write(CHARMAP_MAGIC)
+        values.tofile(o)
+
+
+def _compute_charmap():
+    # This loop is reduced to using only local variables for performance;
+    # indexing and updating containers is a ~3x slowdown.  This doesn't fix
+    # https://github.com/HypothesisWorks/hypothesis/issues/2108 but it helps.
+    category = unicodedata.category  # Local variable -> ~20% speedup!
+    result = {}
+    last_cat = category(chr(0))
+    last_start = 0
+    for i in range(1, sys.maxunicode + 1):
+        cat = category(chr(i))
+        if cat != last_cat:
+            result.setdefault(last_cat, []).append((last_start, i - 1))
+            last_cat, last_start = cat, i
+    result.setdefault(last_cat, []).append((last_start, sys.maxunicode))
+    return {k: tuple(v) for k, v in result.items()}
+
+
 _charmap = None
 
 
 def charmap():
-    """Return a dict that maps a Unicode category, to a tuple of 2-tuples
+    """Return a mapping from each Unicode category to a tuple of 2-tuples
     covering the codepoint intervals for characters in that category.
 
     >>> charmap()['Co']
@@ -46,56 +160,29 @@ def charmap():
     """
     global _charmap
     # Best-effort caching in the face of missing files and/or unwritable
-    # filesystems is fairly simple: check if loaded, else try loading,
-    # else calculate and try writing the cache.
+    # filesystems is fairly simple: check if loaded, else try loading the
+    # bundled file and then our cached copy, else calculate and try writing
+    # the cache.
     if _charmap is None:
-        f = charmap_file()
-        try:
-            with gzip.GzipFile(f, "rb") as i:
-                tmp_charmap = dict(json.load(i))
-
-        except Exception:
-            # This loop is reduced to using only local variables for performance;
-            # indexing and updating containers is a ~3x slowdown.  This doesn't fix
-            # https://github.com/HypothesisWorks/hypothesis/issues/2108 but it helps.
-            category = unicodedata.category  # Local variable -> ~20% speedup!
-            tmp_charmap = {}
-            last_cat = category(chr(0))
-            last_start = 0
-            for i in range(1, sys.maxunicode + 1):
-                cat = category(chr(i))
-                if cat != last_cat:
-                    tmp_charmap.setdefault(last_cat, []).append([last_start, i - 1])
-                    last_cat, last_start = cat, i
-            tmp_charmap.setdefault(last_cat, []).append([last_start, sys.maxunicode])
-
+        for f in (bundled_charmap_file(), charmap_file()):
+            try:
+                _charmap = _read_charmap_file(f)
+                break
+            except Exception:
+                pass
+        else:
+            _charmap = Charmap(_encode_charmap(_compute_charmap()))
             try:
                 # Write the Unicode table atomically
                 tmpdir = storage_directory("tmp")
                 mkdir_p(tmpdir)
                 fd, tmpfile = tempfile.mkstemp(dir=tmpdir)
                 os.close(fd)
-                # Explicitly set the mtime to get reproducible output
-                with gzip.GzipFile(tmpfile, "wb", mtime=1) as o:
-                    result = json.dumps(sorted(tmp_charmap.items()))
-                    o.write(result.encode())
-
-                os.renames(tmpfile, f)
+                _write_charmap_file(tmpfile, _charmap)
+                os.renames(tmpfile, charmap_file())
             except Exception:
                 pass
 
-        # convert between lists and tuples
-        _charmap = {
-            k: tuple(tuple(pair) for pair in pairs) for k, pairs in tmp_charmap.items()
-        }
-        # each value is a tuple of 2-tuples (that is, tuples of length 2)
-        # and that both elements of that tuple are integers.
-        for vs in _charmap.values():
-            ints = list(sum(vs, ()))
-            assert all(isinstance(x, int) for x in ints)
-            assert ints == sorted(ints)
-            assert all(len(tup) == 2 for tup in vs)
-
     assert _charmap is not None
     return _charmap
 
@@ -112,7 +199,7 @@ def categories():
     global _categories
     if _categories is None:
         cm = charmap()
-        _categories = sorted(cm.keys(), key=lambda c: len(cm[c]))
+        _categories = sorted(cm, key=cm.interval_count)
         _categories.remove("Cc")  # Other, Control
         _categories.remove("Cs")  # Other, Surrogate
         _categories.append("Cc")
@@ -159,30 +246,7 @@ def _union_intervals(x, y):
     >>> _union_intervals([(3, 10)], [(1, 2), (5, 17)])
     ((1, 17),)
     """
-    if not x:
-        return tuple((u, v) for u, v in y)
-    if not y:
-        return tuple((u, v) for u, v in x)
-    intervals = sorted(x + y, reverse=True)
-    result = [intervals.pop()]
-    while intervals:
-        # 1. intervals is in descending order
-        # 2. pop() takes from the RHS.
-        # 3. (a, b) was popped 1st, then (u, v) was popped 2nd
-        # 4. Therefore: a <= u
-        # 5. We assume that u <= v and a <= b
-        # 6. So we need to handle 2 cases of overlap, and one disjoint case
-        #    |   u--v     |   u----v   |       u--v  |
-        #    |   a----b   |   a--b     |  a--b       |
-        u, v = intervals.pop()
-        a, b = result[-1]
-        if u <= b + 1:
-            # Overlap cases
-            result[-1] = (a, max(v, b))
-        else:
-            # Disjoint case
-            result.append((u, v))
-    return tuple(result)
+    return IntervalSet(x).union(IntervalSet(y)).intervals
 
 
 def _subtract_intervals(x, y):
@@ -194,70 +258,7 @@ def _subtract_intervals(x, y):
     return [(1, 1), (4, 8)], removing the values 2, 3, 9 and 10 from the
     interval.
     """
-    if not y:
-        return tuple(x)
-    x = list(map(list, x))
-    i = 0
-    j = 0
-    result = []
-    while i < len(x) and j < len(y):
-        # Iterate in parallel over x and y. j stays pointing at the smallest
-        # interval in the left hand side that could still overlap with some
-        # element of x at index >= i.
-        # Similarly, i is not incremented until we know that it does not
-        # overlap with any element of y at index >= j.
-
-        xl, xr = x[i]
-        assert xl <= xr
-        yl, yr = y[j]
-        assert yl <= yr
-
-        if yr < xl:
-            # The interval at y[j] is strictly to the left of the interval at
-            # x[i], so will not overlap with it or any later interval of x.
-            j += 1
-        elif yl > xr:
-            # The interval at y[j] is strictly to the right of the interval at
-            # x[i], so all of x[i] goes into the result as no further intervals
-            # in y will intersect it.
-            result.append(x[i])
-            i += 1
-        elif yl <= xl:
-            if yr >= xr:
-                # x[i] is contained entirely in y[j], so we just skip over it
-                # without adding it to the result.
-                i += 1
-            else:
-                # The beginning of x[i] is contained in y[j], so we update the
-                # left endpoint of x[i] to remove this, and increment j as we
-                # now have moved past it. Note that this is not added to the
-                # result as is, as more intervals from y may intersect it so it
-                # may need updating further.
-                x[i][0] = yr + 1
-                j += 1
-        else:
-            # yl > xl, so the left hand part of x[i] is not contained in y[j],
-            # so there are some values we should add to the result.
-            result.append((xl, yl - 1))
-
-            if yr + 1 <= xr:
-                # If y[j] finishes before x[i] does, there may be some values
-                # in x[i] left that should go in the result (or they may be
-                # removed by a later interval in y), so we update x[i] to
-                # reflect that and increment j because it no longer overlaps
-                # with any remaining element of x.
-                x[i][0] = yr + 1
-                j += 1
-            else:
-                # Every element of x[i] other than the initial part we have
-                # already added is contained in y[j], so we move to the next
-                # interval.
-                i += 1
-    # Any remaining intervals in x do not overlap with any of y, as if they did
-    # we would not have incremented j to the end, so can be added to the result
-    # as they are.
-    result.extend(x[i:])
-    return tuple(map(tuple, result))
+    return IntervalSet(x).difference(IntervalSet(y)).intervals
 
 
 def _intervals(s):
@@ -267,11 +268,10 @@ def _intervals(s):
     >>> _intervals('abcdef0123456789')
     ((48, 57), (97, 102))
     """
-    intervals = tuple((ord(c), ord(c)) for c in sorted(s))
-    return _union_intervals(intervals, intervals)
+    return IntervalSet.from_string(s).intervals
 
 
-category_index_cache = {(): ()}
+category_index_cache = {(): IntervalSet(())}
 
 
 def _category_key(exclude, include):
@@ -297,12 +297,12 @@ def _category_key(exclude, include):
 
 
 def _query_for_key(key):
-    """Return a tuple of codepoint intervals covering characters that match one
+    """Return an IntervalSet of codepoints covering characters that match one
     or more categories in the tuple of categories `key`.
 
     >>> _query_for_key(categories())
-    ((0, 1114111),)
-    >>> _query_for_key(('Zl', 'Zp', 'Co'))
+    IntervalSet(((0, 1114111),))
+    >>> _query_for_key(('Zl', 'Zp', 'Co')).intervals
     ((8232, 8233), (57344, 63743), (983040, 1048573), (1048576, 1114109))
     """
     try:
@@ -311,9 +311,9 @@ def _query_for_key(key):
         pass
     assert key
     if set(key) == set(categories()):
-        result = ((0, sys.maxunicode),)
+        result = IntervalSet([(0, sys.maxunicode)])
     else:
-        result = _union_intervals(_query_for_key(key[:-1]), charmap()[key[-1]])
+        result = _query_for_key(key[:-1]) | IntervalSet(charmap()[key[-1]])
     category_index_cache[key] = result
     return result
 
@@ -344,13 +344,36 @@ def query(
     ...       include_characters=u'☃')
     ((65, 90), (9731, 9731))
     """
+    return query_intervalset(
+        exclude_categories=exclude_categories,
+        include_categories=include_categories,
+        min_codepoint=min_codepoint,
+        max_codepoint=max_codepoint,
+        include_characters=include_characters,
+        exclude_characters=exclude_characters,
+    ).intervals
+
+
+def query_intervalset(
+    exclude_categories=(),
+    include_categories=None,
+    min_codepoint=None,
+    max_codepoint=None,
+    include_characters="",
+    exclude_characters="",
+):
+    """As :func:`query`, but returns an :class:`IntervalSet`.
+
+    Results are cached, so strategies which ask for the same characters
+    share a single IntervalSet rather than each building their own.
+    """
     if min_codepoint is None:
         min_codepoint = 0
     if max_codepoint is None:
         max_codepoint = sys.maxunicode
     catkey = _category_key(exclude_categories, include_categories)
-    character_intervals = _intervals(include_characters or "")
-    exclude_intervals = _intervals(exclude_characters or "")
+    character_intervals = IntervalSet.from_string(include_characters or "")
+    exclude_intervals = IntervalSet.from_string(exclude_characters or "")
     qkey = (
         catkey,
         min_codepoint,
@@ -362,13 +385,11 @@ def query(
         return limited_category_index_cache[qkey]
     except KeyError:
         pass
-    base = _query_for_key(catkey)
-    result = []
-    for u, v in base:
-        if v >= min_codepoint and u <= max_codepoint:
-            result.append((max(u, min_codepoint), min(v, max_codepoint)))
-    result = tuple(result)
-    result = _union_intervals(result, character_intervals)
-    result = _subtract_intervals(result, exclude_intervals)
+    result = _query_for_key(catkey)
+    if min_codepoint > max_codepoint:
+        result = IntervalSet(())
+    elif min_codepoint > 0 or max_codepoint < sys.maxunicode:
+        result &= IntervalSet([(min_codepoint, max_codepoint)])
+    result = (result | character_intervals) - exclude_intervals
     limited_category_index_cache[qkey] = result
     return result
@@ -119,6 +119,11 @@ class ChoiceTree:
     def exhausted(self):
         return self.root.exhausted
 
+    def mark_exhausted(self):
+        """Record that there is nothing left to try, e.g. because we know
+        that an earlier tree for the same pass and target was exhausted."""
+        self.root.live_child_count = 0
+
     def step(self, selection_order, f):
         assert not self.exhausted
 
@@ -21,7 +21,7 @@ import attr
 
 from hypothesis.errors import Frozen, InvalidArgument, StopTest
 from hypothesis.internal.compat import bit_length, int_from_bytes, int_to_bytes
-from hypothesis.internal.conjecture.junkdrawer import IntList, uniform
+from hypothesis.internal.conjecture.junkdrawer import IntList
 from hypothesis.internal.conjecture.utils import calc_label_from_name
 
 TOP_LABEL = calc_label_from_name("top")
@@ -83,12 +83,11 @@ class Example:
     to understand their exact representation in the byte stream.
 
     Rather than store each ``Example`` as a rich object, it is actually
-    just an index into the ``Examples`` class defined below. This has two
-    purposes: Firstly, for most properties of examples we will never need
-    to allocate storage at all, because most properties are not used on
-    most examples. Secondly, by storing the properties as compact lists
-    of integers, we save a considerable amount of space compared to
-    Python's normal object size.
+    just an index into the ``Examples`` class defined below, which stores
+    the properties of every example as compact parallel lists of integers.
+    This saves a considerable amount of space compared to Python's normal
+    object size, and we only allocate ``Example`` objects for the examples
+    that we actually look at.
 
     This does have the downside that it increases the amount of allocation
     we do, and slows things down as a result, in some usage patterns because
@@ -179,101 +178,6 @@ class Example:
         return [self.owner[i] for i in self.owner.children[self.index]]
 
 
-class ExampleProperty:
-    """There are many properties of examples that we calculate by
-    essentially rerunning the test case multiple times based on the
-    calls which we record in ExampleRecord.
-
-    This class defines a visitor, subclasses of which can be used
-    to calculate these properties.
-    """
-
-    def __init__(self, examples):
-        self.example_stack = []
-        self.examples = examples
-        self.bytes_read = 0
-        self.example_count = 0
-        self.block_count = 0
-
-    def run(self):
-        """Rerun the test case with this visitor and return the
-        results of ``self.finish()``."""
-        self.begin()
-        blocks = self.examples.blocks
-        for record in self.examples.trail:
-            if record == DRAW_BITS_RECORD:
-                self.__push(0)
-                self.bytes_read = blocks.endpoints[self.block_count]
-                self.block(self.block_count)
-                self.block_count += 1
-                self.__pop(False)
-            elif record >= START_EXAMPLE_RECORD:
-                self.__push(record - START_EXAMPLE_RECORD)
-            else:
-                assert record in (
-                    STOP_EXAMPLE_DISCARD_RECORD,
-                    STOP_EXAMPLE_NO_DISCARD_RECORD,
-                )
-                self.__pop(record == STOP_EXAMPLE_DISCARD_RECORD)
-        return self.finish()
-
-    def __push(self, label_index):
-        i = self.example_count
-        assert i < len(self.examples)
-        self.start_example(i, label_index)
-        self.example_count += 1
-        self.example_stack.append(i)
-
-    def __pop(self, discarded):
-        i = self.example_stack.pop()
-        self.stop_example(i, discarded)
-
-    def begin(self):
-        """Called at the beginning of the run to initialise any
-        relevant state."""
-        self.result = IntList.of_length(len(self.examples))
-
-    def start_example(self, i, label_index):
-        """Called at the start of each example, with ``i`` the
-        index of the example and ``label_index`` the index of
-        its label in ``self.examples.labels``."""
-
-    def block(self, i):
-        """Called with each ``draw_bits`` call, with ``i`` the index of the
-        corresponding block in ``self.examples.blocks``"""
-
-    def stop_example(self, i, discarded):
-        """Called at the end of each example, with ``i`` the
-        index of the example and ``discarded`` being ``True`` if ``stop_example``
-        was called with ``discard=True``."""
-
-    def finish(self):
-        return self.result
-
-
-def calculated_example_property(cls):
-    """Given an ``ExampleProperty`` as above we use this decorator
-    to transform it into a lazy property on the ``Examples`` class,
-    which has as its value the result of calling ``cls.run()``,
-    computed the first time the property is accessed.
-
-    This has the slightly weird result that we are defining nested
-    classes which get turned into properties."""
-    name = cls.__name__
-    cache_name = "__" + name
-
-    def lazy_calculate(self):
-        result = getattr(self, cache_name, None)
-        if result is None:
-            result = cls(self).run()
-            setattr(self, cache_name, result)
-        return result
-
-    lazy_calculate.__name__ = cls.__name__
-    lazy_calculate.__qualname__ = getattr(cls, "__qualname__", cls.__name__)
-    return property(lazy_calculate)
-
-
 DRAW_BITS_RECORD = 0
 STOP_EXAMPLE_DISCARD_RECORD = 1
 STOP_EXAMPLE_NO_DISCARD_RECORD = 2
@@ -317,6 +221,21 @@ class ExampleRecord:
         self.trail.append(DRAW_BITS_RECORD)
 
 
+# The attributes of ``Examples`` which are calculated by replaying its trail.
+REPLAYED_ATTRIBUTES = frozenset(
+    [
+        "starts",
+        "ends",
+        "depths",
+        "label_indices",
+        "parentage",
+        "discarded",
+        "mutator_groups",
+        "block_examples",
+    ]
+)
+
+
 class Examples:
     """A lazy collection of ``Example`` objects, derived from
     the record of recorded behaviour in ``ExampleRecord``.
@@ -325,7 +244,17 @@ class Examples:
     but actually mostly exists as a compact store of information
     for them to reference into. All properties on here are best
     understood as the backing storage for ``Example`` and are
-    described there.
+    described there, except for the following indexes:
+
+    - ``examples_by_label_index[l]`` is the indices of the examples whose
+      label is ``labels[l]``, in increasing order.
+    - ``block_examples[i]`` is the index of the example corresponding to
+      the ``draw_bits`` call for block ``i``.
+
+    The first time that any of the ``REPLAYED_ATTRIBUTES`` is used, we
+    calculate all of them in a single replay of the trail.  The remaining
+    properties are calculated from those when they are first used, without
+    replaying the trail again.
     """
 
     def __init__(self, record, blocks):
@@ -336,113 +265,123 @@ class Examples:
             + record.trail.count(STOP_EXAMPLE_NO_DISCARD_RECORD)
             + record.trail.count(DRAW_BITS_RECORD)
         )
-        self.__example_lengths = None
-
         self.blocks = blocks
+        self.__replayed = False
         self.__children = None
-
-    @calculated_example_property
-    class starts_and_ends(ExampleProperty):
-        def begin(self):
-            self.starts = IntList.of_length(len(self.examples))
-            self.ends = IntList.of_length(len(self.examples))
-
-        def start_example(self, i, label_index):
-            self.starts[i] = self.bytes_read
-
-        def stop_example(self, i, label_index):
-            self.ends[i] = self.bytes_read
-
-        def finish(self):
-            return (self.starts, self.ends)
-
-    @property
-    def starts(self):
-        return self.starts_and_ends[0]
-
-    @property
-    def ends(self):
-        return self.starts_and_ends[1]
-
-    @calculated_example_property
-    class discarded(ExampleProperty):
-        def begin(self):
-            self.result = set()
-
-        def finish(self):
-            return frozenset(self.result)
-
-        def stop_example(self, i, discarded):
-            if discarded:
-                self.result.add(i)
-
-    @calculated_example_property
-    class trivial(ExampleProperty):
-        def begin(self):
-            self.nontrivial = IntList.of_length(len(self.examples))
-            self.result = set()
-
-        def block(self, i):
-            if not self.examples.blocks.trivial(i):
-                self.nontrivial[self.example_stack[-1]] = 1
-
-        def stop_example(self, i, discarded):
-            if self.nontrivial[i]:
-                if self.example_stack:
-                    self.nontrivial[self.example_stack[-1]] = 1
+        self.__trivial = None
+        self.__examples_by_label_index = None
+
+    def __getattr__(self, name):
+        # Only called for attributes that have not been set yet, so once
+        # we have replayed the trail, reading them is a plain attribute
+        # access.
+        if name in REPLAYED_ATTRIBUTES and not self.__replayed:
+            self.__replay()
+            return getattr(self, name)
+        raise AttributeError(name)
+
+    def __replay(self):
+        """Calculate every attribute in ``REPLAYED_ATTRIBUTES`` by replaying
+        the trail, accumulating them in plain lists which we then convert to
+        more compact representations."""
+        n = len(self)
+        endpoints = self.blocks.endpoints
+        starts = [0] * n
+        ends = [0] * n
+        depths = [0] * n
+        label_indices = [0] * n
+        parentage = [0] * n
+        discarded = set()
+        groups = defaultdict(list)
+        block_examples = []
+
+        stack = []
+        bytes_read = 0
+        count = 0
+        for record in self.trail:
+            if record == DRAW_BITS_RECORD or record >= START_EXAMPLE_RECORD:
+                # Both kinds of record begin a new example, but the example
+                # for a draw is also finished again immediately.
+                i = count
+                count += 1
+                if record == DRAW_BITS_RECORD:
+                    label_index = 0
+                else:
+                    label_index = record - START_EXAMPLE_RECORD
+                depth = len(stack)
+                starts[i] = bytes_read
+                depths[i] = depth
+                label_indices[i] = label_index
+                groups[label_index, depth].append(i)
+                if stack:
+                    parentage[i] = stack[-1]
+                if record == DRAW_BITS_RECORD:
+                    bytes_read = endpoints[len(block_examples)]
+                    ends[i] = bytes_read
+                    block_examples.append(i)
+                else:
+                    stack.append(i)
             else:
-                self.result.add(i)
-
-        def finish(self):
-            return frozenset(self.result)
-
-    @calculated_example_property
-    class parentage(ExampleProperty):
-        def stop_example(self, i, discarded):
-            if i > 0:
-                self.result[i] = self.example_stack[-1]
-
-    @calculated_example_property
-    class depths(ExampleProperty):
-        def begin(self):
-            self.result = IntList.of_length(len(self.examples))
-
-        def start_example(self, i, label_index):
-            self.result[i] = len(self.example_stack)
-
-    @calculated_example_property
-    class label_indices(ExampleProperty):
-        def start_example(self, i, label_index):
-            self.result[i] = label_index
-
-    @calculated_example_property
-    class mutator_groups(ExampleProperty):
-        def begin(self):
-            self.groups = defaultdict(list)
-
-        def start_example(self, i, label_index):
-            depth = len(self.example_stack)
-            self.groups[label_index, depth].append(i)
-
-        def finish(self):
-            # Discard groups with only one example, since the mutator can't
-            # do anything useful with them.
-            return [g for g in self.groups.values() if len(g) >= 2]
+                i = stack.pop()
+                ends[i] = bytes_read
+                if record == STOP_EXAMPLE_DISCARD_RECORD:
+                    discarded.add(i)
+        assert count == n
+
+        self.starts = IntList(starts)
+        self.ends = IntList(ends)
+        self.depths = IntList(depths)
+        self.label_indices = IntList(label_indices)
+        self.parentage = IntList(parentage)
+        self.discarded = frozenset(discarded)
+        # Discard groups with only one example, since the mutator can't
+        # do anything useful with them.
+        self.mutator_groups = [g for g in groups.values() if len(g) >= 2]
+        self.block_examples = IntList(block_examples)
+        self.__replayed = True
 
     @property
     def children(self):
         if self.__children is None:
-            self.__children = [IntList() for _ in range(len(self))]
+            children = [None] * len(self)
             for i, p in enumerate(self.parentage):
                 if i > 0:
-                    self.__children[p].append(i)
-            # Replace empty children lists with a tuple to reduce
+                    if children[p] is None:
+                        children[p] = [i]
+                    else:
+                        children[p].append(i)
+            # Examples without children share an empty tuple, to reduce
             # memory usage.
-            for i, c in enumerate(self.__children):
-                if not c:
-                    self.__children[i] = ()
+            self.__children = [() if c is None else tuple(c) for c in children]
         return self.__children
 
+    @property
+    def trivial(self):
+        if self.__trivial is None:
+            nontrivial = [False] * len(self)
+            for block, i in enumerate(self.block_examples):
+                if not self.blocks.trivial(block):
+                    nontrivial[i] = True
+            # Every example comes after its parent, so working backwards we
+            # have seen all of an example's children by the time we reach it.
+            parentage = list(self.parentage)
+            for i in range(len(self) - 1, 0, -1):
+                if nontrivial[i]:
+                    nontrivial[parentage[i]] = True
+            self.__trivial = frozenset(
+                i for i, is_nontrivial in enumerate(nontrivial) if not is_nontrivial
+            )
+        return self.__trivial
+
+    @property
+    def examples_by_label_index(self):
+        if self.__examples_by_label_index is None:
+            by_label = [[] for _ in self.labels]
+            for i, label_index in enumerate(self.label_indices):
+                by_label[label_index].append(i)
+            self.__examples_by_label_index = [IntList(ls) for ls in by_label]
+        return self.__examples_by_label_index
+
     def __len__(self):
         return self.__length
 
@@ -735,10 +674,16 @@ class ConjectureResult:
         return self
 
 
-# Masks for masking off the first byte of an n-bit buffer.
-# The appropriate mask is stored at position n % 8.
-BYTE_MASKS = [(1 << n) - 1 for n in range(8)]
-BYTE_MASKS[0] = 255
+# Masks for the low n bits of an integer, precomputed for the sizes of draw
+# that are common enough for building the mask to show up in profiles.
+BIT_MASKS = [(1 << n) - 1 for n in range(129)]
+
+
+def bit_mask(n):
+    """Return an integer with the low ``n`` bits set."""
+    if n < len(BIT_MASKS):
+        return BIT_MASKS[n]
+    return (1 << n) - 1
 
 
 class ConjectureData:
@@ -987,43 +932,44 @@ class ConjectureData:
         if n == 0:
             return 0
         assert n > 0
-        n_bytes = bits_to_bytes(n)
-        self.__check_capacity(n_bytes)
+        n_bytes = (n + 7) >> 3
+        index = self.index
+        if index + n_bytes > self.max_length:
+            self.mark_overrun()
 
+        # Build the result directly as an integer rather than going via
+        # an intermediate bytearray.  Masking the result is equivalent to
+        # masking the high bits of the first byte, so this draws exactly
+        # the same values from the same prefix and random state.
         if forced is not None:
-            buf = int_to_bytes(forced, n_bytes)
-        elif self.__bytes_drawn < len(self.__prefix):
-            index = self.__bytes_drawn
-            buf = self.__prefix[index : index + n_bytes]
-            if len(buf) < n_bytes:
-                buf += uniform(self.__random, n_bytes - len(buf))
+            assert bit_length(forced) <= n
+            result = forced
         else:
-            buf = uniform(self.__random, n_bytes)
-        buf = bytearray(buf)
+            drawn = self.__bytes_drawn
+            prefix = self.__prefix
+            if drawn + n_bytes <= len(prefix):
+                result = int_from_bytes(prefix[drawn : drawn + n_bytes])
+            elif drawn < len(prefix):
+                n_random = drawn + n_bytes - len(prefix)
+                result = (int_from_bytes(prefix[drawn:]) << (8 * n_random)) | (
+                    self.__random.getrandbits(8 * n_random)
+                )
+            else:
+                result = self.__random.getrandbits(8 * n_bytes)
+            result &= bit_mask(n)
         self.__bytes_drawn += n_bytes
 
-        assert len(buf) == n_bytes
-
-        # If we have a number of bits that is not a multiple of 8
-        # we have to mask off the high bits.
-        buf[0] &= BYTE_MASKS[n % 8]
-        buf = bytes(buf)
-        result = int_from_bytes(buf)
-
         self.observer.draw_bits(n, forced is not None, result)
         self.__example_record.draw_bits(n, forced)
 
-        initial = self.index
-
-        self.buffer.extend(buf)
-        self.index = len(self.buffer)
+        self.buffer.extend(result.to_bytes(n_bytes, "big"))
+        self.index = index + n_bytes
 
         if forced is not None:
-            self.forced_indices.update(range(initial, self.index))
+            self.forced_indices.update(range(index, self.index))
 
         self.blocks.add_endpoint(self.index)
 
-        assert bit_length(result) <= n
         return result
 
     def draw_bytes(self, n):
@@ -1039,10 +985,6 @@ class ConjectureData:
         self.draw_bits(len(string) * 8, forced=int_from_bytes(string))
         return self.buffer[-len(string) :]
 
-    def __check_capacity(self, n):
-        if self.index + n > self.max_length:
-            self.mark_overrun()
-
     def conclude_test(self, status, interesting_origin=None):
         assert (interesting_origin is None) or (status == Status.INTERESTING)
         self.__assert_not_frozen("conclude_test")
@@ -13,6 +13,9 @@
 #
 # END HEADER
 
+from array import array
+from bisect import insort
+
 import attr
 
 from hypothesis.errors import Flaky, HypothesisException
@@ -41,6 +44,40 @@ def inconsistent_generation():
 
 EMPTY = frozenset()
 
+# The kinds of transition that can follow the sequence of draws stored
+# at a node. See ``DataTree`` for what each of these means.
+UNKNOWN = 0
+BRANCH = 1
+CONCLUSION = 2
+KILLED = 3
+
+
+# The first byte of the output of ``DataTree.to_bytes``, so that we can
+# change the format later without misreading trees stored by old versions.
+SERIALIZATION_VERSION = 0
+
+
+def _write_uint(out, n):
+    """Append ``n`` to ``out`` as a little-endian base 128 varint."""
+    while n >= 0x80:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _read_uint(buffer, i):
+    """Read a varint written by ``_write_uint`` from ``buffer`` at index
+    ``i``, and return it along with the index after it."""
+    result = 0
+    shift = 0
+    while True:
+        byte = buffer[i]
+        i += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, i
+        shift += 7
+
 
 @attr.s(slots=True)
 class Killed:
@@ -81,139 +118,335 @@ def conclusion(status, interesting_origin):
     return CONCLUSIONS.setdefault(result, result)
 
 
-@attr.s(slots=True)
+@attr.s(slots=True, frozen=True)
 class TreeNode:
-    """Node in a tree that corresponds to previous interactions with
-    a ``ConjectureData`` object according to some fixed test function.
+    """A read-only view of a single node in a ``DataTree``.
 
-    This is functionally a variant patricia trie.
-    See https://en.wikipedia.org/wiki/Radix_tree for the general idea,
-    but what this means in particular here is that we have a very deep
-    but very lightly branching tree and rather than store this as a fully
-    recursive structure we flatten prefixes and long branches into
-    lists. This significantly compacts the storage requirements.
-
-    A single ``TreeNode`` corresponds to a previously seen sequence
-    of calls to ``ConjectureData`` which we have never seen branch,
-    followed by a ``transition`` which describes what happens next.
+    The tree stores its nodes in flat arrays and refers to them by index,
+    so this class is never used by the tree itself. It exists to make the
+    tree easy to inspect when testing or debugging.
     """
 
-    # Records the previous sequence of calls to ``data.draw_bits``,
-    # with the ``n_bits`` argument going in ``bit_lengths`` and the
-    # values seen in ``values``. These should always have the same
-    # length.
-    bit_lengths = attr.ib(default=attr.Factory(IntList))
-    values = attr.ib(default=attr.Factory(IntList))
-
-    # The indices of of the calls to ``draw_bits`` that we have stored
-    # where  ``forced`` is not None. Stored as None if no indices
-    # have been forced, purely for space saving reasons (we force
-    # quite rarely).
-    __forced = attr.ib(default=None, init=False)
-
-    # What happens next after observing this sequence of calls.
-    # Either:
-    #
-    # * ``None``, indicating we don't know yet.
-    # * A ``Branch`` object indicating that there is a ``draw_bits``
-    #   call that we have seen take multiple outcomes there.
-    # * A ``Conclusion`` object indicating that ``conclude_test``
-    #   was called here.
-    transition = attr.ib(default=None)
-
-    # A tree node is exhausted if every possible sequence of
-    # draws below it has been explored. We store this information
-    # on a field and update it when performing operations that
-    # could change the answer.
-    #
-    # A node may start exhausted, e.g. because it it leads
-    # immediately to a conclusion, but can only go from
-    # non-exhausted to exhausted when one of its children
-    # becomes exhausted or it is marked as a conclusion.
-    #
-    # Therefore we only need to check whether we need to update
-    # this field when the node is first created in ``split_at``
-    # or when we have walked a path through this node to a
-    # conclusion in ``TreeRecordingObserver``.
-    is_exhausted = attr.ib(default=False, init=False)
+    tree = attr.ib(eq=False, repr=False)
+    index = attr.ib()
+
+    @property
+    def bit_lengths(self):
+        start = self.tree._starts[self.index]
+        return self.tree._bit_lengths[start : start + self.tree._lengths[self.index]]
+
+    @property
+    def values(self):
+        start = self.tree._starts[self.index]
+        return self.tree._values[start : start + self.tree._lengths[self.index]]
 
     @property
     def forced(self):
-        if not self.__forced:
-            return EMPTY
-        return self.__forced
-
-    def mark_forced(self, i):
-        """Note that the value at index ``i`` was forced."""
-        assert 0 <= i < len(self.values)
-        if self.__forced is None:
-            self.__forced = set()
-        self.__forced.add(i)
-
-    def split_at(self, i):
-        """Splits the tree so that it can incorporate
-        a decision at the ``draw_bits`` call corresponding
-        to position ``i``, or raises ``Flaky`` if that was
-        meant to be a forced node."""
-
-        if i in self.forced:
-            inconsistent_generation()
+        start = self.tree._starts[self.index]
+        forced = self.tree._forced[start : start + self.tree._lengths[self.index]]
+        return {i for i, f in enumerate(forced) if f} or EMPTY
 
-        assert not self.is_exhausted
+    @property
+    def transition(self):
+        kind = self.tree._kinds[self.index]
+        transition = self.tree._transitions[self.index]
+        if kind == BRANCH:
+            return Branch(
+                bit_length=self.tree._branch_bits[self.index],
+                children={
+                    k: TreeNode(self.tree, child) for k, child in transition.items()
+                },
+            )
+        if kind == KILLED:
+            return Killed(TreeNode(self.tree, transition))
+        return transition
+
+    @property
+    def is_exhausted(self):
+        return bool(self.tree._exhausted[self.index])
 
-        key = self.values[i]
-
-        child = TreeNode(
-            bit_lengths=self.bit_lengths[i + 1 :],
-            values=self.values[i + 1 :],
-            transition=self.transition,
-        )
-        self.transition = Branch(bit_length=self.bit_lengths[i], children={key: child})
-        if self.__forced is not None:
-            child.__forced = {j - i - 1 for j in self.__forced if j > i}
-            self.__forced = {j for j in self.__forced if j < i}
-        child.check_exhausted()
-        del self.values[i:]
-        del self.bit_lengths[i:]
-        assert len(self.values) == len(self.bit_lengths) == i
-
-    def check_exhausted(self):
-        """Recalculates ``self.is_exhausted`` if necessary then returns
-        it."""
-        if (
-            not self.is_exhausted
-            and len(self.forced) == len(self.values)
-            and self.transition is not None
-        ):
-            if isinstance(self.transition, (Conclusion, Killed)):
-                self.is_exhausted = True
-            elif len(self.transition.children) == self.transition.max_children:
-                self.is_exhausted = all(
-                    v.is_exhausted for v in self.transition.children.values()
-                )
-        return self.is_exhausted
+
+class BranchSummary:
+    """The children of a branch in a ``DataTree``, indexed so that we can
+    choose a random value that has not been seen there, or a random child
+    that is not exhausted, without looking at every child."""
+
+    __slots__ = ("keys", "live", "positions")
+
+    def __init__(self):
+        # The values that have been seen at the branch, in sorted order.
+        self.keys = []
+        # The ``(value, child)`` pairs for children that are not exhausted,
+        # in no particular order, and the position of each in that list.
+        self.live = []
+        self.positions = {}
+
+    def add(self, value, child):
+        insort(self.keys, value)
+        self.positions[child] = len(self.live)
+        self.live.append((value, child))
+
+    def remove_live(self, child):
+        i = self.positions.pop(child)
+        last = self.live.pop()
+        if i < len(self.live):
+            self.live[i] = last
+            self.positions[last[1]] = i
+
+    def nth_unseen(self, n):
+        """Return the ``n``'th smallest value not in ``keys``."""
+        # Below keys[i] there are keys[i] - i unseen values, so we find the
+        # first key with more than ``n`` unseen values below it.
+        lo = 0
+        hi = len(self.keys)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.keys[mid] - mid > n:
+                hi = mid
+            else:
+                lo = mid + 1
+        return n + lo
 
 
 class DataTree:
     """Tracks the tree structure of a collection of ConjectureData
-    objects, for use in ConjectureRunner."""
+    objects, for use in ConjectureRunner.
+
+    This is functionally a variant patricia trie.
+    See https://en.wikipedia.org/wiki/Radix_tree for the general idea,
+    but what this means in particular here is that we have a very deep
+    but very lightly branching tree and rather than store this as a fully
+    recursive structure we flatten prefixes and long branches into
+    lists. This significantly compacts the storage requirements.
+
+    A single node corresponds to a previously seen sequence of calls to
+    ``ConjectureData`` which we have never seen branch, followed by a
+    transition which describes what happens next.
+
+    Long runs produce trees with a very large number of nodes, so rather
+    than allocating several objects per node we identify each node by an
+    integer index and keep its fields in flat arrays on the tree, one entry
+    per node. ``TreeNode`` provides a view of a single node for inspection.
+    """
 
     def __init__(self):
-        self.root = TreeNode()
+        # Records the calls to ``data.draw_bits`` of every node, with the
+        # ``n_bits`` argument going in ``_bit_lengths``, the values seen in
+        # ``_values``, and whether the value was forced in ``_forced``.
+        # Node ``i`` owns the ``_lengths[i]`` entries starting at
+        # ``_starts[i]``.
+        self._bit_lengths = IntList()
+        self._values = IntList()
+        self._forced = bytearray()
+        self._starts = array("Q")
+        self._lengths = array("I")
+
+        # What happens next after observing a node's sequence of calls.
+        # ``_kinds`` holds one of:
+        #
+        # * ``UNKNOWN``, indicating we don't know yet.
+        # * ``BRANCH``, indicating that there is a ``draw_bits`` call
+        #   of ``_branch_bits`` bits that we have seen take multiple
+        #   outcomes there. ``_transitions`` holds a dict mapping each
+        #   outcome to the index of the child node.
+        # * ``CONCLUSION``, indicating that ``conclude_test`` was called
+        #   here. ``_transitions`` holds the ``Conclusion``.
+        # * ``KILLED``, indicating that the branch was killed here.
+        #   ``_transitions`` holds the index of the next node.
+        self._kinds = bytearray()
+        self._transitions = []
+        self._branch_bits = array("I")
+
+        # A node is exhausted if every possible sequence of draws below
+        # it has been explored. We store this information and update it
+        # when performing operations that could change the answer.
+        #
+        # A node may start exhausted, e.g. because it it leads
+        # immediately to a conclusion, but can only go from
+        # non-exhausted to exhausted when one of its children
+        # becomes exhausted or it is marked as a conclusion.
+        #
+        # Therefore we only need to check whether we need to update
+        # this field when the node is first created in ``_split_at``
+        # or when we have walked a path through this node to a
+        # conclusion in ``TreeRecordingObserver``.
+        self._exhausted = bytearray()
+
+        # The number of exhausted children of each branch, so that we can
+        # tell when a branch is exhausted, and choose between its remaining
+        # children, without looking at every child. We keep this up to date
+        # by always telling ``_check_exhausted`` about a node's parent.
+        self._n_exhausted = array("I")
+
+        # For dense branches, a ``BranchSummary`` of their children, which
+        # we keep up to date as children are added and exhausted. See
+        # ``_choose_child``.
+        self._branch_summaries = {}
+
+        self._root = self._new_node()
+
+    @property
+    def root(self):
+        return TreeNode(self, self._root)
 
     @property
     def is_exhausted(self):
         """Returns True if every possible node is dead and thus the language
         described must have been fully explored."""
-        return self.root.is_exhausted
+        return bool(self._exhausted[self._root])
+
+    def _new_node(self):
+        node = len(self._kinds)
+        self._starts.append(len(self._forced))
+        self._lengths.append(0)
+        self._kinds.append(UNKNOWN)
+        self._transitions.append(None)
+        self._branch_bits.append(0)
+        self._exhausted.append(0)
+        self._n_exhausted.append(0)
+        return node
+
+    def _append_draw(self, node, n_bits, value, forced):
+        """Extend the sequence of draws stored at ``node``, whose
+        transition must still be unknown."""
+        start = self._starts[node]
+        length = self._lengths[node]
+        end = len(self._forced)
+        if start + length != end:
+            # Draws can only be appended in place at the end of the arrays,
+            # so move this node's draws there first. Nodes are almost always
+            # extended immediately after they are created, so this is rare.
+            self._bit_lengths.extend(self._bit_lengths[start : start + length])
+            self._values.extend(self._values[start : start + length])
+            self._forced.extend(self._forced[start : start + length])
+            self._starts[node] = end
+        self._bit_lengths.append(n_bits)
+        self._values.append(value)
+        self._forced.append(bool(forced))
+        self._lengths[node] = length + 1
+
+    def _split_at(self, node, i):
+        """Splits ``node`` so that it can incorporate a decision at the
+        ``draw_bits`` call corresponding to position ``i``, or raises
+        ``Flaky`` if that was meant to be a forced node."""
+        start = self._starts[node]
+        if self._forced[start + i]:
+            inconsistent_generation()
+
+        assert not self._exhausted[node]
+
+        # The new child takes over the draws after position ``i`` in place,
+        # along with which of them were forced, so splitting never has to
+        # copy anything.
+        child = self._new_node()
+        self._starts[child] = start + i + 1
+        self._lengths[child] = self._lengths[node] - i - 1
+        self._kinds[child] = self._kinds[node]
+        self._transitions[child] = self._transitions[node]
+        self._branch_bits[child] = self._branch_bits[node]
+        self._n_exhausted[child] = self._n_exhausted[node]
+        summary = self._branch_summaries.pop(node, None)
+        if summary is not None:
+            self._branch_summaries[child] = summary
+
+        self._kinds[node] = BRANCH
+        self._transitions[node] = {self._values[start + i]: child}
+        self._branch_bits[node] = self._bit_lengths[start + i]
+        self._n_exhausted[node] = 0
+        self._lengths[node] = i
+        self._check_exhausted(child, node)
+
+    def _check_exhausted(self, node, parent):
+        """Recalculates whether ``node`` is exhausted if necessary then
+        returns it. ``parent`` is the node before ``node`` on the path from
+        the root, or None if ``node`` is the root."""
+        if self._exhausted[node] or self._kinds[node] == UNKNOWN:
+            return bool(self._exhausted[node])
+        start = self._starts[node]
+        length = self._lengths[node]
+        if self._forced.count(1, start, start + length) != length:
+            return False
+        if (
+            self._kinds[node] == BRANCH
+            and self._n_exhausted[node] < 1 << self._branch_bits[node]
+        ):
+            return False
+        self._exhausted[node] = 1
+        if parent is not None and self._kinds[parent] == BRANCH:
+            self._n_exhausted[parent] += 1
+            summary = self._branch_summaries.get(parent)
+            if summary is not None:
+                summary.remove_live(node)
+        return True
+
+    def _add_child(self, node, value):
+        """Add a new child to the branch at ``node`` for ``value``, which
+        must not have been seen there before, and return it."""
+        child = self._new_node()
+        self._transitions[node][value] = child
+        summary = self._branch_summaries.get(node)
+        if summary is not None:
+            summary.add(value, child)
+        return child
+
+    def _summary(self, node):
+        summary = self._branch_summaries.get(node)
+        if summary is None:
+            summary = BranchSummary()
+            for k, child in self._transitions[node].items():
+                summary.add(k, child)
+                if self._exhausted[child]:
+                    summary.remove_live(child)
+            self._branch_summaries[node] = summary
+        return summary
+
+    def _choose_child(self, node, random, depth_bias):
+        """Choose a value for the branch at ``node`` which leads to a novel
+        prefix, and return it along with the child it leads to, or None if
+        the value has not been seen here before.
+
+        We know how many values of the branch are unseen and how many of its
+        children are not exhausted, but not how many novel prefixes lie below
+        each child, so we choose between those values and children rather
+        than between the novel prefixes themselves.
+        """
+        children = self._transitions[node]
+        n_bits = self._branch_bits[node]
+        n_values = 1 << n_bits
+        n_unseen = n_values - len(children)
+        # While at least half of the values are unseen, simple rejection
+        # sampling needs at most two draws on average, and doesn't need to
+        # look at the children.
+        sparse = 2 * n_unseen >= n_values
+        if sparse and depth_bias == 1:
+            while True:
+                k = random.getrandbits(n_bits)
+                child = children.get(k)
+                if child is None or not self._exhausted[child]:
+                    return k, child
+
+        n_live = len(children) - self._n_exhausted[node]
+        if n_unseen and (
+            not n_live or random.random() * (n_unseen + n_live * depth_bias) < n_unseen
+        ):
+            if sparse:
+                while True:
+                    k = random.getrandbits(n_bits)
+                    if k not in children:
+                        return k, None
+            return self._summary(node).nth_unseen(random.randrange(n_unseen)), None
+        return random.choice(self._summary(node).live)
 
-    def generate_novel_prefix(self, random):
+    def generate_novel_prefix(self, random, *, depth_bias=1):
         """Generate a short random string that (after rewriting) is not
         a prefix of any buffer previously added to the tree.
 
-        The resulting prefix is essentially arbitrary - it would be nice
-        for it to be uniform at random, but previous attempts to do that
-        have proven too expensive.
+        At each branch, we choose between the values that have not been
+        seen there yet and the children that are not exhausted. Each
+        unseen value has weight one and each child has weight
+        ``depth_bias``, so by default every choice that could lead to a
+        novel prefix is equally likely, and larger values of ``depth_bias``
+        prefer longer prefixes which diverge deeper in the tree.
         """
         assert not self.is_exhausted
         novel_prefix = bytearray()
@@ -221,13 +454,14 @@ class DataTree:
         def append_int(n_bits, value):
             novel_prefix.extend(int_to_bytes(value, bits_to_bytes(n_bits)))
 
-        current_node = self.root
+        node = self._root
         while True:
-            assert not current_node.is_exhausted
-            for i, (n_bits, value) in enumerate(
-                zip(current_node.bit_lengths, current_node.values)
-            ):
-                if i in current_node.forced:
+            assert not self._exhausted[node]
+            start = self._starts[node]
+            for j in range(start, start + self._lengths[node]):
+                n_bits = self._bit_lengths[j]
+                value = self._values[j]
+                if self._forced[j]:
                     append_int(n_bits, value)
                 else:
                     while True:
@@ -239,34 +473,15 @@ class DataTree:
                     # vary, so what follows is not fixed.
                     return bytes(novel_prefix)
             else:
-                assert not isinstance(current_node.transition, (Conclusion, Killed))
-                if current_node.transition is None:
+                kind = self._kinds[node]
+                assert kind not in (CONCLUSION, KILLED)
+                if kind == UNKNOWN:
                     return bytes(novel_prefix)
-                branch = current_node.transition
-                assert isinstance(branch, Branch)
-                n_bits = branch.bit_length
-
-                check_counter = 0
-                while True:
-                    k = random.getrandbits(n_bits)
-                    try:
-                        child = branch.children[k]
-                    except KeyError:
-                        append_int(n_bits, k)
-                        return bytes(novel_prefix)
-                    if not child.is_exhausted:
-                        append_int(n_bits, k)
-                        current_node = child
-                        break
-                    check_counter += 1
-                    # We don't expect this assertion to ever fire, but coverage
-                    # wants the loop inside to run if you have branch checking
-                    # on, hence the pragma.
-                    assert (  # pragma: no cover
-                        check_counter != 1000
-                        or len(branch.children) < (2 ** n_bits)
-                        or any(not v.is_exhausted for v in branch.children.values())
-                    )
+                k, child = self._choose_child(node, random, depth_bias)
+                append_int(self._branch_bits[node], k)
+                if child is None:
+                    return bytes(novel_prefix)
+                node = child
 
     def rewrite(self, buffer):
         """Use previously seen ConjectureData objects to return a tuple of
@@ -287,53 +502,189 @@ class DataTree:
         this tree. Note that this does not currently call ``stop_example``
         or ``start_example`` as these are not currently recorded in the
         tree. This will likely change in future."""
-        node = self.root
+        node = self._root
         try:
             while True:
-                for i, (n_bits, previous) in enumerate(
-                    zip(node.bit_lengths, node.values)
-                ):
+                start = self._starts[node]
+                for j in range(start, start + self._lengths[node]):
+                    previous = self._values[j]
                     v = data.draw_bits(
-                        n_bits, forced=node.values[i] if i in node.forced else None
+                        self._bit_lengths[j],
+                        forced=previous if self._forced[j] else None,
                     )
                     if v != previous:
                         raise PreviouslyUnseenBehaviour()
-                if isinstance(node.transition, Conclusion):
-                    t = node.transition
+                kind = self._kinds[node]
+                if kind == CONCLUSION:
+                    t = self._transitions[node]
                     data.conclude_test(t.status, t.interesting_origin)
-                elif node.transition is None:
+                elif kind == UNKNOWN:
                     raise PreviouslyUnseenBehaviour()
-                elif isinstance(node.transition, Branch):
-                    v = data.draw_bits(node.transition.bit_length)
+                elif kind == BRANCH:
+                    v = data.draw_bits(self._branch_bits[node])
                     try:
-                        node = node.transition.children[v]
+                        node = self._transitions[node][v]
                     except KeyError:
                         raise PreviouslyUnseenBehaviour()
                 else:
-                    assert isinstance(node.transition, Killed)
+                    assert kind == KILLED
                     data.observer.kill_branch()
-                    node = node.transition.next_node
+                    node = self._transitions[node]
         except StopTest:
             pass
 
     def new_observer(self):
         return TreeRecordingObserver(self)
 
+    def to_bytes(self, max_nodes=1000):
+        """Serialize the upper levels of this tree, for use as a prior by
+        later runs (see ``from_bytes``).
+
+        Only what ``generate_novel_prefix`` needs is kept: the walk it makes
+        always stops at a node's first draw that was not forced, so nothing
+        after that is stored, and exhausted subtrees are stored as a single
+        exhausted node. At most ``max_nodes`` nodes are stored, chosen in
+        breadth-first order, and children beyond that are left out.
+        """
+        # First choose which nodes to keep. ``kept`` maps each to the number
+        # of draws we keep for it, or None if we only record exhaustion.
+        kept = {self._root: None}
+        queue = [self._root]
+        for node in queue:
+            if self._exhausted[node]:
+                continue
+            start = self._starts[node]
+            length = self._lengths[node]
+            first_free = self._forced.find(0, start, start + length)
+            if first_free >= 0:
+                kept[node] = first_free - start + 1
+                continue
+            kept[node] = length
+            if self._kinds[node] != BRANCH:
+                continue
+            for child in self._transitions[node].values():
+                if len(kept) >= max_nodes:
+                    break
+                kept[child] = None
+                queue.append(child)
+
+        out = bytearray([SERIALIZATION_VERSION])
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            n_draws = kept[node]
+            if n_draws is None:
+                assert self._exhausted[node]
+                _write_uint(out, 0)
+                out.append(KILLED)
+                continue
+            _write_uint(out, n_draws)
+            start = self._starts[node]
+            for j in range(start, start + n_draws):
+                _write_uint(out, self._bit_lengths[j] * 2 + self._forced[j])
+                _write_uint(out, self._values[j])
+            kind = self._kinds[node]
+            if n_draws < self._lengths[node]:
+                out.append(UNKNOWN)
+            elif kind == BRANCH:
+                children = [
+                    (k, c) for k, c in self._transitions[node].items() if c in kept
+                ]
+                out.append(BRANCH)
+                _write_uint(out, self._branch_bits[node])
+                _write_uint(out, len(children))
+                for k, _ in children:
+                    _write_uint(out, k)
+                stack.extend(c for _, c in reversed(children))
+            elif kind == CONCLUSION:
+                out.append(CONCLUSION)
+                out.append(self._transitions[node].status)
+            else:
+                out.append(kind)
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, buffer):
+        """Rebuild a tree from the output of ``to_bytes``, or return None if
+        ``buffer`` is not a valid serialized tree.
+
+        The result describes test cases run by some earlier version of the
+        test function, so it is only suitable as a guide to where novel
+        behaviour might be found. Interesting origins are not stored, so
+        conclusions in it never have one.
+        """
+        try:
+            return cls.__from_bytes(buffer)
+        except (IndexError, ValueError):
+            return None
+
+    @classmethod
+    def __from_bytes(cls, buffer):
+        if not buffer or buffer[0] != SERIALIZATION_VERSION:
+            return None
+        tree = cls()
+        position = [1]
+
+        def read_uint():
+            result, position[0] = _read_uint(buffer, position[0])
+            return result
+
+        def read_byte():
+            result = buffer[position[0]]
+            position[0] += 1
+            return result
+
+        parents = {}
+        stack = [tree._root]
+        while stack:
+            node = stack.pop()
+            for _ in range(read_uint()):
+                n_bits, forced = divmod(read_uint(), 2)
+                tree._append_draw(node, n_bits, read_uint(), forced)
+            kind = read_byte()
+            if kind == BRANCH:
+                tree._branch_bits[node] = n_bits = read_uint()
+                children = {}
+                for _ in range(read_uint()):
+                    k = read_uint()
+                    if k in children or k >> n_bits:
+                        raise ValueError(f"Invalid branch value {k}")
+                    children[k] = tree._new_node()
+                    parents[children[k]] = node
+                stack.extend(reversed(list(children.values())))
+                tree._transitions[node] = children
+            elif kind == CONCLUSION:
+                tree._transitions[node] = conclusion(Status(read_byte()), None)
+            elif kind == KILLED:
+                tree._transitions[node] = tree._new_node()
+            elif kind != UNKNOWN:
+                raise ValueError(f"Unknown transition kind {kind}")
+            tree._kinds[node] = kind
+        if position[0] != len(buffer):
+            raise ValueError("Trailing data after serialized tree")
+        # Children always have higher indices than their parents, so this
+        # updates exhaustion from the leaves up.
+        for node in reversed(range(len(tree._kinds))):
+            tree._check_exhausted(node, parents.get(node))
+        return tree
+
 
 class TreeRecordingObserver(DataObserver):
     def __init__(self, tree):
-        self.__current_node = tree.root
+        self.__tree = tree
+        self.__current_node = tree._root
         self.__index_in_current_node = 0
         self.__trail = [self.__current_node]
         self.killed = False
 
     def draw_bits(self, n_bits, forced, value):
+        tree = self.__tree
         i = self.__index_in_current_node
         self.__index_in_current_node += 1
         node = self.__current_node
-        assert len(node.bit_lengths) == len(node.values)
-        if i < len(node.bit_lengths):
-            if n_bits != node.bit_lengths[i]:
+        if i < tree._lengths[node]:
+            j = tree._starts[node] + i
+            if n_bits != tree._bit_lengths[j]:
                 inconsistent_generation()
             # Note that we don't check whether a previously
             # forced value is now free. That will be caught
@@ -341,38 +692,32 @@ class TreeRecordingObserver(DataObserver):
             # may pass silently. This is acceptable because it
             # means we skip a hash set lookup on every
             # draw and that's a pretty niche failure mode.
-            if forced and i not in node.forced:
+            if forced and not tree._forced[j]:
                 inconsistent_generation()
-            if value != node.values[i]:
-                node.split_at(i)
-                assert i == len(node.values)
-                new_node = TreeNode()
-                branch = node.transition
-                branch.children[value] = new_node
-                self.__current_node = new_node
+            if value != tree._values[j]:
+                tree._split_at(node, i)
+                assert i == tree._lengths[node]
+                self.__current_node = tree._add_child(node, value)
                 self.__index_in_current_node = 0
         else:
-            trans = node.transition
-            if trans is None:
-                node.bit_lengths.append(n_bits)
-                node.values.append(value)
-                if forced:
-                    node.mark_forced(i)
-            elif isinstance(trans, Conclusion):
-                assert trans.status != Status.OVERRUN
+            kind = tree._kinds[node]
+            if kind == UNKNOWN:
+                tree._append_draw(node, n_bits, value, forced)
+            elif kind == CONCLUSION:
+                assert tree._transitions[node].status != Status.OVERRUN
                 # We tried to draw where history says we should have
                 # stopped
                 inconsistent_generation()
             else:
-                assert isinstance(trans, Branch), trans
-                if n_bits != trans.bit_length:
+                assert kind == BRANCH, kind
+                if n_bits != tree._branch_bits[node]:
                     inconsistent_generation()
                 try:
-                    self.__current_node = trans.children[value]
+                    self.__current_node = tree._transitions[node][value]
                 except KeyError:
-                    self.__current_node = trans.children.setdefault(value, TreeNode())
+                    self.__current_node = tree._add_child(node, value)
                 self.__index_in_current_node = 0
-        if self.__trail[-1] is not self.__current_node:
+        if self.__trail[-1] != self.__current_node:
             self.__trail.append(self.__current_node)
 
     def kill_branch(self):
@@ -382,17 +727,19 @@ class TreeRecordingObserver(DataObserver):
 
         self.killed = True
 
-        if self.__index_in_current_node < len(self.__current_node.values) or (
-            self.__current_node.transition is not None
-            and not isinstance(self.__current_node.transition, Killed)
-        ):
+        tree = self.__tree
+        node = self.__current_node
+        if self.__index_in_current_node < tree._lengths[node] or tree._kinds[
+            node
+        ] not in (UNKNOWN, KILLED):
             inconsistent_generation()
 
-        if self.__current_node.transition is None:
-            self.__current_node.transition = Killed(TreeNode())
+        if tree._kinds[node] == UNKNOWN:
+            tree._kinds[node] = KILLED
+            tree._transitions[node] = tree._new_node()
             self.__update_exhausted()
 
-        self.__current_node = self.__current_node.transition.next_node
+        self.__current_node = tree._transitions[node]
         self.__index_in_current_node = 0
         self.__trail.append(self.__current_node)
 
@@ -401,41 +748,47 @@ class TreeRecordingObserver(DataObserver):
         node if necessary and checks for consistency."""
         if status == Status.OVERRUN:
             return
+        tree = self.__tree
         i = self.__index_in_current_node
         node = self.__current_node
 
-        if i < len(node.values) or isinstance(node.transition, Branch):
+        if i < tree._lengths[node] or tree._kinds[node] == BRANCH:
             inconsistent_generation()
 
         new_transition = conclusion(status, interesting_origin)
+        transition = tree._transitions[node]
 
-        if node.transition is not None and node.transition != new_transition:
+        if tree._kinds[node] != UNKNOWN and transition != new_transition:
             # As an, I'm afraid, horrible bodge, we deliberately ignore flakiness
             # where tests go from interesting to valid, because it's much easier
             # to produce good error messages for these further up the stack.
-            if isinstance(node.transition, Conclusion) and (
-                node.transition.status != Status.INTERESTING
+            if tree._kinds[node] == CONCLUSION and (
+                transition.status != Status.INTERESTING
                 or new_transition.status != Status.VALID
             ):
                 raise Flaky(
                     "Inconsistent test results! Test case was %r on first run but %r on second"
-                    % (node.transition, new_transition)
+                    % (transition, new_transition)
                 )
         else:
-            node.transition = new_transition
+            tree._kinds[node] = CONCLUSION
+            tree._transitions[node] = new_transition
 
-        assert node is self.__trail[-1]
-        node.check_exhausted()
-        assert len(node.values) > 0 or node.check_exhausted()
+        assert node == self.__trail[-1]
+        parent = self.__trail[-2] if len(self.__trail) > 1 else None
+        tree._check_exhausted(node, parent)
+        assert tree._lengths[node] > 0 or tree._check_exhausted(node, parent)
 
         if not self.killed:
             self.__update_exhausted()
 
     def __update_exhausted(self):
-        for t in reversed(self.__trail):
+        trail = self.__trail
+        for i in range(len(trail) - 1, -1, -1):
             # Any node we've traversed might have now become exhausted.
             # We check from the right. As soon as we hit a node that
             # isn't exhausted, this automatically implies that all of
             # its parents are not exhausted, so we stop.
-            if not t.check_exhausted():
+            parent = trail[i - 1] if i > 0 else None
+            if not self.__tree._check_exhausted(trail[i], parent):
                 break
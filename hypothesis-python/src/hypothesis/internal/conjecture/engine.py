@@ -13,11 +13,12 @@
 #
 # END HEADER
 
+import json
 import math
 import sys
 import time
 from collections import defaultdict
-from contextlib import contextmanager
+from contextlib import contextmanager, suppress
 from enum import Enum
 from random import Random, getrandbits
 from weakref import WeakKeyDictionary
@@ -26,7 +27,7 @@ import attr
 
 from hypothesis import HealthCheck, Phase, Verbosity, settings as Settings
 from hypothesis._settings import local_settings
-from hypothesis.internal.cache import LRUReusedCache
+from hypothesis.database import BufferedExampleDatabase
 from hypothesis.internal.compat import ceil, int_from_bytes
 from hypothesis.internal.conjecture.data import (
     ConjectureData,
@@ -42,8 +43,16 @@ from hypothesis.internal.conjecture.datatree import (
     TreeRecordingObserver,
 )
 from hypothesis.internal.conjecture.junkdrawer import clamp, stack_depth_of_caller
+from hypothesis.internal.conjecture.parallel import run_in_workers, worker_pool
 from hypothesis.internal.conjecture.pareto import NO_SCORE, ParetoFront, ParetoOptimiser
-from hypothesis.internal.conjecture.shrinker import Shrinker, sort_key
+from hypothesis.internal.conjecture.prefixcache import PrefixCache
+from hypothesis.internal.conjecture.shrinker import (
+    Shrinker,
+    decode_checkpoint,
+    pass_yield,
+    sort_key,
+)
+from hypothesis.internal.conjecture.statistics import PhaseStatistics
 from hypothesis.internal.healthcheck import fail_health_check
 from hypothesis.reporting import base_report, report
 
@@ -57,6 +66,10 @@ CACHE_SIZE = 10000
 MUTATION_POOL_SIZE = 100
 MIN_TEST_CALLS = 10
 BUFFER_SIZE = 8 * 1024
+MAX_STORED_TREE_NODES = 1000
+# Once a shrink pass has this many calls recorded in ``pass_statistics``, we
+# halve its statistics so that recent shrinks count for more than old ones.
+MAX_PASS_STATISTICS_CALLS = 10000
 
 
 @attr.s
@@ -86,6 +99,24 @@ class RunIsComplete(Exception):
     pass
 
 
+def pass_statistics_changed(old, new):
+    """Return whether the shrink pass statistics ``new`` are different enough
+    from the statistics ``old`` that we last loaded or saved to be worth
+    writing to the database: if they rank the passes differently, or are
+    based on at least twice as many calls. Otherwise almost every shrink
+    would rewrite them for little benefit to the next one."""
+
+    def ranking(statistics):
+        return sorted(
+            statistics, key=lambda name: (-pass_yield(*statistics[name]), name)
+        )
+
+    def total_calls(statistics):
+        return sum(calls for calls, _ in statistics.values())
+
+    return ranking(old) != ranking(new) or total_calls(new) >= 2 * total_calls(old)
+
+
 class ConjectureRunner:
     def __init__(
         self,
@@ -99,16 +130,19 @@ class ConjectureRunner:
         self.settings = settings or Settings()
         self.shrinks = 0
         self.finish_shrinking_deadline = None
+        self.shrinking_started_at = None
+        self.calls_at_shrinking_start = 0
         self.call_count = 0
         self.valid_examples = 0
         self.random = random or Random(getrandbits(128))
         self.database_key = database_key
         self.ignore_limits = ignore_limits
 
-        # Global dict of per-phase statistics, and a list of per-call stats
-        # which transfer to the global dict at the end of each phase.
+        # Global dict of per-phase statistics, and a summary of the test cases
+        # run so far in the current phase, which is transferred to the global
+        # dict at the end of each phase.
         self.statistics = {}
-        self.stats_per_test_case = []
+        self.phase_statistics = PhaseStatistics()
 
         self.events_to_strings = WeakKeyDictionary()
 
@@ -123,6 +157,22 @@ class ConjectureRunner:
 
         self.tree = DataTree()
 
+        # A tree loaded from the database which describes test cases run by
+        # previous runs of this test, used to steer generation away from
+        # behaviour we have already explored. See ``generate_novel_prefix``.
+        self.prior_tree = None
+        self.__prior_tree_misses = 0
+        self.__stored_trees = None
+        self.__stored_checkpoints = []
+        self.__stored_pass_statistics = None
+        self.__saved_pass_statistics = {}
+
+        # Maps the name of each shrink pass to the number of calls it has
+        # made and the progress it has made when shrinking failures of this
+        # test, in this and earlier runs, so that shrinkers can try the most
+        # productive passes first.
+        self.pass_statistics = {}
+
         self.best_observed_targets = defaultdict(lambda: NO_SCORE)
         self.best_examples_of_observed_targets = {}
 
@@ -140,13 +190,17 @@ class ConjectureRunner:
         # from running a buffer without recalculating, especially during
         # shrinking where we need to know about the structure of the
         # executed test case.
-        self.__data_cache = LRUReusedCache(CACHE_SIZE)
+        self.__data_cache = PrefixCache(CACHE_SIZE)
 
         # We ensure that the test has this much stack space remaining, no matter
         # the size of the stack when called, to de-flake RecursionErrors (#2494).
         self.__recursion_limit = sys.getrecursionlimit()
         self.__pending_call_explanation = None
 
+        # Pool of worker processes for generating examples in parallel, which
+        # is only set for the duration of ``run()`` if ``settings.workers > 1``.
+        self.__worker_pool = None
+
     def explain_next_call_as(self, explanation):
         self.__pending_call_explanation = explanation
 
@@ -155,14 +209,14 @@ class ConjectureRunner:
 
     @contextmanager
     def _log_phase_statistics(self, phase):
-        self.stats_per_test_case.clear()
+        self.phase_statistics = PhaseStatistics()
         start_time = time.perf_counter()
         try:
             yield
         finally:
             self.statistics[phase + "-phase"] = {
                 "duration-seconds": time.perf_counter() - start_time,
-                "test-cases": list(self.stats_per_test_case),
+                **self.phase_statistics.as_dict(),
                 "distinct-failures": len(self.interesting_examples),
                 "shrinks-successful": self.shrinks,
             }
@@ -227,13 +281,12 @@ class ConjectureRunner:
             # the KeyboardInterrupt, never continue to the code below.
             if not interrupted:  # pragma: no branch
                 data.freeze()
-                call_stats = {
-                    "status": data.status.name.lower(),
-                    "runtime": data.finish_time - data.start_time,
-                    "drawtime": math.fsum(data.draw_times),
-                    "events": sorted({self.event_to_string(e) for e in data.events}),
-                }
-                self.stats_per_test_case.append(call_stats)
+                self.phase_statistics.record(
+                    status=data.status.name.lower(),
+                    runtime=data.finish_time - data.start_time,
+                    drawtime=math.fsum(data.draw_times),
+                    events={self.event_to_string(e) for e in data.events},
+                )
                 self.__data_cache[data.buffer] = data.as_result()
 
         self.debug_data(data)
@@ -271,6 +324,7 @@ class ConjectureRunner:
             try:
                 existing = self.interesting_examples[key]
             except KeyError:
+                existing = None
                 changed = True
                 self.last_bug_found_at = self.call_count
                 if self.first_bug_found_at is None:
@@ -287,6 +341,8 @@ class ConjectureRunner:
                 self.interesting_examples[key] = data.as_result()
                 self.__data_cache.pin(data.buffer)
                 self.shrunk_examples.discard(key)
+                if existing is not None and self.shrinking_started_at is not None:
+                    self.report_shrink_progress(len(existing.buffer), len(data.buffer))
 
             if self.shrinks >= MAX_SHRINKS:
                 self.exit_with(ExitReason.max_shrinks)
@@ -296,17 +352,35 @@ class ConjectureRunner:
             and self.finish_shrinking_deadline is not None
             and self.finish_shrinking_deadline < time.perf_counter()
         ):
-            # See https://github.com/HypothesisWorks/hypothesis/issues/2340
-            report(
-                "WARNING: Hypothesis has spent more than five minutes working to shrink "
-                "a failing example, and stopped because it is making very slow "
-                "progress.  When you re-run your tests, shrinking will resume and "
-                "may take this long before aborting again.\n"
-                "PLEASE REPORT THIS if you can provide a reproducing example, so that "
-                "we can improve shrinking performance for everyone."
+            budget = self.settings.shrink_time_budget
+            message = (
+                f"WARNING: Hypothesis has spent more than {budget.total_seconds():g} "
+                "seconds working to shrink a failing example, and stopped because "
+                "it reached settings.shrink_time_budget, so the example reported may "
+                "not be fully shrunk."
             )
+            if self.has_existing_examples():
+                # We only checkpoint the shrinker if the next run can load it.
+                message += (
+                    "  When you re-run your tests, shrinking will resume from "
+                    "where it stopped."
+                )
+            if budget.total_seconds() >= 5 * 60:
+                # Running out of a budget of at least the default five minutes
+                # means that shrinking is unreasonably slow.
+                # See https://github.com/HypothesisWorks/hypothesis/issues/2340
+                message += (
+                    "\nPLEASE REPORT THIS if you can provide a reproducing example, "
+                    "so that we can improve shrinking performance for everyone."
+                )
+            report(message)
             self.exit_with(ExitReason.very_slow_shrinking)
 
+        self.check_generation_limits()
+
+        self.record_for_health_check(data)
+
+    def check_generation_limits(self):
         if not self.interesting_examples:
             # Note that this logic is reproduced to end the generation phase when
             # we have interesting examples.  Update that too if you change this!
@@ -325,8 +399,6 @@ class ConjectureRunner:
         if self.__tree_is_exhausted():
             self.exit_with(ExitReason.finished)
 
-        self.record_for_health_check(data)
-
     def on_pareto_evict(self, data):
         self.settings.database.delete(self.pareto_key, data.buffer)
 
@@ -338,6 +410,19 @@ class ConjectureRunner:
         least one novel prefix left to find. If there were not, then the
         test run should have already stopped due to tree exhaustion.
         """
+        prior = self.prior_tree
+        if prior is not None:
+            # The prior tree may be out of date, so we only use it to pick
+            # a prefix which is novel to both trees, and give up on it once
+            # that stops working.
+            if not prior.is_exhausted:
+                prefix = prior.generate_novel_prefix(self.random)
+                if self.tree.rewrite(prefix)[1] is None:
+                    self.__prior_tree_misses = 0
+                    return prefix
+            self.__prior_tree_misses += 1
+            if prior.is_exhausted or self.__prior_tree_misses >= 10:
+                self.prior_tree = None
         return self.tree.generate_novel_prefix(self.random)
 
     def record_for_health_check(self, data):
@@ -434,6 +519,20 @@ class ConjectureRunner:
             self.settings.database.move(self.database_key, self.secondary_key, buffer)
 
     def sub_key(self, sub_key):
+        """Return the key under which to store data of the kind ``sub_key``
+        for this test, or the primary key for failing examples if it is None.
+
+        The sub-keys we use are:
+
+        * ``secondary``: examples which used to fail, but are no longer the
+          best failing example we know of.
+        * ``pareto``: examples on the pareto front of target scores.
+        * ``tree``: the upper levels of the DataTree, if
+          ``settings.persist_tree`` is set.
+        * ``shrink``: a checkpoint of an unfinished shrink.
+        * ``passes``: statistics on how productive each shrink pass has
+          been, from ``save_pass_statistics``.
+        """
         if self.database_key is None:
             return None
         if sub_key is None:
@@ -448,6 +547,100 @@ class ConjectureRunner:
     def pareto_key(self):
         return self.sub_key(b"pareto")
 
+    @property
+    def tree_key(self):
+        return self.sub_key(b"tree")
+
+    @property
+    def shrink_checkpoint_key(self):
+        return self.sub_key(b"shrink")
+
+    @property
+    def pass_statistics_key(self):
+        return self.sub_key(b"passes")
+
+    def load_pass_statistics(self, stored):
+        """Load ``pass_statistics`` from the first valid entry of ``stored``,
+        in the format written by ``save_pass_statistics``."""
+        self.__stored_pass_statistics = list(stored)
+        for entry in self.__stored_pass_statistics:
+            try:
+                statistics = json.loads(entry.decode("utf-8"))
+                self.pass_statistics = {
+                    str(name): (int(calls), int(progress))
+                    for name, (calls, progress) in statistics.items()
+                }
+            except (ValueError, TypeError, AttributeError):
+                continue
+            self.__saved_pass_statistics = dict(self.pass_statistics)
+            break
+
+    def record_pass_statistics(self, shrinker):
+        """Add the statistics of each pass run by ``shrinker`` to
+        ``pass_statistics``."""
+        for p in shrinker.passes:
+            if p.calls == 0:
+                continue
+            calls, progress = self.pass_statistics.get(p.name, (0, 0))
+            calls += p.calls
+            progress += p.shrinks + p.deletions
+            if calls > MAX_PASS_STATISTICS_CALLS:
+                calls //= 2
+                progress //= 2
+            self.pass_statistics[p.name] = (calls, progress)
+
+    def save_pass_statistics(self):
+        """Store ``pass_statistics`` in the database, replacing any previously
+        stored statistics, if they have changed enough to be worth writing
+        (see ``pass_statistics_changed``).
+
+        Like the tree, these are only read back in the reuse phase."""
+        if self.database is None or not self.pass_statistics:
+            return
+        if Phase.reuse not in self.settings.phases:
+            return
+        if not pass_statistics_changed(
+            self.__saved_pass_statistics, self.pass_statistics
+        ):
+            return
+        if self.__stored_pass_statistics is None:
+            self.__stored_pass_statistics = list(
+                self.settings.database.fetch(self.pass_statistics_key)
+            )
+        statistics = json.dumps(self.pass_statistics, sort_keys=True).encode("utf-8")
+        stale = [
+            (self.pass_statistics_key, v)
+            for v in self.__stored_pass_statistics
+            if v != statistics
+        ]
+        if stale:
+            self.settings.database.delete_many(stale)
+        if statistics not in self.__stored_pass_statistics:
+            self.settings.database.save(self.pass_statistics_key, statistics)
+        self.__stored_pass_statistics = [statistics]
+        self.__saved_pass_statistics = dict(self.pass_statistics)
+
+    def save_tree(self):
+        """Store the upper levels of ``self.tree`` in the database, replacing
+        any previously stored tree, so that the next run can start exploring
+        where this one left off.
+
+        This is only done if ``settings.persist_tree`` is set. The tree is
+        only read back in the reuse phase, so we do not store it unless both
+        that and the generate phase are enabled."""
+        if self.database is None or not self.settings.persist_tree:
+            return
+        if not {Phase.reuse, Phase.generate}.issubset(self.settings.phases):
+            return
+        if self.__stored_trees is None:
+            self.__stored_trees = list(self.settings.database.fetch(self.tree_key))
+        tree = self.tree.to_bytes(max_nodes=MAX_STORED_TREE_NODES)
+        stale = [(self.tree_key, t) for t in self.__stored_trees if t != tree]
+        if stale:
+            self.settings.database.delete_many(stale)
+        self.settings.database.save(self.tree_key, tree)
+        self.__stored_trees = [tree]
+
     def debug(self, message):
         if self.settings.verbosity >= Verbosity.debug:
             base_report(message)
@@ -490,17 +683,61 @@ class ConjectureRunner:
         self.debug(f"{data.index} bytes {stack[0]!r} -> {status}, {data.output}")
 
     def run(self):
-        with local_settings(self.settings):
+        with local_settings(self.settings), self.buffered_database():
             try:
-                self._run()
+                with worker_pool(
+                    self.__stoppable_test_function, self.settings.workers
+                ) as pool:
+                    self.__worker_pool = pool
+                    self._run()
             except RunIsComplete:
                 pass
+            finally:
+                self.__worker_pool = None
+            self.save_tree()
+            self.save_pass_statistics()
             for v in self.interesting_examples.values():
                 self.debug_data(v)
             self.debug(
                 "Run complete after %d examples (%d valid) and %d shrinks"
                 % (self.call_count, self.valid_examples, self.shrinks)
             )
+            cache = self.__data_cache
+            self.debug(
+                "Result cache had %d hits (%d of them by prefix) and %d misses, "
+                "and holds %d results in %d trie nodes of %d bytes"
+                % (
+                    cache.hits + cache.prefix_hits,
+                    cache.prefix_hits,
+                    cache.misses,
+                    len(cache),
+                    cache.nodes,
+                    cache.stored_bytes,
+                )
+            )
+
+    @contextmanager
+    def buffered_database(self):
+        """Buffer writes to the database for the duration of the run, so that
+        intermediate examples which are immediately superseded while shrinking
+        do not each cost a separate write."""
+        original = self.settings
+        if original.database is None:
+            yield
+            return
+        buffered = BufferedExampleDatabase(original.database)
+        self.settings = Settings(original, database=buffered)
+        try:
+            yield
+        except BaseException:
+            self.settings = original
+            # If the run failed, we still want to save what we can, but a
+            # failure to do so mustn't hide the exception from the run.
+            with suppress(Exception):
+                buffered.flush()
+            raise
+        self.settings = original
+        buffered.flush()
 
     @property
     def database(self):
@@ -536,45 +773,83 @@ class ConjectureRunner:
             # interesting examples, but there are a lot of them, so we down
             # sample the secondary corpus to a more manageable size.
 
-            corpus = sorted(
-                self.settings.database.fetch(self.database_key), key=sort_key
-            )
-            factor = 0.1 if (Phase.generate in self.settings.phases) else 1
-            desired_size = max(2, ceil(factor * self.settings.max_examples))
-
-            if len(corpus) < desired_size:
-                extra_corpus = list(self.settings.database.fetch(self.secondary_key))
-
-                shortfall = desired_size - len(corpus)
-
-                if len(extra_corpus) <= shortfall:
-                    extra = extra_corpus
-                else:
-                    extra = self.random.sample(extra_corpus, shortfall)
-                extra.sort(key=sort_key)
-                corpus.extend(extra)
+            # We fetch all three corpora at once, and delete stale examples
+            # in a single batch at the end, so that we only need a constant
+            # number of round trips to the database however many examples
+            # it contains.
+            keys = [
+                self.database_key,
+                self.secondary_key,
+                self.pareto_key,
+                self.shrink_checkpoint_key,
+                self.pass_statistics_key,
+            ]
+            if self.settings.persist_tree:
+                keys.append(self.tree_key)
+            corpora = self.settings.database.fetch_many(keys)
+            self.load_pass_statistics(corpora[self.pass_statistics_key])
+            if self.settings.persist_tree:
+                self.__stored_trees = corpora[self.tree_key]
+                for stored in self.__stored_trees:
+                    self.prior_tree = DataTree.from_bytes(stored)
+                    if self.prior_tree is not None:
+                        break
+            to_delete = []
+            try:
+                self.__reuse_corpora(corpora, to_delete)
+
+                # A shrink checkpoint is only useful if its shrink target is
+                # still one of our interesting examples, so that we will start
+                # shrinking from it again.
+                interesting = {v.buffer for v in self.interesting_examples.values()}
+                for checkpoint in corpora[self.shrink_checkpoint_key]:
+                    state = decode_checkpoint(checkpoint)
+                    if state is not None and state["buffer"] in interesting:
+                        self.__stored_checkpoints.append(checkpoint)
+                    else:
+                        to_delete.append((self.shrink_checkpoint_key, checkpoint))
+            finally:
+                if to_delete:
+                    self.settings.database.delete_many(to_delete)
+
+    def __reuse_corpora(self, corpora, to_delete):
+        corpus = sorted(corpora[self.database_key], key=sort_key)
+        factor = 0.1 if (Phase.generate in self.settings.phases) else 1
+        desired_size = max(2, ceil(factor * self.settings.max_examples))
+
+        if len(corpus) < desired_size:
+            extra_corpus = list(corpora[self.secondary_key])
+
+            shortfall = desired_size - len(corpus)
+
+            if len(extra_corpus) <= shortfall:
+                extra = extra_corpus
+            else:
+                extra = self.random.sample(extra_corpus, shortfall)
+            extra.sort(key=sort_key)
+            corpus.extend(extra)
 
-            for existing in corpus:
+        for existing in corpus:
+            data = self.cached_test_function(existing)
+            if data.status != Status.INTERESTING:
+                to_delete.append((self.database_key, existing))
+                to_delete.append((self.secondary_key, existing))
+
+        # If we've not found any interesting examples so far we try some of
+        # the pareto front from the last run.
+        if len(corpus) < desired_size and not self.interesting_examples:
+            desired_extra = desired_size - len(corpus)
+            pareto_corpus = list(corpora[self.pareto_key])
+            if len(pareto_corpus) > desired_extra:
+                pareto_corpus = self.random.sample(pareto_corpus, desired_extra)
+            pareto_corpus.sort(key=sort_key)
+
+            for existing in pareto_corpus:
                 data = self.cached_test_function(existing)
-                if data.status != Status.INTERESTING:
-                    self.settings.database.delete(self.database_key, existing)
-                    self.settings.database.delete(self.secondary_key, existing)
-
-            # If we've not found any interesting examples so far we try some of
-            # the pareto front from the last run.
-            if len(corpus) < desired_size and not self.interesting_examples:
-                desired_extra = desired_size - len(corpus)
-                pareto_corpus = list(self.settings.database.fetch(self.pareto_key))
-                if len(pareto_corpus) > desired_extra:
-                    pareto_corpus = self.random.sample(pareto_corpus, desired_extra)
-                pareto_corpus.sort(key=sort_key)
-
-                for existing in pareto_corpus:
-                    data = self.cached_test_function(existing)
-                    if data not in self.pareto_front:
-                        self.settings.database.delete(self.pareto_key, existing)
-                    if data.status == Status.INTERESTING:
-                        break
+                if data not in self.pareto_front:
+                    to_delete.append((self.pareto_key, existing))
+                if data.status == Status.INTERESTING:
+                    break
 
     def exit_with(self, reason):
         if self.ignore_limits:
@@ -690,6 +965,13 @@ class ConjectureRunner:
         ran_optimisations = False
 
         while self.should_generate_more():
+            if self.__worker_pool is not None and self.health_check_state is None:
+                # Once the health checks have passed we hand generation over to
+                # the worker processes, as the small example heuristics and
+                # mutations below depend on seeing each result before choosing
+                # the next test case.
+                break
+
             prefix = self.generate_novel_prefix()
             assert len(prefix) <= BUFFER_SIZE
             if (
@@ -762,6 +1044,116 @@ class ConjectureRunner:
                 ran_optimisations = True
                 self.optimise_targets()
 
+        if self.__worker_pool is None:
+            return
+
+        while self.should_generate_more():
+            self.generate_examples_in_workers()
+            if (
+                self.valid_examples >= max(small_example_cap, optimise_at)
+                and not ran_optimisations
+            ):
+                ran_optimisations = True
+                self.optimise_targets()
+
+    def generate_examples_in_workers(self):
+        """Run one batch of novel test cases, one per worker process, and
+        merge the results into our state in a deterministic order.
+
+        Worker results update the tree, our counters and the result cache.
+        Anything that needs more handling than that - an interesting example,
+        one with target observations, or a test case which raised an error we
+        need to propagate - is re-run in this process from the same prefix
+        and seed.
+        """
+        tasks = []
+        for _ in range(self.settings.workers):
+            if self.tree.is_exhausted:
+                break
+            prefix = self.generate_novel_prefix()
+            assert len(prefix) <= BUFFER_SIZE
+            tasks.append((prefix, BUFFER_SIZE, self.random.getrandbits(64)))
+
+        results = run_in_workers(self.__worker_pool, tasks)
+        for task, result in zip(tasks, results):
+            if not self.should_generate_more():
+                break
+            if (
+                result is None
+                or result.status == Status.INTERESTING
+                or result.has_target_observations
+            ):
+                prefix, max_length, seed = task
+                data = ConjectureData(
+                    prefix=prefix,
+                    max_length=max_length,
+                    random=Random(seed),
+                    observer=self.tree.new_observer(),
+                )
+                self.test_function(data)
+                continue
+
+            self.record_worker_result(result)
+            self.check_generation_limits()
+
+    def record_worker_result(self, result):
+        """Account for a test case which was run in a worker process, by
+        adding it to the tree and the result cache and updating our
+        counters."""
+        self.call_count += 1
+        result.replay(self.tree.new_observer())
+        self.__data_cache[result.buffer] = (
+            Overrun if result.result is None else result.result
+        )
+        self.phase_statistics.record(
+            status=result.status.name.lower(),
+            runtime=result.runtime,
+            drawtime=result.drawtime,
+            events=result.events,
+        )
+        if result.status == Status.VALID:
+            self.valid_examples += 1
+
+    def run_speculatively(self, buffers):
+        """Run each of ``buffers`` whose result we can't already predict in
+        the worker processes, at once.
+
+        Returns a dict mapping the index of each buffer that was run to its
+        status. This is used by the shrinker to rule out candidates without
+        running them one at a time, so buffers we don't run here (because
+        there are no workers, or the result is already known, or the worker
+        hit an error) are simply left out and will be run normally when the
+        shrinker gets to them.
+
+        Results are recorded and cached as for generation, so the shrinker
+        can look them up without running them again. Interesting results and
+        ones with target observations are not recorded, as they need the full
+        handling of ``test_function`` and will be run again in this process.
+        """
+        if self.__worker_pool is None:
+            return {}
+        tasks = []
+        indices = []
+        for i, buffer in enumerate(buffers):
+            buffer = bytes(buffer)[:BUFFER_SIZE]
+            if (
+                self.__data_cache.find(buffer) is not None
+                or self.tree.rewrite(buffer)[1] is not None
+            ):
+                continue
+            indices.append(i)
+            tasks.append((buffer, len(buffer), 0))
+        statuses = {}
+        for i, result in zip(indices, run_in_workers(self.__worker_pool, tasks)):
+            if result is not None:
+                if (
+                    result.status != Status.INTERESTING
+                    and not result.has_target_observations
+                ):
+                    self.record_worker_result(result)
+                statuses[i] = result.status
+        return statuses
+
     def generate_mutations_from(self, data):
         # A thing that is often useful but rarely happens by accident is
         # to generate the same value at multiple different points in the
@@ -927,11 +1319,18 @@ class ConjectureRunner:
 
         self.debug("Shrinking interesting examples")
 
-        # If the shrinking phase takes more than five minutes, abort it early and print
-        # a warning.   Many CI systems will kill a build after around ten minutes with
-        # no output, and appearing to hang isn't great for interactive use either -
-        # showing partially-shrunk examples is better than quitting with no examples!
-        self.finish_shrinking_deadline = time.perf_counter() + 300
+        # If the shrinking phase takes longer than the shrink time budget (five
+        # minutes by default), abort it early and print a warning.   Many CI systems
+        # will kill a build after around ten minutes with no output, and appearing to
+        # hang isn't great for interactive use either - showing partially-shrunk
+        # examples is better than quitting with no examples!
+        self.shrinking_started_at = time.perf_counter()
+        self.calls_at_shrinking_start = self.call_count
+        budget = self.settings.shrink_time_budget
+        if budget is not None:
+            self.finish_shrinking_deadline = (
+                self.shrinking_started_at + budget.total_seconds()
+            )
 
         for prev_data in sorted(
             self.interesting_examples.values(), key=lambda d: sort_key(d.buffer)
@@ -958,7 +1357,9 @@ class ConjectureRunner:
             if not self.settings.report_multiple_bugs:
                 # If multi-bug reporting is disabled, we shrink our currently-minimal
                 # failure, allowing 'slips' to any bug with a smaller minimal example.
-                self.shrink(example, lambda d: d.status == Status.INTERESTING)
+                self.shrink_resumably(
+                    example, lambda d: d.status == Status.INTERESTING
+                )
                 return
 
             def predicate(d):
@@ -966,7 +1367,7 @@ class ConjectureRunner:
                     return False
                 return d.interesting_origin == target
 
-            self.shrink(example, predicate)
+            self.shrink_resumably(example, predicate)
 
             self.shrunk_examples.add(target)
 
@@ -982,25 +1383,85 @@ class ConjectureRunner:
             corpus = sorted(
                 self.settings.database.fetch(self.secondary_key), key=sort_key
             )
-            for c in corpus:
-                primary = {v.buffer for v in self.interesting_examples.values()}
+            tried = []
+            try:
+                for c in corpus:
+                    primary = {v.buffer for v in self.interesting_examples.values()}
 
-                cap = max(map(sort_key, primary))
+                    cap = max(map(sort_key, primary))
 
-                if sort_key(c) > cap:
-                    break
-                else:
-                    self.cached_test_function(c)
-                    # We unconditionally remove c from the secondary key as it
-                    # is either now primary or worse than our primary example
-                    # of this reason for interestingness.
-                    self.settings.database.delete(self.secondary_key, c)
+                    if sort_key(c) > cap:
+                        break
+                    else:
+                        self.cached_test_function(c)
+                        tried.append(c)
+            finally:
+                # We unconditionally remove every tried example from the
+                # secondary key as it is either now primary or worse than our
+                # primary example of this reason for interestingness.
+                if tried:
+                    self.settings.database.delete_many(
+                        [(self.secondary_key, c) for c in tried]
+                    )
+
+    def report_shrink_progress(self, before, after):
+        """Called whenever the shrink phase replaces a failing example with a
+        smaller one, with the sizes in bytes of the old and new examples.
+
+        This reports the progress made so far if verbosity is verbose or
+        higher, but may be overridden to track progress in other ways."""
+        if self.settings.verbosity >= Verbosity.verbose:
+            calls = self.call_count - self.calls_at_shrinking_start
+            elapsed = time.perf_counter() - self.shrinking_started_at
+            report(
+                f"Shrunk example from {before} to {after} bytes after {calls} "
+                f"call{'s' if calls != 1 else ''} and {elapsed:.2f} seconds."
+            )
 
     def shrink(self, example, predicate=None, allow_transition=None):
         s = self.new_shrinker(example, predicate, allow_transition)
         s.shrink()
         return s.shrink_target
 
+    def shrink_resumably(self, example, predicate):
+        """Shrink ``example`` as ``shrink`` does, but if this is stopped early
+        store a checkpoint of the shrinker in the database, so that the next
+        run can carry on from where this one stopped instead of repeating the
+        work it has already done.
+
+        Checkpoints are only read back in the reuse phase, so we do not store
+        them unless that is enabled."""
+        s = self.new_shrinker(example, predicate)
+        resumed = None
+        for checkpoint in self.__stored_checkpoints:
+            if s.resume(checkpoint):
+                resumed = checkpoint
+                break
+        stopped = False
+        try:
+            s.shrink()
+        except RunIsComplete:
+            # We only checkpoint if the run was stopped early, e.g. because we
+            # ran out of time. Any other error may have left the shrinker in a
+            # state we don't want to resume from.
+            stopped = True
+            raise
+        finally:
+            self.record_pass_statistics(s)
+            if self.settings.database is not None and self.database_key is not None:
+                if resumed is not None:
+                    self.settings.database.delete(self.shrink_checkpoint_key, resumed)
+                    self.__stored_checkpoints.remove(resumed)
+                if stopped and Phase.reuse in self.settings.phases:
+                    # We may have been stopped by the call that found a better
+                    # example, before the shrinker saw it, so catch up first.
+                    for v in self.interesting_examples.values():
+                        s.incorporate_test_data(v)
+                    checkpoint = s.checkpoint()
+                    self.settings.database.save(self.shrink_checkpoint_key, checkpoint)
+                    self.__stored_checkpoints.append(checkpoint)
+        return s.shrink_target
+
     def new_shrinker(self, example, predicate=None, allow_transition=None):
         return Shrinker(self, example, predicate, allow_transition)
 
@@ -1028,12 +1489,11 @@ class ConjectureRunner:
             )
             return result
 
-        try:
-            cached = check_result(self.__data_cache[buffer])
+        cached = self.__data_cache.find(buffer)
+        if cached is not None:
+            check_result(cached)
             if cached.status > Status.OVERRUN or extend == 0:
                 return cached
-        except KeyError:
-            pass
 
         if error_on_discard:
 
@@ -1056,10 +1516,9 @@ class ConjectureRunner:
         else:
             if dummy_data.status > Status.OVERRUN:
                 dummy_data.freeze()
-                try:
-                    return self.__data_cache[dummy_data.buffer]
-                except KeyError:
-                    pass
+                cached = self.__data_cache.find(dummy_data.buffer)
+                if cached is not None:
+                    return cached
             else:
                 self.__data_cache[buffer] = Overrun
                 return Overrun
@@ -1075,8 +1534,13 @@ class ConjectureRunner:
         )
         self.test_function(data)
         result = check_result(data.as_result())
-        if extend == 0 or (result is not Overrun and len(result.buffer) <= len(buffer)):
-            self.__data_cache[buffer] = result
+        if result is Overrun:
+            if extend == 0:
+                self.__data_cache[buffer] = result
+        elif len(result.buffer) <= len(buffer):
+            # The test function only read this much of the buffer, so any
+            # buffer starting with the same bytes has the same result.
+            self.__data_cache[buffer[: len(result.buffer)]] = result
         return result
 
     def event_to_string(self, event):
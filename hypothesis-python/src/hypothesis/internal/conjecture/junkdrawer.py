@@ -116,9 +116,12 @@ class IntList:
         return self.__underlying != other.__underlying
 
     def append(self, n):
-        i = len(self)
-        self.__underlying.append(0)
-        self[i] = n
+        try:
+            self.__underlying.append(n)
+        except OverflowError:
+            assert n > 0
+            self.__underlying.append(0)
+            self[len(self) - 1] = n
 
     def __setitem__(self, i, n):
         while True:
@@ -0,0 +1,169 @@
+# This file is part of Hypothesis, which may be found at
+# https://github.com/HypothesisWorks/hypothesis/
+#
+# Most of this work is copyright (C) 2013-2021 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by others. See
+# CONTRIBUTING.rst for a full list of people who may hold copyright, and
+# consult the git log if you need to determine who owns an individual
+# contribution.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+#
+# END HEADER
+
+"""Support for running generated test cases in a pool of forked worker
+processes, as used by ``ConjectureRunner`` when ``settings.workers > 1``.
+
+Workers never touch the engine's state. Each one runs a test case from a
+prefix and a seed, records every call made to its observer, and sends back
+a small ``WorkerResult``. The engine then replays those calls into its own
+``DataTree``, so that the tree ends up exactly as if the test case had been
+run in the main process.
+"""
+
+import math
+import multiprocessing
+import pickle
+from contextlib import contextmanager
+from random import Random
+
+import attr
+
+from hypothesis.internal.conjecture.data import ConjectureData, DataObserver, Status
+
+# The test function that worker processes should run. This is only ever set
+# in the workers, by the pool's initializer, and as they are forked they
+# inherit it rather than it having to be pickled.
+_worker_test_function = None
+
+# Marker in a ``WorkerResult.observations`` list for a ``kill_branch`` call.
+KILL_BRANCH = None
+
+
+def can_use_workers():
+    """Worker processes need to inherit the test function from the parent,
+    so we only support platforms which can fork."""
+    return "fork" in multiprocessing.get_all_start_methods()
+
+
+def _init_worker(test_function):
+    global _worker_test_function
+    _worker_test_function = test_function
+
+
+class WorkerInterrupt(Exception):
+    """Carries an exception which is not an ``Exception``, such as
+    ``KeyboardInterrupt``, from a worker back to the main process. The pool
+    only passes ``Exception`` subclasses back, and any other exception would
+    kill the worker and lose its task."""
+
+
+class RecordingObserver(DataObserver):
+    """Records the calls that would be made to a ``TreeRecordingObserver``
+    so that they can be replayed into the tree in another process."""
+
+    def __init__(self):
+        self.observations = []
+
+    def draw_bits(self, n_bits, forced, value):
+        self.observations.append((n_bits, forced, value))
+
+    def kill_branch(self):
+        self.observations.append(KILL_BRANCH)
+
+
+@attr.s(slots=True)
+class WorkerResult:
+    """The parts of a ``ConjectureData`` from a worker process that the
+    engine needs to account for a test case it did not run itself."""
+
+    status = attr.ib()
+    interesting_origin = attr.ib()
+    buffer = attr.ib()
+    observations = attr.ib()
+    has_target_observations = attr.ib()
+    runtime = attr.ib()
+    drawtime = attr.ib()
+    events = attr.ib()
+    # The ``ConjectureResult`` of the test case, or None if it overran.
+    result = attr.ib()
+
+    def replay(self, observer):
+        """Replay the recorded observations into ``observer``."""
+        for call in self.observations:
+            if call is KILL_BRANCH:
+                observer.kill_branch()
+            else:
+                observer.draw_bits(*call)
+        observer.conclude_test(self.status, self.interesting_origin)
+
+
+def run_in_worker(prefix, max_length, seed):
+    """Run the inherited test function on a new ``ConjectureData``, and
+    return a ``WorkerResult`` or ``None`` if the test function raised an
+    exception which should be handled in the main process instead.
+
+    Exceptions which are not ``Exception`` subclasses, such as
+    ``KeyboardInterrupt``, are passed back to the main process in a
+    ``WorkerInterrupt`` and re-raised there by ``run_in_workers``."""
+    observer = RecordingObserver()
+    data = ConjectureData(
+        prefix=prefix, max_length=max_length, random=Random(seed), observer=observer
+    )
+    try:
+        _worker_test_function(data)
+        data.freeze()
+    except Exception:
+        return None
+    except BaseException as e:
+        raise WorkerInterrupt(e) from None
+    result = None if data.status == Status.OVERRUN else data.as_result()
+    try:
+        # Interesting origins normally contain an exception type, and tags may
+        # contain other objects, which can't be sent back to the parent if they
+        # are not importable.
+        pickle.dumps(result)
+    except Exception:
+        return None
+    return WorkerResult(
+        status=data.status,
+        interesting_origin=data.interesting_origin,
+        buffer=data.buffer,
+        observations=observer.observations,
+        has_target_observations=bool(data.target_observations),
+        runtime=data.finish_time - data.start_time,
+        drawtime=math.fsum(data.draw_times),
+        events=sorted({str(e) for e in data.events}),
+        result=result,
+    )
+
+
+def run_in_workers(pool, tasks):
+    """Return the result of ``run_in_worker(*task)`` for each of ``tasks``,
+    run in ``pool``."""
+    try:
+        return pool.starmap(run_in_worker, tasks)
+    except WorkerInterrupt as e:
+        raise e.args[0] from None
+
+
+@contextmanager
+def worker_pool(test_function, workers):
+    """Yield a pool of ``workers`` forked processes which run
+    ``test_function``, or ``None`` if we should run in a single process."""
+    if workers <= 1 or not can_use_workers():
+        yield None
+        return
+    # Passing the test function to the initializer, rather than setting it in
+    # the parent, means that any worker the pool starts later to replace one
+    # which has exited also gets it.
+    pool = multiprocessing.get_context("fork").Pool(
+        workers, initializer=_init_worker, initargs=(test_function,)
+    )
+    try:
+        yield pool
+    finally:
+        pool.terminate()
+        pool.join()
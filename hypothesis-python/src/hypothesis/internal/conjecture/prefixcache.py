@@ -0,0 +1,171 @@
+# This file is part of Hypothesis, which may be found at
+# https://github.com/HypothesisWorks/hypothesis/
+#
+# Most of this work is copyright (C) 2013-2021 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by others. See
+# CONTRIBUTING.rst for a full list of people who may hold copyright, and
+# consult the git log if you need to determine who owns an individual
+# contribution.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+#
+# END HEADER
+
+from hypothesis.internal.cache import LRUReusedCache
+from hypothesis.internal.conjecture.data import Overrun
+
+
+class TrieNode:
+    """A node in the radix trie of keys of a ``PrefixCache``.
+
+    Each node is reached from its parent by the bytes in ``label``, and
+    ``key`` is the key that ends at this node, if any."""
+
+    __slots__ = ("label", "children", "key")
+
+    def __init__(self, label, key=None):
+        self.label = label
+        self.children = {}
+        self.key = key
+
+
+def common_prefix_length(label, buffer, start):
+    """Return the length of the longest common prefix of ``label`` and
+    ``buffer[start:]``."""
+    lo = 0
+    hi = min(len(label), len(buffer) - start)
+    # Invariant: buffer starts with label[:lo] at start, and not with
+    # label[:hi + 1] if hi < len(label).
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if buffer.startswith(label[:mid], start):
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+class PrefixCache(LRUReusedCache):
+    """A cache of the results of running the test function on buffers, with
+    the same eviction policy as ``LRUReusedCache``.
+
+    As the test function is deterministic, if running a buffer gave a result
+    other than ``Overrun`` then running any extension of that buffer gives the
+    same result.  As well as looking up a buffer exactly, ``find`` will
+    therefore find the result for any buffer which extends a key in the
+    cache.  This lets us avoid running many candidates while shrinking, which
+    often share long prefixes with buffers we have already run.
+
+    To answer this in time proportional to the length of the buffer, we index
+    the keys in a radix trie, which stores each prefix that keys have in
+    common only once.
+    """
+
+    __slots__ = ("root", "hits", "prefix_hits", "misses", "nodes", "stored_bytes")
+
+    def __init__(self, max_size):
+        super().__init__(max_size)
+        self.root = TrieNode(b"")
+
+        # Statistics on how well the cache is working: The number of calls
+        # to ``find`` that found a key equal to the buffer, that found a key
+        # that the buffer extends, and that found nothing.
+        self.hits = 0
+        self.prefix_hits = 0
+        self.misses = 0
+
+        # The size of the trie, in nodes and total bytes of their labels.
+        self.nodes = 1
+        self.stored_bytes = 0
+
+    def find(self, buffer):
+        """Return the value for ``buffer`` if it is a key, or else the value
+        for a key which ``buffer`` extends and which is not ``Overrun``, or
+        else None."""
+        buffer = bytes(buffer)
+        node = self.root
+        i = 0
+        while True:
+            if node.key is not None:
+                value = self[node.key]
+                if i == len(buffer):
+                    self.hits += 1
+                    return value
+                if value is not Overrun:
+                    self.prefix_hits += 1
+                    return value
+            if i == len(buffer):
+                break
+            child = node.children.get(buffer[i])
+            if child is None or not buffer.startswith(child.label, i):
+                break
+            i += len(child.label)
+            node = child
+        self.misses += 1
+        return None
+
+    def new_entry(self, key, value):
+        self.__insert(key)
+        return super().new_entry(key, value)
+
+    def on_evict(self, key, value, score):
+        self.__remove(key)
+
+    def clear(self):
+        super().clear()
+        self.root = TrieNode(b"")
+        self.nodes = 1
+        self.stored_bytes = 0
+
+    def __insert(self, key):
+        node = self.root
+        i = 0
+        while i < len(key):
+            child = node.children.get(key[i])
+            if child is None:
+                child = TrieNode(key[i:])
+                node.children[key[i]] = child
+                self.nodes += 1
+                self.stored_bytes += len(child.label)
+                node = child
+                break
+            n = common_prefix_length(child.label, key, i)
+            if n < len(child.label):
+                # Split the edge to the child where the key leaves it.
+                middle = TrieNode(child.label[:n])
+                child.label = child.label[n:]
+                middle.children[child.label[0]] = child
+                node.children[key[i]] = middle
+                self.nodes += 1
+                child = middle
+            node = child
+            i += n
+        node.key = key
+
+    def __remove(self, key):
+        path = [self.root]
+        i = 0
+        while i < len(key):
+            child = path[-1].children[key[i]]
+            i += len(child.label)
+            path.append(child)
+        node = path.pop()
+        assert node.key == key
+        node.key = None
+        # Remove the node if it is now a leaf, and then merge whichever node
+        # is left with its only child if it has no key of its own, so that
+        # every node other than the root has a key or several children.
+        if not node.children and path:
+            parent = path[-1]
+            del parent.children[node.label[0]]
+            self.nodes -= 1
+            self.stored_bytes -= len(node.label)
+            node = parent
+            path.pop()
+        if node.key is None and len(node.children) == 1 and path:
+            (child,) = node.children.values()
+            child.label = node.label + child.label
+            path[-1].children[child.label[0]] = child
+            self.nodes -= 1
@@ -13,6 +13,7 @@
 #
 # END HEADER
 
+import json
 from collections import defaultdict
 
 import attr
@@ -69,6 +70,32 @@ def sort_key(buffer):
 
 SHRINK_PASS_DEFINITIONS = {}  # type: Dict[str, ShrinkPassDefinition]
 
+# The first byte of the output of ``Shrinker.checkpoint``, so that we can
+# change the format later without misreading checkpoints from old versions.
+CHECKPOINT_VERSION = 0
+
+# If settings.shrink_time_budget is at most this many seconds, we run the
+# cheapest shrink passes before the others in ``Shrinker.greedy_shrink``.
+SHORT_SHRINK_TIME_BUDGET = 60
+
+
+def decode_checkpoint(checkpoint):
+    """Return the contents of a checkpoint from ``Shrinker.checkpoint`` as a
+    dict, or None if ``checkpoint`` is not a valid checkpoint."""
+    if not checkpoint or checkpoint[0] != CHECKPOINT_VERSION:
+        return None
+    try:
+        result = json.loads(checkpoint[1:].decode("utf-8"))
+        result["buffer"] = bytes.fromhex(result["buffer"])
+        result["order"] = [str(name) for name in result["order"]]
+        result["passes"] = {
+            str(name): (tuple(map(int, prefix)), bool(exhausted))
+            for name, (prefix, exhausted) in result["passes"].items()
+        }
+    except (ValueError, TypeError, KeyError, AttributeError):
+        return None
+    return result
+
 
 @attr.s()
 class ShrinkPassDefinition:
@@ -300,6 +327,25 @@ class Shrinker:
         self.passes_by_name = {}
         self.passes = []
 
+        # The passes being run by ``fixate_shrink_passes``, starting from the
+        # one currently running, so that a checkpoint can record them.
+        self.pass_order = []
+
+        # State restored by ``resume`` from a checkpoint of an earlier
+        # shrinker, which is applied to each pass when it is created.
+        self.__resumed_buffer = None
+        self.__resumed_order = None
+        self.__resumed_passes = {}
+
+        # When the engine has worker processes, batches of candidates are run
+        # speculatively in them (see ``incorporate_new_buffers``). We track
+        # how many calls that took, and how many of them turned out to be
+        # unnecessary - because an earlier candidate in the batch succeeded,
+        # or because we had to run the candidate again locally anyway - to
+        # help tune the batch size.
+        self.speculative_calls = 0
+        self.speculative_wasted = 0
+
         # Extra DFAs that may be installed. This is used solely for
         # testing and learning purposes.
         self.extra_dfas = {}
@@ -330,6 +376,15 @@ class Shrinker:
         )
         self.passes.append(p)
         self.passes_by_name[p.name] = p
+        p.prior_calls, p.prior_progress = self.engine.pass_statistics.get(
+            p.name, (0, 0)
+        )
+        if p.name in self.__resumed_passes:
+            p.last_prefix, exhausted = self.__resumed_passes.pop(p.name)
+            # The choice tree only describes the current shrink target, so
+            # we can only carry over its exhaustion if that is unchanged.
+            if exhausted and self.buffer == self.__resumed_buffer:
+                self.shrink_pass_choice_trees[p].mark_exhausted()
         return p
 
     def shrink_pass(self, name):
@@ -340,6 +395,39 @@ class Shrinker:
             self.add_new_pass(name)
         return self.passes_by_name[name]
 
+    def checkpoint(self):
+        """Return a serialized record of the progress of this shrinker, which
+        a later shrinker starting from the current shrink target can
+        ``resume`` from to avoid repeating work.
+
+        This records the current shrink target, the order in which
+        ``fixate_shrink_passes`` is running the passes, and for each pass
+        where its last step left off and whether it has nothing left to try
+        on the current shrink target.
+        """
+        trees = self.shrink_pass_choice_trees
+        state = {
+            "buffer": self.buffer.hex(),
+            "order": [p.name for p in self.pass_order],
+            "passes": {
+                p.name: [list(p.last_prefix), p in trees and trees[p].exhausted]
+                for p in self.passes
+            },
+        }
+        return bytes([CHECKPOINT_VERSION]) + json.dumps(state).encode("utf-8")
+
+    def resume(self, checkpoint):
+        """Continue from a checkpoint made by ``checkpoint``, if it was made
+        by a shrinker whose shrink target is our current one, and return
+        whether we did so."""
+        state = decode_checkpoint(checkpoint)
+        if state is None or state["buffer"] != self.buffer:
+            return False
+        self.__resumed_buffer = state["buffer"]
+        self.__resumed_order = state["order"]
+        self.__resumed_passes = state["passes"]
+        return True
+
     @derived_value
     def match_cache(self):
         return {}
@@ -392,6 +480,41 @@ class Shrinker:
         self.cached_test_function(buffer)
         return previous is not self.shrink_target
 
+    def incorporate_new_buffers(self, buffers):
+        """Try each of ``buffers`` as a replacement for the shrink target, and
+        shrink to the best of them (by ``sort_key``) that works. Returns True
+        if that changed the shrink_target.
+
+        Candidates are tried in order of ``sort_key`` and we stop at the first
+        success, so the result is the same as calling ``incorporate_new_buffer``
+        on each in turn. When the engine has worker processes we first run
+        batches of candidates speculatively in them, so that we only have to
+        run locally the ones that might succeed."""
+        candidates = sorted(
+            {bytes(b[: self.shrink_target.index]) for b in buffers}, key=sort_key
+        )
+        candidates = [
+            b
+            for b in candidates
+            if sort_key(b) < sort_key(self.buffer) and not self.buffer.startswith(b)
+        ]
+        batch_size = self.engine.settings.workers
+        for start in range(0, len(candidates), batch_size):
+            batch = candidates[start : start + batch_size]
+            statuses = self.engine.run_speculatively(batch) if len(batch) > 1 else {}
+            self.speculative_calls += len(statuses)
+            for i, buffer in enumerate(batch):
+                if statuses.get(i, Status.VALID) < Status.VALID:
+                    continue
+                calls = self.engine.call_count
+                succeeded = self.incorporate_new_buffer(buffer)
+                if i in statuses and self.engine.call_count > calls:
+                    self.speculative_wasted += 1
+                if succeeded:
+                    self.speculative_wasted += sum(j > i for j in statuses)
+                    return True
+        return False
+
     def incorporate_test_data(self, data):
         """Takes a ConjectureData or Overrun object updates the current
         shrink_target if this data represents an improvement over it."""
@@ -474,6 +597,16 @@ class Shrinker:
                         self.initial_size,
                     )
                 )
+                if self.speculative_calls:
+                    self.debug(
+                        "Made %d speculative call%s in worker processes, "
+                        "of which %d were wasted."
+                        % (
+                            self.speculative_calls,
+                            s(self.speculative_calls),
+                            self.speculative_wasted,
+                        )
+                    )
                 for useful in [True, False]:
                     self.debug("")
                     if useful:
@@ -512,6 +645,15 @@ class Shrinker:
         This method iterates to a fixed point and so is idempontent - calling
         it twice will have exactly the same effect as calling it once.
         """
+        budget = self.engine.settings.shrink_time_budget
+        if budget is not None and budget.total_seconds() <= SHORT_SHRINK_TIME_BUDGET:
+            # If we don't have long, we first run the passes which are cheap
+            # and usually make the most progress to a fixed point, so that we
+            # have as small an example as possible if we run out of time.
+            self.fixate_shrink_passes(
+                [block_program("X" * i) for i in range(5, 0, -1)]
+                + ["pass_to_descendant", "minimize_individual_blocks"]
+            )
         self.fixate_shrink_passes(
             [
                 block_program("X" * 5),
@@ -541,12 +683,22 @@ class Shrinker:
         is a fixed point of all of them."""
         passes = list(map(self.shrink_pass, passes))
 
+        # Start with the passes that have been most productive when shrinking
+        # earlier examples, if any. This is a stable sort, so passes without
+        # statistics stay in the order we were given them.
+        passes.sort(key=lambda sp: -sp.yield_per_call)
+
+        if self.__resumed_order:
+            # Pick up where the checkpointed shrinker left off: with the pass
+            # it was running, followed by the rest in the order it had.
+            rank = {name: i for i, name in enumerate(self.__resumed_order)}
+            passes.sort(key=lambda p: rank.get(p.name, len(rank)))
+            self.__resumed_order = None
+
         any_ran = True
         while any_ran:
             any_ran = False
 
-            reordering = {}
-
             # We run remove_discarded after every pass to do cleanup
             # keeping track of whether that actually works. Either there is
             # no discarded data and it is basically free, or it reliably works
@@ -562,17 +714,31 @@ class Shrinker:
             # out self.max_stall by as we go along.
             max_calls_per_failing_step = 1
 
-            for sp in passes:
+            for i, sp in enumerate(passes):
+                self.pass_order = passes[i:] + passes[:i]
                 if can_discard:
                     can_discard = self.remove_discarded()
 
-                before_sp = self.shrink_target
-
                 # Run the shrink pass until it fails to make any progress
                 # max_failures times in a row. This implicitly boosts shrink
-                # passes that are more likely to work.
+                # passes that are more likely to work, as every success resets
+                # the count, and we also allow the passes which have made the
+                # most progress per call so far one more failure (20) than
+                # less productive ones (19).
+                #
+                # This is deliberately a very narrow range rather than a budget
+                # in proportion to each pass's yield, and the ordering of the
+                # passes does most of the work of favouring productive ones. A
+                # pass which has stopped working is usually at a fixed point
+                # for now, however well it did before, so a larger budget
+                # mostly wastes calls, while a smaller one stops passes such
+                # as pass_to_descendant, which tries one candidate per step,
+                # before they reach the rarer successes that matter for shrink
+                # quality. Wider ranges, down to 16 or 18 failures, made some
+                # of our tests of shrink quality fail.
                 failures = 0
-                max_failures = 20
+                best_yield = max(p.yield_per_call for p in passes)
+                max_failures = max(19, round(20 * sp.yield_per_call / best_yield))
                 while failures < max_failures:
                     # We don't allow more than max_stall consecutive failures
                     # to shrink, but this means that if we're unlucky and the
@@ -619,18 +785,9 @@ class Shrinker:
                             )
                             failures += 1
 
-                # We reorder the shrink passes so that on our next run through
-                # we try good ones first. The rule is that shrink passes that
-                # did nothing useful are the worst, shrink passes that reduced
-                # the length are the best.
-                if self.shrink_target is before_sp:
-                    reordering[sp] = 1
-                elif len(self.buffer) < len(before_sp.buffer):
-                    reordering[sp] = -1
-                else:
-                    reordering[sp] = 0
-
-            passes.sort(key=reordering.__getitem__)
+            # We reorder the shrink passes so that on our next run through we
+            # try the ones that have made the most progress per call first.
+            passes.sort(key=lambda sp: -sp.yield_per_call)
 
     @property
     def buffer(self):
@@ -650,12 +807,13 @@ class Shrinker:
     @derived_value
     def examples_by_label(self):
         """An index of all examples grouped by their label, with
-        the examples stored in their normal index order."""
-
-        examples_by_label = defaultdict(list)
-        for ex in self.examples:
-            examples_by_label[ex.label].append(ex)
-        return dict(examples_by_label)
+        the indices of the examples stored in increasing order."""
+        examples = self.examples
+        return {
+            examples.labels[l]: indices
+            for l, indices in enumerate(examples.examples_by_label_index)
+            if indices
+        }
 
     @derived_value
     def distinct_labels(self):
@@ -686,12 +844,14 @@ class Shrinker:
         )
 
         ls = self.examples_by_label[label]
+        starts = self.examples.starts
+        ends = self.examples.ends
 
         i = chooser.choose(range(len(ls) - 1))
 
         ancestor = ls[i]
 
-        if i + 1 == len(ls) or ls[i + 1].start >= ancestor.end:
+        if i + 1 == len(ls) or starts[ls[i + 1]] >= ends[ancestor]:
             return
 
         @self.cached(label, i)
@@ -700,22 +860,42 @@ class Shrinker:
             hi = len(ls)
             while lo + 1 < hi:
                 mid = (lo + hi) // 2
-                if ls[mid].start >= ancestor.end:
+                if starts[ls[mid]] >= ends[ancestor]:
                     hi = mid
                 else:
                     lo = mid
-            return [t for t in ls[i + 1 : hi] if t.length < ancestor.length]
+            length = ends[ancestor] - starts[ancestor]
+            return [
+                (starts[t], ends[t])
+                for t in ls[i + 1 : hi]
+                if ends[t] - starts[t] < length
+            ]
 
-        descendant = chooser.choose(descendants, lambda ex: ex.length > 0)
+        if self.engine.settings.workers == 1:
+            u, v = chooser.choose(descendants, lambda t: t[1] > t[0])
 
-        assert ancestor.start <= descendant.start
-        assert ancestor.end >= descendant.end
-        assert descendant.length < ancestor.length
+            assert starts[ancestor] <= u
+            assert ends[ancestor] >= v
+            assert v - u < ends[ancestor] - starts[ancestor]
 
-        self.incorporate_new_buffer(
-            self.buffer[: ancestor.start]
-            + self.buffer[descendant.start : descendant.end]
-            + self.buffer[ancestor.end :]
+            self.incorporate_new_buffer(
+                self.buffer[: starts[ancestor]]
+                + self.buffer[u:v]
+                + self.buffer[ends[ancestor] :]
+            )
+            return
+
+        # With worker processes, each descendant is an independent candidate
+        # replacement for the ancestor, so we try them as a single batch and
+        # keep the best.
+        self.incorporate_new_buffers(
+            [
+                self.buffer[: starts[ancestor]]
+                + self.buffer[u:v]
+                + self.buffer[ends[ancestor] :]
+                for u, v in descendants
+                if v > u
+            ]
         )
 
     def lower_common_block_offset(self):
@@ -960,12 +1140,14 @@ class Shrinker:
                 (in_original[0].start, in_original[-len(in_replaced)].start)
             )
 
+        attempts = []
         for u, v in sorted(regions_to_delete, key=lambda x: x[1] - x[0], reverse=True):
             try_with_deleted = bytearray(initial_attempt)
             del try_with_deleted[u:v]
-            if self.incorporate_new_buffer(try_with_deleted):
-                return True
-        return False
+            attempts.append(try_with_deleted)
+        if self.engine.settings.workers == 1:
+            return any(self.incorporate_new_buffer(b) for b in attempts)
+        return self.incorporate_new_buffers(attempts)
 
     def remove_discarded(self):
         """Try removing all bytes marked as discarded.
@@ -1228,18 +1410,9 @@ class Shrinker:
         # never have got here.
         assert attempt is not self.shrink_target
 
-        @self.cached(block.index)
-        def first_example_after_block():
-            lo = 0
-            hi = len(self.examples)
-            while lo + 1 < hi:
-                mid = (lo + hi) // 2
-                ex = self.examples[mid]
-                if ex.start >= block.end:
-                    hi = mid
-                else:
-                    lo = mid
-            return hi
+        # Examples are numbered in the order that they start, so the first
+        # example after the block is the one after the example for its draw.
+        first_example_after_block = self.examples.block_examples[block.index] + 1
 
         ex = self.examples[
             chooser.choose(
@@ -1438,6 +1611,21 @@ class ShrinkPass:
     shrinks = attr.ib(default=0)
     deletions = attr.ib(default=0)
 
+    # The calls made and progress (shrinks plus bytes deleted) by this pass
+    # in earlier shrinks of the same test, from ``engine.pass_statistics``.
+    prior_calls = attr.ib(default=0)
+    prior_progress = attr.ib(default=0)
+
+    @property
+    def yield_per_call(self):
+        """An estimate of how much progress each call made by this pass
+        makes, from the shrinks and bytes deleted per call so far in this and
+        earlier shrinks."""
+        return pass_yield(
+            self.calls + self.prior_calls,
+            self.shrinks + self.deletions + self.prior_progress,
+        )
+
     def step(self, random_order=False):
         tree = self.shrinker.shrink_pass_choice_trees[self]
         if tree.exhausted:
@@ -1470,6 +1658,14 @@ class ShrinkPass:
         return self.run_with_chooser.__name__
 
 
+def pass_yield(calls, progress):
+    """Return an estimate of the progress per call of a shrink pass which has
+    made ``progress`` (shrinks plus bytes deleted) in ``calls`` calls. This is
+    optimistic about passes that have not been run much, so that every pass
+    gets a chance to prove itself."""
+    return (progress + 1) / (calls + 2)
+
+
 def non_zero_suffix(b):
     """Returns the longest suffix of b that starts with a non-zero
     byte."""
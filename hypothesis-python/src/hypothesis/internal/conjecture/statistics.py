@@ -0,0 +1,129 @@
+# This file is part of Hypothesis, which may be found at
+# https://github.com/HypothesisWorks/hypothesis/
+#
+# Most of this work is copyright (C) 2013-2021 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by others. See
+# CONTRIBUTING.rst for a full list of people who may hold copyright, and
+# consult the git log if you need to determine who owns an individual
+# contribution.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+#
+# END HEADER
+
+"""Fixed-size summaries of the test cases run by ``ConjectureRunner``.
+
+Keeping a record of every test case would use memory proportional to the
+number of test cases, which adds up for long runs, so we instead summarise
+them as we go.  The summaries are plain JSON-compatible data, as documented
+in :func:`hypothesis.statistics.describe_statistics`.
+"""
+
+import math
+from bisect import insort
+from collections import Counter
+
+# The relative width of each bucket in a RuntimeHistogram is about twice this.
+RELATIVE_ACCURACY = 0.001
+
+# The largest number of buckets a RuntimeHistogram may use.  With the
+# accuracy above, this covers about seven orders of magnitude before we
+# start merging the buckets for the fastest runtimes.
+MAX_BUCKETS = 8192
+
+GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+LOG_GAMMA = math.log(GAMMA)
+
+
+class RuntimeHistogram:
+    """A histogram of non-negative durations, with logarithmically sized
+    buckets so that it uses a bounded amount of memory however many are
+    added, but can still report any quantile accurately.
+
+    This is the same idea as the DDSketch quantile sketch, except that we
+    represent each bucket by the mean of the values in it rather than its
+    midpoint.  Every value is then still reported to within about twice
+    ``RELATIVE_ACCURACY``, and a run of identical values is reported exactly.
+    Zero durations, which happen when a test is faster than the timer
+    resolution, are counted separately.
+    """
+
+    def __init__(self):
+        self.buckets = Counter()
+        self.sums = Counter()
+        # The indices of the buckets in use, in increasing order.
+        self.indices = []
+        self.zeros = 0
+        self.count = 0
+
+    def add(self, value):
+        self.count += 1
+        if value <= 0:
+            self.zeros += 1
+            return
+        i = math.ceil(math.log(value) / LOG_GAMMA)
+        if i not in self.buckets:
+            insort(self.indices, i)
+        self.buckets[i] += 1
+        self.sums[i] += value
+        if len(self.indices) > MAX_BUCKETS:
+            # Merge the two lowest buckets, which loses accuracy only for
+            # the fastest runtimes and so never affects the slow ones that
+            # we actually report.
+            lowest = self.indices.pop(0)
+            second = self.indices[0]
+            self.buckets[second] += self.buckets.pop(lowest)
+            self.sums[second] += self.sums.pop(lowest)
+
+    def as_list(self):
+        """Return a sorted list of ``[value, count]`` pairs, where each value
+        is the mean of the values in its bucket."""
+        result = [[0.0, self.zeros]] if self.zeros else []
+        for i in self.indices:
+            result.append([self.sums[i] / self.buckets[i], self.buckets[i]])
+        return result
+
+
+def value_at_rank(histogram, rank):
+    """Return the ``rank``'th smallest value, counting from zero, in a
+    histogram in the format returned by ``RuntimeHistogram.as_list``."""
+    assert rank >= 0
+    for value, count in histogram:
+        if rank < count:
+            return value
+        rank -= count
+    raise IndexError(rank)
+
+
+class PhaseStatistics:
+    """Summarises the test cases run during a single phase."""
+
+    def __init__(self):
+        self.count = 0
+        self.statuses = Counter()
+        self.runtimes = RuntimeHistogram()
+        self.drawtime_fraction_total = 0.0
+        self.events = Counter()
+
+    def record(self, status, runtime, drawtime, events):
+        """Record a single test case, where ``events`` is a collection of
+        the distinct events observed in it."""
+        self.count += 1
+        self.statuses[status] += 1
+        self.runtimes.add(runtime)
+        if runtime > 0:
+            self.drawtime_fraction_total += drawtime / runtime
+        self.events.update(events)
+
+    def as_dict(self):
+        return {
+            "num-test-cases": self.count,
+            "statuses": dict(self.statuses),
+            "runtimes": self.runtimes.as_list(),
+            "mean-drawtime-fraction": (
+                self.drawtime_fraction_total / self.count if self.count else 0.0
+            ),
+            "events": dict(self.events),
+        }
@@ -19,6 +19,7 @@ import heapq
 import math
 import sys
 from collections import OrderedDict, abc
+from functools import lru_cache
 
 from hypothesis.errors import InvalidArgument
 from hypothesis.internal.compat import (
@@ -92,9 +93,7 @@ def integer_range(data, lower, upper, center=None):
         # For large ranges, we combine the uniform random distribution from draw_bits
         # with the weighting scheme used by WideRangeIntStrategy with moderate chance.
         # Cutoff at 2 ** 24 so unicode choice is uniform but 32bit distribution is not.
-        idx = Sampler([4.0, 8.0, 1.0, 1.0, 0.5]).sample(data)
-        sizes = [8, 16, 32, 64, 128]
-        bits = min(bits, sizes[idx])
+        bits = min(bits, INT_SIZES[INT_SIZES_SAMPLER.sample(data)])
 
     while probe > gap:
         data.start_example(INTEGER_RANGE_DRAW_LABEL)
@@ -110,6 +109,41 @@ def integer_range(data, lower, upper, center=None):
     return int(result)
 
 
+def integer_range_drawer(lower, upper):
+    """Return a function ``draw`` such that ``draw(data)`` is equivalent to
+    ``integer_range(data, lower, upper)``, for drawing many integers from
+    the same range.
+
+    All of the setup that ``integer_range`` would repeat on every call is
+    done just once, so strategies with fixed bounds can build their drawer
+    when they are constructed."""
+    assert lower <= upper
+    if lower == upper:
+
+        def draw_trivial(data):
+            data.draw_bits(1, forced=0)
+            return int(lower)
+
+        return draw_trivial
+
+    lower = int(lower)
+    gap = upper - lower
+    bits = bit_length(gap)
+
+    def draw(data):
+        n_bits = bits
+        if n_bits > 24 and data.draw_bits(3):
+            n_bits = min(n_bits, INT_SIZES[INT_SIZES_SAMPLER.sample(data)])
+        probe = gap + 1
+        while probe > gap:
+            data.start_example(INTEGER_RANGE_DRAW_LABEL)
+            probe = data.draw_bits(n_bits)
+            data.stop_example(discard=probe > gap)
+        return lower + probe
+
+    return draw
+
+
 def check_sample(values, strategy_name):
     if "numpy" in sys.modules and isinstance(values, sys.modules["numpy"].ndarray):
         if values.ndim != 1:
@@ -357,10 +391,11 @@ class Sampler:
                 entry[0], entry[1] = entry[1], entry[0]
                 entry[2] = one - entry[2]
         self.table.sort()
+        self.__draw_index = integer_range_drawer(0, n - 1)
 
     def sample(self, data):
         data.start_example(SAMPLE_IN_SAMPLER_LABLE)
-        i = integer_range(data, 0, len(self.table) - 1)
+        i = self.__draw_index(data)
         base, alternate, alternate_chance = self.table[i]
         use_alternate = biased_coin(data, alternate_chance)
         data.stop_example()
@@ -370,6 +405,19 @@ class Sampler:
             return base
 
 
+@lru_cache(maxsize=256)
+def sampler_for(weights):
+    """Return a Sampler for the tuple ``weights``, reusing the one we built
+    last time we were asked for the same weights."""
+    return Sampler(weights)
+
+
+# The bit sizes, and their weights, used when drawing integers from a large
+# or unbounded range.
+INT_SIZES = (8, 16, 32, 64, 128)
+INT_SIZES_SAMPLER = Sampler([4.0, 8.0, 1.0, 1.0, 0.5])
+
+
 class many:
     """Utility class for collections. Bundles up the logic we use for "should I
     keep drawing more values?" and handles starting and stopping examples in
@@ -0,0 +1,372 @@
+# This file is part of Hypothesis, which may be found at
+# https://github.com/HypothesisWorks/hypothesis/
+#
+# Most of this work is copyright (C) 2013-2021 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by others. See
+# CONTRIBUTING.rst for a full list of people who may hold copyright, and
+# consult the git log if you need to determine who owns an individual
+# contribution.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+#
+# END HEADER
+
+"""Tools for understanding predicates, so that we can satisfy them by
+construction instead of by rejection sampling.
+
+For example, ``integers().filter(lambda x: x >= 0)`` can only ever generate
+values that ``integers(min_value=0)`` would, and the latter never has to
+reject anything.  The functions here work out bounds which every value that
+satisfies a predicate must lie within, for strategies to narrow themselves
+with.  Strategies still check the predicate afterwards, so the bounds only
+have to be implied by the predicate rather than equivalent to it, and it is
+always safe to find no bounds at all.
+
+Bounds are represented as a dict with any of the keys ``min_value``,
+``max_value``, ``exclude_min`` and ``exclude_max``, in the same sense as the
+arguments to :func:`~hypothesis.strategies.floats`.
+"""
+
+import ast
+import inspect
+import math
+import operator
+from decimal import Decimal
+from fractions import Fraction
+from functools import partial
+
+from hypothesis.internal.reflection import extract_lambda_source
+
+# For each comparison, the bounds on ``x`` implied by ``x op c``.  We leave
+# out equality: narrowing to a single value would hide how rare it is, and
+# ``just()`` or ``sampled_from()`` are the right tools for that anyway.
+BOUNDS_RIGHT_OF = {
+    operator.lt: {"max_value": True},
+    operator.le: {"max_value": False},
+    operator.ge: {"min_value": False},
+    operator.gt: {"min_value": True},
+}
+# ... and implied by ``c op x``.
+BOUNDS_LEFT_OF = {
+    operator.lt: {"min_value": True},
+    operator.le: {"min_value": False},
+    operator.ge: {"max_value": False},
+    operator.gt: {"max_value": True},
+}
+
+AST_OPERATORS = {
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.GtE: operator.ge,
+    ast.Gt: operator.gt,
+}
+
+# Predicates which are false for the empty string or collection, and so
+# imply a minimum length of one.  Note that e.g. str.isascii and
+# str.isprintable are true for the empty string.
+NONEMPTY_PREDICATES = frozenset(
+    [
+        bool,
+        len,
+        operator.truth,
+        str.isalnum,
+        str.isalpha,
+        str.isdecimal,
+        str.isdigit,
+        str.isidentifier,
+        str.islower,
+        str.isnumeric,
+        str.isspace,
+        str.istitle,
+        str.isupper,
+    ]
+)
+
+
+def _comparison_bounds(op, value, value_on_right):
+    """Return the bounds on ``x`` implied by ``x op value`` if
+    ``value_on_right``, or else by ``value op x``."""
+    if isinstance(value, bool) or not isinstance(
+        value, (int, float, Fraction, Decimal)
+    ):
+        return {}
+    if value != value:
+        # Every comparison with NaN is false, but this is rare enough that
+        # we don't try to exploit it.
+        return {}
+    table = BOUNDS_RIGHT_OF if value_on_right else BOUNDS_LEFT_OF
+    try:
+        implied = table.get(op, {})
+    except TypeError:  # unhashable op
+        return {}
+    result = {}
+    for key, exclude in implied.items():
+        result[key] = value
+        result["exclude_min" if key == "min_value" else "exclude_max"] = exclude
+    return result
+
+
+def merge_bounds(x, y):
+    """Return the bounds implied by satisfying both ``x`` and ``y``."""
+    result = dict(x)
+    for key, exclude_key, tighter in [
+        ("min_value", "exclude_min", operator.gt),
+        ("max_value", "exclude_max", operator.lt),
+    ]:
+        if key not in y:
+            continue
+        if (
+            key not in result
+            or tighter(y[key], result[key])
+            or (y[key] == result[key] and y[exclude_key])
+        ):
+            result[key] = y[key]
+            result[exclude_key] = y[exclude_key]
+    return result
+
+
+class _BoundsVisitor:
+    """Works out the bounds on ``subject`` implied by the truth of a lambda
+    body, where ``subject`` is a function from the lambda's argument name to
+    whether an AST node is the expression we want to bound."""
+
+    def __init__(self, is_subject):
+        self.is_subject = is_subject
+
+    def bounds(self, node):
+        if isinstance(node, ast.BoolOp) and isinstance(node.op, ast.And):
+            result = {}
+            for value in node.values:
+                result = merge_bounds(result, self.bounds(value))
+            return result
+        if isinstance(node, ast.Compare):
+            result = {}
+            left = node.left
+            for op, right in zip(node.ops, node.comparators):
+                op = AST_OPERATORS.get(type(op))
+                if op is not None:
+                    if self.is_subject(left):
+                        bound = _comparison_bounds(op, _constant(right), True)
+                    elif self.is_subject(right):
+                        bound = _comparison_bounds(op, _constant(left), False)
+                    else:
+                        bound = {}
+                    result = merge_bounds(result, bound)
+                left = right
+            return result
+        return {}
+
+
+_NOT_CONSTANT = object()
+
+
+def _constant(node):
+    if isinstance(node, ast.Constant):
+        return node.value
+    if (
+        isinstance(node, ast.UnaryOp)
+        and isinstance(node.op, (ast.USub, ast.UAdd))
+        and isinstance(node.operand, ast.Constant)
+        and isinstance(node.operand.value, (int, float))
+    ):
+        value = node.operand.value
+        return -value if isinstance(node.op, ast.USub) else value
+    return _NOT_CONSTANT
+
+
+def _lambda_body(predicate):
+    """Return the AST of the body of ``predicate`` and the name of its
+    argument, if it is a lambda taking a single argument whose source we can
+    find, or else ``(None, None)``."""
+    if getattr(predicate, "__name__", None) != "<lambda>":
+        return None, None
+    code = predicate.__code__
+    if (
+        code.co_argcount != 1
+        or code.co_kwonlyargcount
+        or predicate.__defaults__
+        or code.co_flags & (inspect.CO_VARARGS | inspect.CO_VARKEYWORDS)
+    ):
+        return None, None
+    try:
+        tree = ast.parse(extract_lambda_source(predicate))
+    except SyntaxError:
+        return None, None
+    lambdas = [n for n in ast.walk(tree) if isinstance(n, ast.Lambda)]
+    if len(lambdas) != 1:
+        return None, None
+    node = lambdas[0]
+    # extract_lambda_source may get confused if there are several lambdas on
+    # the same line, so we check that the source we found compiles to the
+    # same bytecode as the predicate.
+    try:
+        compiled = compile(ast.Expression(node), "<lambda>", "eval")
+    except (SyntaxError, ValueError):
+        return None, None
+    inner = [c for c in compiled.co_consts if hasattr(c, "co_code")]
+    if (
+        len(inner) != 1
+        or inner[0].co_code != code.co_code
+        or inner[0].co_consts != code.co_consts
+        or inner[0].co_names != code.co_names
+    ):
+        return None, None
+    return node.body, node.args.args[0].arg
+
+
+def numeric_bounds(predicate):
+    """Return the bounds implied for ``x`` by ``predicate(x)`` being true.
+
+    We understand ``functools.partial`` applications of the comparison
+    functions in the ``operator`` module, and lambdas which compare their
+    argument to constants, possibly combined with ``and``:
+
+    >>> numeric_bounds(partial(operator.lt, 0))
+    {'min_value': 0, 'exclude_min': True}
+    >>> numeric_bounds(lambda x: 0 <= x < 10)
+    {'min_value': 0, 'exclude_min': False, 'max_value': 10, 'exclude_max': True}
+    """
+    if (
+        isinstance(predicate, partial)
+        and len(predicate.args) == 1
+        and not predicate.keywords
+    ):
+        # partial(op, c)(x) is op(c, x), so the constant is on the left.
+        return _comparison_bounds(predicate.func, predicate.args[0], False)
+    body, arg = _lambda_body(predicate)
+    if body is None:
+        return {}
+
+    def is_subject(node):
+        return isinstance(node, ast.Name) and node.id == arg
+
+    return _BoundsVisitor(is_subject).bounds(body)
+
+
+def integer_bounds(predicate):
+    """Return ``(lower, upper)``, inclusive integer bounds for any integer
+    which satisfies ``predicate``, where either may be None if unknown."""
+    return _integer_range(numeric_bounds(predicate))
+
+
+def length_bounds(predicate):
+    """Return ``(lower, upper)``, inclusive bounds on ``len(x)`` for any
+    collection ``x`` which satisfies ``predicate``, where either may be None
+    if unknown.
+
+    As well as lambdas comparing ``len(x)`` to constants, we understand
+    predicates that are false for empty collections, such as ``bool`` and
+    ``str.isidentifier``.
+    """
+    try:
+        if predicate in NONEMPTY_PREDICATES:
+            return 1, None
+    except TypeError:  # unhashable predicate
+        return None, None
+    body, arg = _lambda_body(predicate)
+    if body is None:
+        return None, None
+
+    def is_argument(node):
+        return isinstance(node, ast.Name) and node.id == arg
+
+    def is_length(node):
+        return (
+            isinstance(node, ast.Call)
+            and isinstance(node.func, ast.Name)
+            and node.func.id == "len"
+            and len(node.args) == 1
+            and not node.keywords
+            and is_argument(node.args[0])
+        )
+
+    # A bare ``x`` or ``len(x)`` is false for an empty collection.
+    if is_argument(body) or is_length(body):
+        return 1, None
+    lower, upper = _integer_range(_BoundsVisitor(is_length).bounds(body))
+    if lower is not None and lower <= 0:
+        lower = None
+    return lower, upper
+
+
+def _integer_range(bounds):
+    lower = upper = None
+    if "min_value" in bounds and _is_finite(bounds["min_value"]):
+        if bounds["exclude_min"]:
+            lower = math.floor(bounds["min_value"]) + 1
+        else:
+            lower = math.ceil(bounds["min_value"])
+    if "max_value" in bounds and _is_finite(bounds["max_value"]):
+        if bounds["exclude_max"]:
+            upper = math.ceil(bounds["max_value"]) - 1
+        else:
+            upper = math.floor(bounds["max_value"])
+    return lower, upper
+
+
+def _is_finite(value):
+    return not isinstance(value, (float, Decimal)) or math.isfinite(value)
+
+
+def narrow_integers_kwargs(kwargs, predicate):
+    """Return the arguments to :func:`~hypothesis.strategies.integers`
+    narrowed by ``predicate``, or None if we can't narrow them."""
+    lower, upper = integer_bounds(predicate)
+    result = dict(kwargs)
+    if lower is not None and (
+        kwargs.get("min_value") is None or lower > kwargs["min_value"]
+    ):
+        result["min_value"] = lower
+    if upper is not None and (
+        kwargs.get("max_value") is None or upper < kwargs["max_value"]
+    ):
+        result["max_value"] = upper
+    return result if result != kwargs else None
+
+
+def narrow_floats_kwargs(kwargs, predicate):
+    """Return the arguments to :func:`~hypothesis.strategies.floats`
+    narrowed by ``predicate``, or None if we can't narrow them."""
+    bounds = {
+        k: v
+        for k, v in numeric_bounds(predicate).items()
+        if not isinstance(v, (Fraction, Decimal))
+    }
+    if "min_value" not in bounds and "max_value" not in bounds:
+        return None
+    current = {}
+    for key, exclude_key in [
+        ("min_value", "exclude_min"),
+        ("max_value", "exclude_max"),
+    ]:
+        if kwargs.get(key) is not None:
+            current[key] = kwargs[key]
+            current[exclude_key] = kwargs.get(exclude_key, False)
+    merged = merge_bounds(current, bounds)
+    if merged == current:
+        return None
+    result = dict(kwargs)
+    result.update(merged)
+    # We leave allow_nan alone: by default floats() with bounds excludes NaN,
+    # and if the user explicitly allowed it, the narrowed arguments are
+    # invalid and we fall back to filtering.  Bounds on both sides rule out
+    # infinities, which is what floats() checks for.
+    if "min_value" in merged and "max_value" in merged:
+        result.pop("allow_infinity", None)
+    return result
+
+
+def narrow_text_kwargs(kwargs, predicate):
+    """Return the arguments to :func:`~hypothesis.strategies.text` narrowed
+    by ``predicate``, or None if we can't narrow them."""
+    lower, upper = length_bounds(predicate)
+    result = dict(kwargs)
+    if lower is not None and lower > kwargs.get("min_size", 0):
+        result["min_size"] = lower
+    if upper is not None and (
+        kwargs.get("max_size") is None or upper < kwargs["max_size"]
+    ):
+        result["max_size"] = upper
+    return result if result != kwargs else None
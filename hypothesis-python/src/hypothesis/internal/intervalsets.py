@@ -13,11 +13,37 @@
 #
 # END HEADER
 
+from array import array
+from bisect import bisect_right
+from heapq import merge
+
 
 class IntervalSet:
+    """An immutable set of integers, represented as a sorted tuple of disjoint
+    and non-adjacent ``(start, end)`` intervals, each including both ends.
+
+    The starts, ends and cumulative sizes of the intervals are also stored in
+    arrays, so that finding the ``i``'th element, or the index of an element,
+    is a binary search rather than a scan over the intervals.  Sets compare
+    equal and hash by their intervals, so they can be used as cache keys.
+    """
+
+    @classmethod
+    def from_string(cls, s):
+        """Return the set of codepoints of the characters in ``s``."""
+        result = []
+        for c in sorted(map(ord, set(s))):
+            if result and c == result[-1][1] + 1:
+                result[-1] = (result[-1][0], c)
+            else:
+                result.append((c, c))
+        return cls(result)
+
     def __init__(self, intervals):
-        self.intervals = tuple(intervals)
-        self.offsets = [0]
+        self.intervals = tuple((u, v) for u, v in intervals)
+        self.starts = array("L", [u for u, _ in self.intervals])
+        self.ends = array("L", [v for _, v in self.intervals])
+        self.offsets = array("L", [0])
         for u, v in self.intervals:
             self.offsets.append(self.offsets[-1] + v - u + 1)
         self.size = self.offsets.pop()
@@ -35,42 +61,167 @@ class IntervalSet:
         if i < 0 or i >= self.size:
             raise IndexError(f"Invalid index {i} for [0, {self.size})")
         # Want j = maximal such that offsets[j] <= i
-
-        j = len(self.intervals) - 1
-        if self.offsets[j] > i:
-            hi = j
-            lo = 0
-            # Invariant: offsets[lo] <= i < offsets[hi]
-            while lo + 1 < hi:
-                mid = (lo + hi) // 2
-                if self.offsets[mid] <= i:
-                    lo = mid
-                else:
-                    hi = mid
-            j = lo
-        t = i - self.offsets[j]
-        u, v = self.intervals[j]
-        r = u + t
-        assert r <= v
+        j = bisect_right(self.offsets, i) - 1
+        r = self.starts[j] + (i - self.offsets[j])
+        assert r <= self.ends[j]
         return r
 
+    def __contains__(self, value):
+        j = bisect_right(self.starts, value) - 1
+        return j >= 0 and value <= self.ends[j]
+
+    def __eq__(self, other):
+        if not isinstance(other, IntervalSet):
+            return NotImplemented
+        return self.intervals == other.intervals
+
+    def __hash__(self):
+        return hash(self.intervals)
+
     def __repr__(self):
         return f"IntervalSet({self.intervals!r})"
 
     def index(self, value):
-        for offset, (u, v) in zip(self.offsets, self.intervals):
-            if u == value:
-                return offset
-            elif u > value:
-                raise ValueError(f"{value} is not in list")
-            if value <= v:
-                return offset + (value - u)
-        raise ValueError(f"{value} is not in list")
+        # Want j = maximal such that starts[j] <= value
+        j = bisect_right(self.starts, value) - 1
+        if j < 0 or value > self.ends[j]:
+            raise ValueError(f"{value} is not in list")
+        return self.offsets[j] + (value - self.starts[j])
 
     def index_above(self, value):
-        for offset, (u, v) in zip(self.offsets, self.intervals):
-            if u >= value:
-                return offset
-            if value <= v:
-                return offset + (value - u)
+        j = bisect_right(self.starts, value) - 1
+        if j >= 0 and value <= self.ends[j]:
+            return self.offsets[j] + (value - self.starts[j])
+        if j + 1 < len(self.intervals):
+            return self.offsets[j + 1]
         return self.size
+
+    def __or__(self, other):
+        return self.union(other)
+
+    def __and__(self, other):
+        return self.intersection(other)
+
+    def __sub__(self, other):
+        return self.difference(other)
+
+    def union(self, other):
+        """Merge two sets of intervals, joining any which overlap or are
+        adjacent.
+
+        >>> IntervalSet([(3, 10)]).union(IntervalSet([(1, 2), (5, 17)]))
+        IntervalSet(((1, 17),))
+        """
+        if not other.intervals:
+            return self
+        if not self.intervals:
+            return other
+        # Both sequences of intervals are sorted, so we can merge them in a
+        # single pass, joining each interval onto the last one in the result
+        # if they overlap or are adjacent.
+        result = []
+        for u, v in merge(self.intervals, other.intervals):
+            if result and u <= result[-1][1] + 1:
+                result[-1] = (result[-1][0], max(v, result[-1][1]))
+            else:
+                result.append((u, v))
+        return IntervalSet(result)
+
+    def intersection(self, other):
+        """Return the set of integers in both ``self`` and ``other``.
+
+        >>> IntervalSet([(1, 10)]).intersection(IntervalSet([(2, 3), (9, 15)]))
+        IntervalSet(((2, 3), (9, 10)))
+        """
+        x = self.intervals
+        y = other.intervals
+        i = 0
+        j = 0
+        result = []
+        while i < len(x) and j < len(y):
+            xl, xr = x[i]
+            yl, yr = y[j]
+            lo = max(xl, yl)
+            hi = min(xr, yr)
+            if lo <= hi:
+                result.append((lo, hi))
+            # Whichever interval ends first cannot overlap anything later in
+            # the other set, so we move past it.
+            if xr < yr:
+                i += 1
+            else:
+                j += 1
+        return IntervalSet(result)
+
+    def difference(self, other):
+        """Return the set of integers in ``self`` but not in ``other``.
+
+        >>> IntervalSet([(1, 10)]).difference(IntervalSet([(2, 3), (9, 15)]))
+        IntervalSet(((1, 1), (4, 8)))
+        """
+        if not other.intervals:
+            return self
+        x = list(map(list, self.intervals))
+        y = other.intervals
+        i = 0
+        j = 0
+        result = []
+        while i < len(x) and j < len(y):
+            # Iterate in parallel over x and y. j stays pointing at the smallest
+            # interval in the left hand side that could still overlap with some
+            # element of x at index >= i.
+            # Similarly, i is not incremented until we know that it does not
+            # overlap with any element of y at index >= j.
+
+            xl, xr = x[i]
+            assert xl <= xr
+            yl, yr = y[j]
+            assert yl <= yr
+
+            if yr < xl:
+                # The interval at y[j] is strictly to the left of the interval
+                # at x[i], so will not overlap with it or any later interval
+                # of x.
+                j += 1
+            elif yl > xr:
+                # The interval at y[j] is strictly to the right of the interval
+                # at x[i], so all of x[i] goes into the result as no further
+                # intervals in y will intersect it.
+                result.append(x[i])
+                i += 1
+            elif yl <= xl:
+                if yr >= xr:
+                    # x[i] is contained entirely in y[j], so we just skip over
+                    # it without adding it to the result.
+                    i += 1
+                else:
+                    # The beginning of x[i] is contained in y[j], so we update
+                    # the left endpoint of x[i] to remove this, and increment j
+                    # as we now have moved past it. Note that this is not added
+                    # to the result as is, as more intervals from y may
+                    # intersect it so it may need updating further.
+                    x[i][0] = yr + 1
+                    j += 1
+            else:
+                # yl > xl, so the left hand part of x[i] is not contained in
+                # y[j], so there are some values we should add to the result.
+                result.append((xl, yl - 1))
+
+                if yr + 1 <= xr:
+                    # If y[j] finishes before x[i] does, there may be some
+                    # values in x[i] left that should go in the result (or they
+                    # may be removed by a later interval in y), so we update
+                    # x[i] to reflect that and increment j because it no longer
+                    # overlaps with any remaining element of x.
+                    x[i][0] = yr + 1
+                    j += 1
+                else:
+                    # Every element of x[i] other than the initial part we have
+                    # already added is contained in y[j], so we move to the
+                    # next interval.
+                    i += 1
+        # Any remaining intervals in x do not overlap with any of y, as if they
+        # did we would not have incremented j to the end, so can be added to
+        # the result as they are.
+        result.extend(x[i:])
+        return IntervalSet(result)
@@ -14,9 +14,9 @@
 # END HEADER
 
 import math
-import statistics
 from collections import Counter
 
+from hypothesis.internal.conjecture.statistics import value_at_rank
 from hypothesis.utils.dynamicvariables import DynamicVariable
 
 collector = DynamicVariable(None)
@@ -51,6 +51,18 @@ def describe_statistics(stats_dict):
 
     `stats_dict` must be a dictionary of data in the format collected by
     `hypothesis.internal.conjecture.engine.ConjectureRunner.statistics`.
+    It contains only JSON-compatible values, and for each phase that ran
+    summarises the test cases in that phase with:
+
+    - ``num-test-cases``: the number of test cases,
+    - ``statuses``: a dict from each status to the number of test cases
+      with that status,
+    - ``runtimes``: a sorted list of ``[seconds, count]`` pairs, giving a
+      histogram of runtimes accurate to within about 0.2%,
+    - ``mean-drawtime-fraction``: the mean fraction of the runtime of each
+      test case which was spent generating data, and
+    - ``events``: a dict from each event to the number of test cases in
+      which it occurred.
 
     We DO NOT promise that this format will be stable or supported over
     time, but do aim to make it reasonably useful for downstream users.
@@ -64,23 +76,19 @@ def describe_statistics(stats_dict):
     for phase in ["reuse", "generate", "shrink"]:
         d = stats_dict.get(phase + "-phase", {})
         # Basic information we report for every phase
-        cases = d.get("test-cases", [])
-        if not cases:
+        n_cases = d.get("num-test-cases", 0)
+        if not n_cases:
             continue
-        statuses = Counter(t["status"] for t in cases)
-        runtimes = sorted(t["runtime"] for t in cases)
-        n = max(0, len(runtimes) - 1)
-        lower = int(runtimes[int(math.floor(n * 0.05))] * 1000)
-        upper = int(runtimes[int(math.ceil(n * 0.95))] * 1000)
+        statuses = Counter(d["statuses"])
+        n = n_cases - 1
+        lower = int(value_at_rank(d["runtimes"], int(math.floor(n * 0.05))) * 1000)
+        upper = int(value_at_rank(d["runtimes"], int(math.ceil(n * 0.95))) * 1000)
         if upper == 0:
             ms = "< 1ms"
         elif lower == upper:
             ms = f"~ {lower}ms"
         else:
             ms = f"{lower}-{upper} ms"
-        drawtime_percent = 100 * statistics.mean(
-            t["drawtime"] / t["runtime"] if t["runtime"] > 0 else 0 for t in cases
-        )
         lines.append(
             "  - during {} phase ({:.2f} seconds):\n"
             "    - Typical runtimes: {}, ~ {:.0f}% in data generation\n"
@@ -88,7 +96,7 @@ def describe_statistics(stats_dict):
                 phase,
                 d["duration-seconds"],
                 ms,
-                drawtime_percent,
+                100 * d["mean-drawtime-fraction"],
                 statuses["valid"],
                 statuses["interesting"],
                 statuses["invalid"] + statuses["overrun"],
@@ -106,18 +114,18 @@ def describe_statistics(stats_dict):
         prev_failures = d["distinct-failures"]
         # Report events during the generate phase, if there were any
         if phase == "generate":
-            events = Counter(sum((t["events"] for t in cases), []))
+            events = d["events"]
             if events:
                 lines.append("    - Events:")
                 lines += [
-                    "      * {:.2f}%, {}".format(100 * v / len(cases), k)
+                    "      * {:.2f}%, {}".format(100 * v / n_cases, k)
                     for k, v in sorted(events.items(), key=lambda x: (-x[1], x[0]))
                 ]
         # Some additional details on the shrinking phase
         if phase == "shrink":
             lines.append(
                 "    - Tried {} shrinks of which {} were successful".format(
-                    len(cases), d["shrinks-successful"]
+                    n_cases, d["shrinks-successful"]
                 )
             )
         lines.append("")
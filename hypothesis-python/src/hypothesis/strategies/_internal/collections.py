@@ -112,10 +112,7 @@ class ListStrategy(SearchStrategy):
             max_size=self.max_size,
             average_size=self.average_size,
         )
-        result = []
-        while elements.more():
-            result.append(data.draw(self.element_strategy))
-        return result
+        return self.element_strategy.draw_many(data, elements)
 
     def __repr__(self):
         return "{}({!r}, min_size={!r}, max_size={!r})".format(
@@ -200,6 +197,57 @@ class UniqueSampledListStrategy(UniqueListStrategy):
         return result
 
 
+class UniqueBoundedIntListStrategy(UniqueListStrategy):
+    """Generates lists of distinct integers from a ``BoundedIntStrategy`` by
+    sampling without replacement, rather than rejecting duplicates.
+
+    Each element is drawn as its rank among the values which are not yet in
+    the list, so a draw never fails however full the range is, and shrinking
+    the ranks towards zero shrinks the list towards the smallest values.
+    """
+
+    def do_draw(self, data):
+        should_draw = cu.many(
+            data,
+            min_size=self.min_size,
+            max_size=self.max_size,
+            average_size=self.average_size,
+        )
+        start = self.element_strategy.start
+        size = self.element_strategy.end - start + 1
+        # A Fenwick tree over the offsets from start, stored sparsely so that
+        # it needs no O(size) setup: used[i] is the number of offsets we have
+        # drawn in the range (i - lowbit(i), i], counting from one.
+        used = {}
+        top = 1 << (size.bit_length() - 1)
+        result = []
+
+        while should_draw.more():
+            rank = cu.integer_range(data, 0, size - len(result) - 1)
+            # Find the offset of the rank'th value we have not used yet by
+            # descending the tree, skipping each block with at most rank
+            # unused values in it.
+            offset = 0
+            step = top
+            while step:
+                if offset + step <= size:
+                    unused = step - used.get(offset + step, 0)
+                    if unused <= rank:
+                        offset += step
+                        rank -= unused
+                step >>= 1
+            i = offset + 1
+            while i <= size:
+                used[i] = used.get(i, 0) + 1
+                i += i & -i
+            value = start + offset
+            if self.tuple_suffixes is not None:
+                value = (value,) + data.draw(self.tuple_suffixes)
+            result.append(value)
+        assert self.max_size >= len(result) >= self.min_size
+        return result
+
+
 class FixedKeysDictStrategy(MappedSearchStrategy):
     """A strategy which produces dicts with a fixed set of keys, given a
     strategy for each of their equivalent values.
@@ -62,6 +62,11 @@ from hypothesis.internal.conjecture.utils import (
     integer_range,
 )
 from hypothesis.internal.entropy import get_seeder_and_restorer
+from hypothesis.internal.filtering import (
+    narrow_floats_kwargs,
+    narrow_integers_kwargs,
+    narrow_text_kwargs,
+)
 from hypothesis.internal.floats import (
     count_between_floats,
     float_of,
@@ -95,6 +100,7 @@ from hypothesis.strategies._internal.collections import (
     FixedKeysDictStrategy,
     ListStrategy,
     TupleStrategy,
+    UniqueBoundedIntListStrategy,
     UniqueListStrategy,
     UniqueSampledListStrategy,
 )
@@ -119,6 +125,7 @@ from hypothesis.strategies._internal.strategies import (
 from hypothesis.strategies._internal.strings import (
     FixedSizeBytes,
     OneCharStringStrategy,
+    TextStrategy,
 )
 from hypothesis.utils.conventions import InferType, infer, not_set
 
@@ -192,7 +199,10 @@ def cacheable(fn: T) -> T:
 
 
 def defines_strategy(
-    *, force_reusable_values: bool = False, try_non_lazy: bool = False
+    *,
+    force_reusable_values: bool = False,
+    try_non_lazy: bool = False,
+    filter_rewriter: Optional[Callable[[dict, Callable], Optional[dict]]] = None,
 ) -> Callable[[T], T]:
     """Returns a decorator for strategy functions.
 
@@ -203,6 +213,12 @@ def defines_strategy(
     If try_non_lazy is True, attempt to execute the strategy definition
     function immediately, so that a LazyStrategy is only returned if this
     raises an exception.
+
+    If filter_rewriter is not None, it is called with the arguments to the
+    strategy function (as keyword arguments) and a predicate passed to
+    ``.filter()``, and may return narrower arguments for which the strategy
+    generates fewer values that the predicate rejects.  See
+    :mod:`hypothesis.internal.filtering`.
     """
 
     def decorator(strategy_definition):
@@ -222,7 +238,9 @@ def defines_strategy(
                     # If invoking the strategy definition raises an exception,
                     # wrap that up in a LazyStrategy so it happens again later.
                     pass
-            result = LazyStrategy(strategy_definition, args, kwargs)
+            result = LazyStrategy(
+                strategy_definition, args, kwargs, filter_rewriter=filter_rewriter
+            )
             if force_reusable_values:
                 result.force_has_reusable_values = True
                 assert result.has_reusable_values
@@ -395,7 +413,7 @@ def one_of(*args):  # noqa: F811
 
 
 @cacheable
-@defines_strategy(force_reusable_values=True)
+@defines_strategy(force_reusable_values=True, filter_rewriter=narrow_integers_kwargs)
 def integers(
     min_value: Optional[int] = None,
     max_value: Optional[int] = None,
@@ -466,7 +484,7 @@ def booleans() -> SearchStrategy[bool]:
 
 
 @cacheable
-@defines_strategy(force_reusable_values=True)
+@defines_strategy(force_reusable_values=True, filter_rewriter=narrow_floats_kwargs)
 def floats(
     min_value: Optional[Real] = None,
     max_value: Optional[Real] = None,
@@ -830,8 +848,13 @@ def lists(
             tuple_suffixes = TupleStrategy(elements.element_strategies[1:])
             elements = elements.element_strategies[0]
 
-        if isinstance(elements, SampledFromStrategy):
-            element_count = len(elements.elements)
+        if isinstance(elements, SampledFromStrategy) or (
+            isinstance(elements, BoundedIntStrategy) and unique_by == (identity,)
+        ):
+            if isinstance(elements, SampledFromStrategy):
+                element_count = len(elements.elements)
+            else:
+                element_count = elements.end - elements.start + 1
             if min_size > element_count:
                 raise InvalidArgument(
                     f"Cannot create a collection of min_size={min_size!r} unique "
@@ -844,6 +867,16 @@ def lists(
             else:
                 max_size = element_count
 
+            if isinstance(elements, BoundedIntStrategy):
+                # Distinct integers from a range can be sampled directly,
+                # without drawing the elements and rejecting duplicates.
+                return UniqueBoundedIntListStrategy(
+                    elements=elements,
+                    max_size=max_size,
+                    min_size=min_size,
+                    keys=unique_by,
+                    tuple_suffixes=tuple_suffixes,
+                )
             return UniqueSampledListStrategy(
                 elements=elements,
                 max_size=max_size,
@@ -1122,7 +1155,7 @@ def characters(
 
 
 @cacheable
-@defines_strategy(force_reusable_values=True)
+@defines_strategy(force_reusable_values=True, filter_rewriter=narrow_text_kwargs)
 def text(
     alphabet: Union[Sequence[str], SearchStrategy[str]] = characters(
         blacklist_categories=("Cs",)
@@ -1173,7 +1206,7 @@ def text(
         )
     if (max_size == 0 or char_strategy.is_empty) and not min_size:
         return just("")
-    return lists(char_strategy, min_size=min_size, max_size=max_size).map("".join)
+    return TextStrategy(char_strategy, min_size=min_size, max_size=max_size)
 
 
 @cacheable
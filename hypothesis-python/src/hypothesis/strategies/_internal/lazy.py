@@ -16,6 +16,7 @@
 from inspect import getfullargspec
 from typing import Dict
 
+from hypothesis.errors import InvalidArgument
 from hypothesis.internal.reflection import (
     arg_string,
     convert_keyword_arguments,
@@ -70,13 +71,24 @@ class LazyStrategy(SearchStrategy):
     Its parameter and distribution come from that other strategy.
     """
 
-    def __init__(self, function, args, kwargs, *, force_repr=None):
+    def __init__(
+        self,
+        function,
+        args,
+        kwargs,
+        *,
+        force_repr=None,
+        filter_rewriter=None,
+        narrowing_conditions=(),
+    ):
         SearchStrategy.__init__(self)
         self.__wrapped_strategy = None
         self.__representation = force_repr
         self.function = function
         self.__args = args
         self.__kwargs = kwargs
+        self.__filter_rewriter = filter_rewriter
+        self.__narrowing_conditions = narrowing_conditions
 
     @property
     def supports_find(self):
@@ -110,6 +122,10 @@ class LazyStrategy(SearchStrategy):
                 self.__wrapped_strategy = self.function(
                     *unwrapped_args, **unwrapped_kwargs
                 )
+            if self.__narrowing_conditions:
+                self.__wrapped_strategy = self.__narrowed(
+                    self.__wrapped_strategy, unwrapped_args, unwrapped_kwargs
+                )
         return self.__wrapped_strategy
 
     def do_validate(self):
@@ -146,9 +162,60 @@ class LazyStrategy(SearchStrategy):
             )
         return self.__representation
 
+    def filter(self, condition):
+        narrowed = self.narrowed_for(condition)
+        return SearchStrategy.filter(self if narrowed is None else narrowed, condition)
+
+    def narrowed_for(self, condition):
+        """Return a strategy which generates a subset of our values, including
+        all those which satisfy ``condition``, or None if we can't narrow
+        ourselves.  It has the same repr as we do, as the condition must
+        still be checked by a filter."""
+        if self.__filter_rewriter is None:
+            return None
+        return LazyStrategy(
+            self.function,
+            self.__args,
+            self.__kwargs,
+            force_repr=self.__representation,
+            filter_rewriter=self.__filter_rewriter,
+            narrowing_conditions=self.__narrowing_conditions + (condition,),
+        )
+
+    def __narrowed(self, base, args, kwargs):
+        try:
+            base.validate()
+        except InvalidArgument:
+            # If we're invalid, we leave the error to be raised as usual.
+            return base
+        args, kwargs = convert_positional_arguments(self.function, args, kwargs)
+        if args:
+            return base
+        narrowed_kwargs = kwargs
+        for condition in self.__narrowing_conditions:
+            narrowed_kwargs = (
+                self.__filter_rewriter(narrowed_kwargs, condition) or narrowed_kwargs
+            )
+        if narrowed_kwargs is kwargs:
+            return base
+        try:
+            narrowed = self.function(**narrowed_kwargs)
+            narrowed.validate()
+        except InvalidArgument:
+            # The narrowed arguments can be invalid, for example if the
+            # conditions rule out every value, in which case we fall back to
+            # filtering.
+            return base
+        return narrowed
+
     def do_draw(self, data):
         return data.draw(self.wrapped_strategy)
 
+    def do_draw_many(self, data, elements, labels=()):
+        return self.wrapped_strategy.do_draw_many(
+            data, elements, labels + (self.label,)
+        )
+
     def do_filtered_draw(self, data, filter_strategy):
         return self.wrapped_strategy.do_filtered_draw(
             data=data, filter_strategy=filter_strategy
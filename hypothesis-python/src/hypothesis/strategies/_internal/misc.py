@@ -16,6 +16,7 @@
 from hypothesis.strategies._internal.strategies import (
     FilteredStrategy,
     SampledFromStrategy,
+    SearchStrategy,
     filter_not_satisfied,
     is_simple_data,
 )
@@ -56,6 +57,9 @@ class JustStrategy(SampledFromStrategy):
             data.mark_invalid()
         return result
 
+    # SampledFromStrategy.do_draw_many would draw an index for each value.
+    do_draw_many = SearchStrategy.do_draw_many
+
     def do_filtered_draw(self, data, filter_strategy):
         if isinstance(filter_strategy, FilteredStrategy):
             return self._transform(self.value, filter_strategy.flat_conditions)
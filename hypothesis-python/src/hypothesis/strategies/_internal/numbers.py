@@ -19,14 +19,17 @@ from hypothesis.control import assume, reject
 from hypothesis.internal.conjecture import floats as flt, utils as d
 from hypothesis.internal.conjecture.utils import calc_label_from_name
 from hypothesis.internal.floats import float_of
-from hypothesis.strategies._internal.strategies import SearchStrategy
+from hypothesis.strategies._internal.strategies import (
+    SearchStrategy,
+    draw_each,
+)
 
 
 class WideRangeIntStrategy(SearchStrategy):
 
-    distribution = d.Sampler([4.0, 8.0, 1.0, 1.0, 0.5])
+    distribution = d.INT_SIZES_SAMPLER
 
-    sizes = [8, 16, 32, 64, 128]
+    sizes = d.INT_SIZES
 
     def __repr__(self):
         return "WideRangeIntStrategy()"
@@ -49,12 +52,16 @@ class BoundedIntStrategy(SearchStrategy):
         SearchStrategy.__init__(self)
         self.start = start
         self.end = end
+        self.draw_integer = d.integer_range_drawer(start, end)
 
     def __repr__(self):
         return f"BoundedIntStrategy({self.start}, {self.end})"
 
     def do_draw(self, data):
-        return d.integer_range(data, self.start, self.end)
+        return self.draw_integer(data)
+
+    def do_draw_many(self, data, elements, labels=()):
+        return draw_each(data, elements, labels + (self.label,), self.draw_integer)
 
 
 NASTY_FLOATS = sorted(
@@ -104,7 +111,7 @@ class FloatStrategy(SearchStrategy):
             float_of(f, self.width) for f in NASTY_FLOATS if self.permitted(f)
         ]
         weights = [0.2 * len(self.nasty_floats)] + [0.8] * len(self.nasty_floats)
-        self.sampler = d.Sampler(weights)
+        self.sampler = d.sampler_for(tuple(weights))
 
     def __repr__(self):
         return "{}(allow_infinity={}, allow_nan={}, width={})".format(
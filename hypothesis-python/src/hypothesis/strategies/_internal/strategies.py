@@ -15,6 +15,8 @@
 
 import sys
 import warnings
+from array import array
+from bisect import bisect_left, bisect_right
 from collections import defaultdict
 from random import choice as random_choice
 from typing import Any, Callable, Generic, List, TypeVar, Union
@@ -27,8 +29,9 @@ from hypothesis.errors import (
     NonInteractiveExampleWarning,
     UnsatisfiedAssumption,
 )
+from hypothesis.internal.cache import LRUReusedCache
 from hypothesis.internal.conjecture import utils as cu
-from hypothesis.internal.conjecture.data import ConjectureData
+from hypothesis.internal.conjecture.data import MAX_DEPTH, ConjectureData
 from hypothesis.internal.conjecture.utils import (
     calc_label_from_cls,
     calc_label_from_name,
@@ -52,6 +55,17 @@ FILTERED_SEARCH_STRATEGY_DO_DRAW_LABEL = calc_label_from_name(
     "single loop iteration in FilteredStrategy"
 )
 
+# The number of elements of a filtered SampledFromStrategy which we check at
+# once, and the number of distinct sets of conditions for which each strategy
+# remembers the allowed elements.
+ALLOWED_INDICES_BLOCK_SIZE = 10000
+ALLOWED_INDICES_CACHE_SIZE = 16
+# Collections of up to this many blocks are checked in full, so that we can
+# choose an allowed element directly.  For larger ones we make this many
+# attempts to choose an element uniformly at random before giving up.
+ALLOWED_INDICES_MAX_CHECKED_BLOCKS = 10
+ALLOWED_INDICES_MAX_ATTEMPTS = 10
+
 
 def recursive_property(name, default):
     """Handle properties which may be mutually recursive among a set of
@@ -409,10 +423,53 @@ class SearchStrategy(Generic[Ex]):
     def do_draw(self, data: ConjectureData) -> Ex:
         raise NotImplementedError(f"{type(self).__name__}.do_draw")
 
+    def draw_many(self, data, elements):
+        """Return a list of values drawn from this strategy, one for each time
+        ``elements.more()`` (a ``cu.many``) returns True, exactly as if each
+        were drawn with ``data.draw`` so that the shrinker sees the same
+        examples.  The checks that ``data.draw`` makes of the strategy are
+        made once, up front, rather than for every element."""
+        if data.is_find and not self.supports_find:
+            data.draw(self)  # raises InvalidArgument
+        self.validate()
+        if self.is_empty:
+            if elements.more():
+                data.mark_invalid()
+            return []
+        return self.do_draw_many(data, elements)
+
+    def do_draw_many(self, data, elements, labels=()):
+        # The implementation of ``draw_many``, which has already checked that
+        # this strategy is valid and not empty.  ``labels`` are those of any
+        # strategies which delegate their draws to this one, such as
+        # LazyStrategy, and which therefore get an example of their own.
+        #
+        # Leaf strategies may override this to do some of the per-element work
+        # once, up front, and pass a cheaper function to ``draw_each``.
+        return draw_each(data, elements, labels + (self.label,), self.do_draw)
+
     def __init__(self):
         pass
 
 
+def draw_each(data, elements, labels, draw):
+    """Return a list of ``draw(data)`` for each time that ``elements.more()``
+    returns True, with each value wrapped in an example for each of
+    ``labels`` from the outermost in, as if by nested calls to ``data.draw``."""
+    result = []
+    while elements.more():
+        if data.depth + len(labels) > MAX_DEPTH:
+            data.mark_invalid()
+        for label in labels:
+            data.start_example(label)
+        try:
+            result.append(draw(data))
+        finally:
+            for _ in labels:
+                data.stop_example()
+    return result
+
+
 def is_simple_data(value):
     try:
         hash(value)
@@ -436,6 +493,8 @@ class SampledFromStrategy(SearchStrategy):
         assert self.elements
         self.repr_ = repr_
         self._transformations = transformations
+        self.draw_index = cu.integer_range_drawer(0, len(self.elements) - 1)
+        self.__allowed_indices = None
 
     def map(self, pack):
         return type(self)(
@@ -481,9 +540,35 @@ class SampledFromStrategy(SearchStrategy):
             data.mark_invalid()
         return result
 
+    def do_draw_many(self, data, elements, labels=()):
+        if self._transformations:
+            return super().do_draw_many(data, elements, labels)
+        values = self.elements
+        draw_index = self.draw_index
+        return draw_each(
+            data, elements, labels + (self.label,), lambda d: values[draw_index(d)]
+        )
+
     def get_element(self, i, conditions=()):
         return self._transform(self.elements[i], conditions=conditions)
 
+    def allowed_indices(self, conditions=()):
+        """Return the ``AllowedIndices`` for the elements which survive our
+        transformations and ``conditions``, which are shared between draws so
+        that we only check each element once."""
+        try:
+            hash(conditions)
+        except TypeError:
+            return AllowedIndices(self, conditions)
+        if self.__allowed_indices is None:
+            self.__allowed_indices = LRUReusedCache(ALLOWED_INDICES_CACHE_SIZE)
+        try:
+            return self.__allowed_indices[conditions]
+        except KeyError:
+            result = AllowedIndices(self, conditions)
+            self.__allowed_indices[conditions] = result
+            return result
+
     def do_filtered_draw(self, data, filter_strategy):
         # Set of indices that have been tried so far, so that we never test
         # the same element twice during a draw.
@@ -499,7 +584,7 @@ class SampledFromStrategy(SearchStrategy):
         # Start with ordinary rejection sampling. It's fast if it works, and
         # if it doesn't work then it was only a small amount of overhead.
         for _ in range(3):
-            i = cu.integer_range(data, 0, len(self.elements) - 1)
+            i = self.draw_index(data)
             if i not in known_bad_indices:
                 element = self.get_element(i, conditions=conditions)
                 if element is not filter_not_satisfied:
@@ -509,48 +594,98 @@ class SampledFromStrategy(SearchStrategy):
                 known_bad_indices.add(i)
 
         # If we've tried all the possible elements, give up now.
-        max_good_indices = len(self.elements) - len(known_bad_indices)
-        if not max_good_indices:
+        if len(known_bad_indices) == len(self.elements):
             return filter_not_satisfied
 
-        # Figure out the bit-length of the index that we will write back after
-        # choosing an allowed element.
-        write_length = len(self.elements).bit_length()
-
-        # Impose an arbitrary cutoff to prevent us from wasting too much time
-        # on very large element lists.
-        cutoff = 10000
-        max_good_indices = min(max_good_indices, cutoff)
-
-        # Before building the list of allowed indices, speculatively choose
-        # one of them. We don't yet know how many allowed indices there will be,
-        # so this choice might be out-of-bounds, but that's OK.
-        speculative_index = cu.integer_range(data, 0, max_good_indices - 1)
-
-        # Calculate the indices of allowed values, so that we can choose one
-        # of them at random. But if we encounter the speculatively-chosen one,
-        # just use that and return immediately.  Note that we also track the
-        # allowed elements, in case of .map(some_stateful_function)
-        allowed = []
-        for i in range(min(len(self.elements), cutoff)):
-            if i not in known_bad_indices:
-                element = self.get_element(i, conditions=conditions)
-                if element is not filter_not_satisfied:
-                    allowed.append((i, element))
-                    if len(allowed) > speculative_index:
-                        # Early-exit case: We reached the speculative index, so
-                        # we just return the corresponding element.
-                        data.draw_bits(write_length, forced=i)
-                        return element
-
-        # The speculative index didn't work out, but at this point we've built
-        # and can choose from the complete list of allowed indices and elements.
-        if allowed:
-            i, element = cu.choice(data, allowed)
-            data.draw_bits(write_length, forced=i)
-            return element
-        # If there are no allowed indices, the filter couldn't be satisfied.
-        return filter_not_satisfied
+        # Otherwise choose directly from the allowed elements, which we work
+        # out lazily and remember for later draws with the same conditions.
+        i = self.allowed_indices(conditions).choose(data)
+        if i is None:
+            # If there are no allowed indices, the filter couldn't be satisfied.
+            return filter_not_satisfied
+        # Write back the chosen index, so that it is visible in the buffer.
+        data.draw_bits(len(self.elements).bit_length(), forced=i)
+        # We recompute the element rather than remembering it, so that each
+        # draw gets a fresh value in case of e.g. .map(list).
+        return self.get_element(i, conditions=conditions)
+
+
+class AllowedIndices:
+    """The indices of the elements of a ``SampledFromStrategy`` which are
+    allowed by its filters and some additional conditions.
+
+    Elements are divided into blocks of ``ALLOWED_INDICES_BLOCK_SIZE``, and
+    we only check the elements of a block when a draw first needs it, then
+    remember the offsets of the allowed elements in it, so that no element is
+    checked twice.
+
+    If there are at most ``ALLOWED_INDICES_MAX_CHECKED_BLOCKS`` blocks, the
+    first draw checks all of them, and we choose uniformly from the allowed
+    elements using the number of allowed elements up to the end of each block.
+    For larger collections we instead choose uniformly from all the elements,
+    retrying if the element is not allowed, and give up after
+    ``ALLOWED_INDICES_MAX_ATTEMPTS`` attempts.  Either way, the result depends
+    only on the data drawn, and not on which blocks earlier draws checked.
+    """
+
+    def __init__(self, strategy, conditions):
+        self.strategy = strategy
+        self.conditions = conditions
+        n_blocks = -(-len(strategy.elements) // ALLOWED_INDICES_BLOCK_SIZE)
+        # For each block, None if we haven't checked it yet, or else an array
+        # of the offsets of allowed elements within it, in increasing order.
+        self.blocks = [None] * n_blocks
+        # For small collections, once we have checked every block, the number
+        # of allowed elements in each block and every earlier block.
+        self.cumulative_counts = None
+
+    def block(self, b):
+        allowed = self.blocks[b]
+        if allowed is None:
+            start = b * ALLOWED_INDICES_BLOCK_SIZE
+            stop = min(start + ALLOWED_INDICES_BLOCK_SIZE, len(self.strategy.elements))
+            get_element = self.strategy.get_element
+            allowed = array(
+                "H",
+                [
+                    i - start
+                    for i in range(start, stop)
+                    if get_element(i, self.conditions) is not filter_not_satisfied
+                ],
+            )
+            self.blocks[b] = allowed
+        return allowed
+
+    def choose(self, data):
+        """Draw an allowed index from ``data``, uniformly at random, or return
+        None if we could not find an allowed element."""
+        if len(self.blocks) <= ALLOWED_INDICES_MAX_CHECKED_BLOCKS:
+            return self.__choose_directly(data)
+        n_elements = len(self.strategy.elements)
+        for _ in range(ALLOWED_INDICES_MAX_ATTEMPTS):
+            i = cu.integer_range(data, 0, n_elements - 1)
+            b, offset = divmod(i, ALLOWED_INDICES_BLOCK_SIZE)
+            allowed = self.block(b)
+            j = bisect_left(allowed, offset)
+            if j < len(allowed) and allowed[j] == offset:
+                return i
+        return None
+
+    def __choose_directly(self, data):
+        if self.cumulative_counts is None:
+            total = 0
+            self.cumulative_counts = []
+            for b in range(len(self.blocks)):
+                total += len(self.block(b))
+                self.cumulative_counts.append(total)
+        if not self.cumulative_counts or not self.cumulative_counts[-1]:
+            return None
+        i = cu.integer_range(data, 0, self.cumulative_counts[-1] - 1)
+        # The first block with more than i allowed elements up to its end.
+        b = bisect_right(self.cumulative_counts, i)
+        if b > 0:
+            i -= self.cumulative_counts[b - 1]
+        return b * ALLOWED_INDICES_BLOCK_SIZE + self.blocks[b][i]
 
 
 class OneOfStrategy(SearchStrategy):
@@ -724,6 +859,16 @@ class FilteredStrategy(SearchStrategy):
     def calc_is_cacheable(self, recur):
         return recur(self.filtered_strategy)
 
+    def filter(self, condition):
+        # If the strategy we filter can narrow itself to suit the new
+        # condition, as integers() can for lambda x: x > 0, we instead filter
+        # the narrowed strategy by all of our conditions.
+        narrowed_for = getattr(self.filtered_strategy, "narrowed_for", None)
+        narrowed = narrowed_for(condition) if narrowed_for is not None else None
+        if narrowed is None:
+            return super().filter(condition)
+        return FilteredStrategy(narrowed, self.flat_conditions + (condition,))
+
     def __repr__(self):
         if not hasattr(self, "_cached_repr"):
             self._cached_repr = "{!r}{}".format(
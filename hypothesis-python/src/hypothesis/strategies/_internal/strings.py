@@ -15,9 +15,13 @@
 
 from hypothesis.errors import InvalidArgument
 from hypothesis.internal import charmap
-from hypothesis.internal.conjecture.utils import biased_coin, integer_range
-from hypothesis.internal.intervalsets import IntervalSet
-from hypothesis.strategies._internal.strategies import SearchStrategy
+from hypothesis.internal.conjecture.utils import (
+    biased_coin,
+    integer_range,
+    integer_range_drawer,
+)
+from hypothesis.strategies._internal.collections import ListStrategy
+from hypothesis.strategies._internal.strategies import SearchStrategy, draw_each
 
 
 class OneCharStringStrategy(SearchStrategy):
@@ -34,7 +38,7 @@ class OneCharStringStrategy(SearchStrategy):
     ):
         assert set(whitelist_categories or ()).issubset(charmap.categories())
         assert set(blacklist_categories or ()).issubset(charmap.categories())
-        intervals = charmap.query(
+        intervals = charmap.query_intervalset(
             include_categories=whitelist_categories,
             exclude_categories=blacklist_categories,
             min_codepoint=min_codepoint,
@@ -56,11 +60,12 @@ class OneCharStringStrategy(SearchStrategy):
                 "combination of arguments: "
                 + ", ".join("%s=%r" % arg for arg in arguments if arg[1] is not None)
             )
-        self.intervals = IntervalSet(intervals)
+        self.intervals = intervals
         self.zero_point = self.intervals.index_above(ord("0"))
         self.Z_point = min(
             self.intervals.index_above(ord("Z")), len(self.intervals) - 1
         )
+        self.__small_index_table = None
 
     def do_draw(self, data):
         if len(self.intervals) > 256:
@@ -75,6 +80,38 @@ class OneCharStringStrategy(SearchStrategy):
 
         return chr(self.intervals[i])
 
+    def do_draw_many(self, data, elements, labels=()):
+        # As do_draw, but with the setup for each branch done once, and a
+        # table of the characters for the first 256 indices, which are the
+        # only ones we draw from most of the time.
+        table = self.small_index_table
+        n = len(self.intervals)
+        if n > 256:
+            draw_small = integer_range_drawer(0, 255)
+            draw_large = integer_range_drawer(256, n - 1)
+
+            def draw(data):
+                if biased_coin(data, 0.2):
+                    return chr(self.intervals[self.rewrite_integer(draw_large(data))])
+                return table[draw_small(data)]
+
+        else:
+            draw_index = integer_range_drawer(0, n - 1)
+
+            def draw(data):
+                return table[draw_index(data)]
+
+        return draw_each(data, elements, labels + (self.label,), draw)
+
+    @property
+    def small_index_table(self):
+        if self.__small_index_table is None:
+            self.__small_index_table = [
+                chr(self.intervals[self.rewrite_integer(i)])
+                for i in range(min(256, len(self.intervals)))
+            ]
+        return self.__small_index_table
+
     def rewrite_integer(self, i):
         # We would like it so that, where possible, shrinking replaces
         # characters with simple ascii characters, so we rejig this
@@ -99,6 +136,15 @@ class OneCharStringStrategy(SearchStrategy):
         return i
 
 
+class TextStrategy(ListStrategy):
+    """A strategy for strings of characters drawn from ``elements``.  This
+    draws exactly the same data as ``lists(elements).map("".join)``, but
+    without an extra layer of strategy around the list."""
+
+    def do_draw(self, data):
+        return "".join(super().do_draw(data))
+
+
 class FixedSizeBytes(SearchStrategy):
     def __init__(self, size):
         self.size = size
@@ -0,0 +1,69 @@
+# This file is part of Hypothesis, which may be found at
+# https://github.com/HypothesisWorks/hypothesis/
+#
+# Most of this work is copyright (C) 2013-2021 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by others. See
+# CONTRIBUTING.rst for a full list of people who may hold copyright, and
+# consult the git log if you need to determine who owns an individual
+# contribution.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+#
+# END HEADER
+"""Micro-benchmarks for ``ConjectureData.draw_bits``.
+
+Run this module to print the number of draws per second for each size and
+source of draw, with ``python -m tests.benchmarks.draw_bits``.  The
+correctness of these draws is tested in ``tests/conjecture/test_test_data.py``.
+"""
+
+from random import Random
+from time import perf_counter
+
+from hypothesis.internal.conjecture.data import ConjectureData
+
+BIT_SIZES = (1, 8, 64, 1024)
+SOURCES = ("random", "prefix", "forced")
+
+# Enough draws that the cost of creating the ConjectureData is negligible.
+DRAWS_PER_DATA = 100
+
+
+def run_draws(n_bits, source, n_datas):
+    """Draw ``DRAWS_PER_DATA`` values of ``n_bits`` from each of ``n_datas``
+    fresh ConjectureData objects, and return the last one."""
+    n_bytes = (n_bits + 7) // 8
+    max_length = n_bytes * DRAWS_PER_DATA
+    random = Random(0)
+    prefix = bytes(random.getrandbits(8) for _ in range(max_length))
+    forced = (1 << n_bits) - 1 if source == "forced" else None
+    for _ in range(n_datas):
+        if source == "random":
+            data = ConjectureData(max_length, b"", random=random)
+        else:
+            data = ConjectureData.for_buffer(prefix)
+        draw_bits = data.draw_bits
+        for _ in range(DRAWS_PER_DATA):
+            draw_bits(n_bits, forced=forced)
+    return data
+
+
+def draws_per_second(n_bits, source, min_time=0.5):
+    n_datas = 1
+    while True:
+        start = perf_counter()
+        run_draws(n_bits, source, n_datas)
+        elapsed = perf_counter() - start
+        if elapsed >= min_time:
+            return n_datas * DRAWS_PER_DATA / elapsed
+        n_datas *= 2
+
+
+if __name__ == "__main__":
+    print(f"{'bits':>6} {'source':>8} {'draws/sec':>12}")
+    for n_bits in BIT_SIZES:
+        for source in SOURCES:
+            rate = draws_per_second(n_bits, source)
+            print(f"{n_bits:>6} {source:>8} {rate:>12,.0f}")
@@ -0,0 +1,62 @@
+# This file is part of Hypothesis, which may be found at
+# https://github.com/HypothesisWorks/hypothesis/
+#
+# Most of this work is copyright (C) 2013-2021 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by others. See
+# CONTRIBUTING.rst for a full list of people who may hold copyright, and
+# consult the git log if you need to determine who owns an individual
+# contribution.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+#
+# END HEADER
+"""Micro-benchmarks for drawing from ``text()``.
+
+Run this module to print the number of characters generated per second for
+strings of each size, with ``python -m tests.benchmarks.text``.  The strings
+themselves are tested in ``tests/cover/test_text.py``.
+"""
+
+from random import Random
+from time import perf_counter
+
+from hypothesis import strategies as st
+from hypothesis.internal.conjecture.data import ConjectureData
+
+SIZES = (10, 1000, 100000)
+ALPHABETS = {
+    "default": st.characters(),
+    "ascii": st.characters(max_codepoint=127),
+}
+
+
+def run_draws(size, alphabet, n_datas):
+    """Draw a string of exactly ``size`` characters from each of ``n_datas``
+    fresh ConjectureData objects, and return the last string."""
+    strategy = st.text(ALPHABETS[alphabet], min_size=size, max_size=size)
+    random = Random(0)
+    for _ in range(n_datas):
+        data = ConjectureData(10 * size, b"", random=random)
+        result = data.draw(strategy)
+    return result
+
+
+def chars_per_second(size, alphabet, min_time=0.5):
+    n_datas = 1
+    while True:
+        start = perf_counter()
+        run_draws(size, alphabet, n_datas)
+        elapsed = perf_counter() - start
+        if elapsed >= min_time:
+            return n_datas * size / elapsed
+        n_datas *= 2
+
+
+if __name__ == "__main__":
+    print(f"{'size':>7} {'alphabet':>8} {'chars/sec':>12}")
+    for size in SIZES:
+        for alphabet in sorted(ALPHABETS):
+            rate = chars_per_second(size, alphabet)
+            print(f"{size:>7} {alphabet:>8} {rate:>12,.0f}")
@@ -21,7 +21,7 @@ from hypothesis import Verbosity, settings
 from hypothesis._settings import not_set
 from hypothesis.configuration import set_hypothesis_home_dir
 from hypothesis.errors import NonInteractiveExampleWarning
-from hypothesis.internal.charmap import charmap, charmap_file
+from hypothesis.internal.charmap import bundled_charmap_file, charmap, charmap_file
 from hypothesis.internal.coverage import IN_COVERAGE_TESTS
 
 
@@ -63,7 +63,8 @@ def run():
     assert settings.default.database.path.startswith(new_home)
 
     charmap()
-    assert os.path.exists(charmap_file()), charmap_file()
+    if not os.path.exists(bundled_charmap_file()):
+        assert os.path.exists(charmap_file()), charmap_file()
     assert isinstance(settings, type)
 
     # We do a smoke test here before we mess around with settings.
@@ -121,6 +121,13 @@ def test_skips_over_exhausted_subtree():
     assert tree.step(select(8), f) == (7,)
 
 
+def test_can_mark_tree_as_exhausted():
+    tree = ChoiceTree()
+    assert not tree.exhausted
+    tree.mark_exhausted()
+    assert tree.exhausted
+
+
 def test_exhausts_randomly():
     def f(chooser):
         chooser.choose(range(10))
@@ -13,14 +13,15 @@
 #
 # END HEADER
 
+import tracemalloc
 from random import Random
 
 import pytest
 
-from hypothesis import HealthCheck, settings
+from hypothesis import HealthCheck, given, settings, strategies as st
 from hypothesis.errors import Flaky
 from hypothesis.internal.conjecture.data import ConjectureData, Status, StopTest
-from hypothesis.internal.conjecture.datatree import DataTree
+from hypothesis.internal.conjecture.datatree import BRANCH, BranchSummary, DataTree
 from hypothesis.internal.conjecture.engine import ConjectureRunner
 
 TEST_SETTINGS = settings(
@@ -368,3 +369,225 @@ def test_will_mark_changes_in_discard_as_flaky():
 
     with pytest.raises(Flaky):
         data.stop_example(discard=True)
+
+
+def test_splitting_a_node_does_not_copy_its_draws():
+    tree = DataTree()
+    for buf in ([0, 1, 2, 3], [0, 2, 2, 3]):
+        data = ConjectureData.for_buffer(buf, observer=tree.new_observer())
+        for _ in range(4):
+            data.draw_bits(8)
+        data.freeze()
+    # Only the two draws after the split point are new
+    assert len(tree._values) == 4 + 2
+    assert list(tree.root.values) == [0]
+    assert list(tree.root.transition.children[1].values) == [2, 3]
+    assert list(tree.root.transition.children[2].values) == [2, 3]
+
+
+def test_can_extend_a_node_after_other_nodes_are_added():
+    tree = DataTree()
+    data = ConjectureData.for_buffer([0], observer=tree.new_observer())
+    data.draw_bits(8)
+    with pytest.raises(StopTest):
+        data.draw_bits(8)
+
+    data = ConjectureData.for_buffer([1, 1], observer=tree.new_observer())
+    data.draw_bits(8)
+    data.draw_bits(8)
+    data.freeze()
+
+    data = ConjectureData.for_buffer([0, 5, 6], observer=tree.new_observer())
+    for _ in range(3):
+        data.draw_bits(8)
+    data.freeze()
+
+    assert tree.rewrite([0, 5, 6]) == (bytes([0, 5, 6]), Status.VALID)
+    assert tree.rewrite([1, 1]) == (bytes([1, 1]), Status.VALID)
+
+
+def test_tree_uses_little_memory_per_draw():
+    def f(data):
+        for _ in range(data.draw_bits(4) * 4):
+            data.draw_bits(8)
+            data.draw_bits(2, forced=1)
+        data.conclude_test(Status.VALID)
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        tree = DataTree()
+        random = Random(0)
+        draws = 0
+        for _ in range(1000):
+            data = ConjectureData(
+                prefix=tree.generate_novel_prefix(random),
+                max_length=1024,
+                random=random,
+                observer=tree.new_observer(),
+            )
+            try:
+                f(data)
+            except StopTest:
+                pass
+            draws += len(data.blocks)
+        used = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    # A tree of one object per node used about 40 bytes per draw here.
+    assert used / draws < 16
+
+
+def test_serialized_tree_remembers_exhausted_subtrees():
+    tree = DataTree()
+    for buf in ([0, 0], [0, 1], [1, 5]):
+        data = ConjectureData.for_buffer(buf, observer=tree.new_observer())
+        if data.draw_bits(1) == 0:
+            data.draw_bits(1)
+        else:
+            data.draw_bits(8)
+        data.freeze()
+
+    loaded = DataTree.from_bytes(tree.to_bytes())
+    assert not loaded.is_exhausted
+    assert loaded.root.transition.children[0].is_exhausted
+    assert not loaded.root.transition.children[1].is_exhausted
+    for _ in range(10):
+        prefix = loaded.generate_novel_prefix(Random(0))
+        assert prefix[0] == 1
+        assert prefix[1] != 5
+
+
+def test_serialized_exhausted_tree_is_exhausted():
+    tree = DataTree()
+    for i in range(2):
+        data = ConjectureData.for_buffer([i], observer=tree.new_observer())
+        data.draw_bits(1)
+        data.freeze()
+    assert tree.is_exhausted
+    assert DataTree.from_bytes(tree.to_bytes()).is_exhausted
+
+
+def test_serialized_tree_is_bounded():
+    tree = DataTree()
+    for i in range(256):
+        data = ConjectureData.for_buffer([i, 0, 0], observer=tree.new_observer())
+        data.draw_bits(8)
+        data.draw_bits(8)
+        data.draw_bits(8)
+        data.freeze()
+
+    loaded = DataTree.from_bytes(tree.to_bytes(max_nodes=10))
+    assert len(loaded.root.transition.children) == 9
+
+
+@pytest.mark.parametrize(
+    "buffer", [b"", b"\xff", b"\x00", b"\x00\x80", b"\x00\x00\x09", b"\x00\x00\x00\x00"]
+)
+def test_invalid_serialized_trees_are_ignored(buffer):
+    assert DataTree.from_bytes(buffer) is None
+
+
+def check_exhausted_counts(tree):
+    for node, kind in enumerate(tree._kinds):
+        if kind == BRANCH:
+            children = tree._transitions[node].values()
+            assert tree._n_exhausted[node] == sum(tree._exhausted[c] for c in children)
+            summary = tree._branch_summaries.get(node)
+            if summary is not None:
+                assert summary.keys == sorted(tree._transitions[node])
+                assert sorted(summary.live) == sorted(
+                    (k, c)
+                    for k, c in tree._transitions[node].items()
+                    if not tree._exhausted[c]
+                )
+
+
+def test_keeps_count_of_exhausted_children():
+    tree = DataTree()
+    random = Random(0)
+    while not tree.is_exhausted:
+        data = ConjectureData(
+            prefix=tree.generate_novel_prefix(random),
+            max_length=100,
+            random=random,
+            observer=tree.new_observer(),
+        )
+        try:
+            if data.draw_bits(2) == 3:
+                data.draw_bits(1, forced=0)
+            data.draw_bits(2)
+            if data.draw_bits(1):
+                data.mark_invalid()
+            data.freeze()
+        except StopTest:
+            pass
+        check_exhausted_counts(tree)
+
+
+def test_generates_remaining_prefix_without_retrying():
+    tree = DataTree()
+    for i in range(255):
+        data = ConjectureData.for_buffer([i], observer=tree.new_observer())
+        data.draw_bits(8)
+        data.freeze()
+
+    class CountingRandom(Random):
+        calls = 0
+
+        def getrandbits(self, n):
+            self.calls += 1
+            return super().getrandbits(n)
+
+    random = CountingRandom(0)
+    for _ in range(10):
+        assert tree.generate_novel_prefix(random) == bytes([255])
+    # Rejection sampling would need about 256 calls for each prefix
+    assert random.calls < 50
+
+
+def test_does_not_summarise_wide_branches():
+    tree = DataTree()
+    for i in range(1000):
+        data = ConjectureData.for_buffer(
+            i.to_bytes(4, "big"), observer=tree.new_observer()
+        )
+        data.draw_bits(32)
+        data.freeze()
+
+    random = Random(0)
+    for _ in range(100):
+        prefix = tree.generate_novel_prefix(random)
+        assert int.from_bytes(prefix, "big") >= 1000
+    # Looking through the children of a wide branch for every prefix would
+    # make generation quadratic in the number of examples.
+    assert not tree._branch_summaries
+
+
+@given(st.sets(st.integers(0, 20)), st.integers(0, 20))
+def test_finds_nth_unseen_value(keys, n):
+    summary = BranchSummary()
+    for i, k in enumerate(keys):
+        summary.add(k, i)
+    unseen = [v for v in range(50) if v not in keys]
+    assert summary.nth_unseen(n) == unseen[n]
+
+
+@pytest.mark.parametrize("depth_bias", [1, 100])
+def test_depth_bias_controls_prefix_length(depth_bias):
+    tree = DataTree()
+    for i in range(2):
+        data = ConjectureData.for_buffer([i, 0, 0], observer=tree.new_observer())
+        for _ in range(3):
+            data.draw_bits(8)
+        data.freeze()
+
+    random = Random(0)
+    lengths = [
+        len(tree.generate_novel_prefix(random, depth_bias=depth_bias))
+        for _ in range(100)
+    ]
+    if depth_bias == 1:
+        assert lengths.count(1) > 90
+    else:
+        assert lengths.count(2) > 30
@@ -24,7 +24,7 @@ from hypothesis import HealthCheck, Phase, Verbosity, settings
 from hypothesis.database import ExampleDatabase, InMemoryExampleDatabase
 from hypothesis.errors import FailedHealthCheck, Flaky
 from hypothesis.internal.compat import int_from_bytes
-from hypothesis.internal.conjecture import engine as engine_module
+from hypothesis.internal.conjecture import engine as engine_module, parallel
 from hypothesis.internal.conjecture.data import ConjectureData, Overrun, Status
 from hypothesis.internal.conjecture.engine import (
     MIN_TEST_CALLS,
@@ -32,13 +32,22 @@ from hypothesis.internal.conjecture.engine import (
     ExitReason,
     RunIsComplete,
 )
+from hypothesis.internal.conjecture.parallel import (
+    can_use_workers,
+    run_in_workers,
+    worker_pool,
+)
 from hypothesis.internal.conjecture.pareto import DominanceRelation, dominance
-from hypothesis.internal.conjecture.shrinker import Shrinker, block_program
+from hypothesis.internal.conjecture.shrinker import (
+    Shrinker,
+    block_program,
+    decode_checkpoint,
+)
 from hypothesis.internal.conjecture.utils import integer_range
 from hypothesis.internal.entropy import deterministic_PRNG
 
 from tests.common.strategies import SLOW, HardToShrink
-from tests.common.utils import no_shrink
+from tests.common.utils import capture_out, no_shrink
 from tests.conjecture.common import (
     SOME_LABEL,
     TEST_SETTINGS,
@@ -258,7 +267,7 @@ def test_stops_after_max_examples_when_generating_more_bugs(examples):
     def f(data):
         seen.append(data.draw_bits(32))
         # Rare, potentially multi-error conditions
-        if seen[-1] > 2 ** 31:
+        if seen[-1] > 2**31:
             bad[0] = True
             raise ValueError
         bad[1] = True
@@ -427,14 +436,14 @@ def test_fails_health_check_for_all_invalid():
 def test_fails_health_check_for_large_base():
     @fails_health_check(HealthCheck.large_base_example)
     def _(data):
-        data.draw_bytes(10 ** 6)
+        data.draw_bytes(10**6)
 
 
 def test_fails_health_check_for_large_non_base():
     @fails_health_check(HealthCheck.data_too_large)
     def _(data):
         if data.draw_bits(8):
-            data.draw_bytes(10 ** 6)
+            data.draw_bytes(10**6)
 
 
 def test_fails_health_check_for_slow_draws():
@@ -565,6 +574,152 @@ def test_clears_out_its_database_on_shrinking(
     assert len(list(db.fetch(runner.database_key))) == 1
 
 
+class CountingDatabase(ExampleDatabase):
+    def __init__(self):
+        self.inner = InMemoryExampleDatabase()
+        self.calls = []
+
+    def fetch(self, key):
+        self.calls.append("fetch")
+        return self.inner.fetch(key)
+
+    def fetch_many(self, keys):
+        self.calls.append("fetch_many")
+        return self.inner.fetch_many(keys)
+
+    def save(self, key, value):
+        self.calls.append("save")
+        self.inner.save(key, value)
+
+    def delete(self, key, value):
+        self.calls.append("delete")
+        self.inner.delete(key, value)
+
+    def save_many(self, items):
+        self.calls.append("save_many")
+        self.inner.save_many(items)
+
+    def delete_many(self, items):
+        self.calls.append("delete_many")
+        self.inner.delete_many(items)
+
+
+def test_reusing_examples_uses_constant_database_calls():
+    db = CountingDatabase()
+
+    def f(data):
+        data.draw_bits(8)
+        data.mark_invalid()
+
+    runner = ConjectureRunner(
+        f,
+        settings=settings(
+            database=db,
+            max_examples=100,
+            phases=[Phase.reuse],
+        ),
+        database_key=b"key",
+    )
+    for n in range(50):
+        db.inner.save(runner.database_key, bytes([n]))
+        db.inner.save(runner.secondary_key, bytes([n, n]))
+        db.inner.save(runner.pareto_key, bytes([n]))
+    runner.reuse_existing_examples()
+    # Each stale example is deleted, but only with a single batched call
+    assert db.calls == ["fetch_many", "delete_many"]
+    assert not list(db.inner.fetch(runner.database_key))
+    assert not list(db.inner.fetch(runner.secondary_key))
+
+
+def test_database_writes_are_buffered_during_run():
+    db = CountingDatabase()
+
+    def f(data):
+        if data.draw_bits(16) >= 1000:
+            data.mark_interesting()
+
+    runner = ConjectureRunner(
+        f, settings=settings(database=db, max_examples=1000), database_key=b"key"
+    )
+    runner.run()
+    assert runner.shrinks > 1
+    assert "save" not in db.calls
+    assert "delete" not in db.calls
+    assert list(db.inner.fetch(runner.database_key)) == [bytes([3, 232])]
+
+
+def test_database_flush_errors_do_not_hide_errors_from_the_run():
+    class BrokenDatabase(InMemoryExampleDatabase):
+        def save_many(self, items):
+            raise OSError
+
+    def f(data):
+        if data.draw_bits(8) >= 10:
+            raise ValueError
+
+    runner = ConjectureRunner(
+        f, settings=settings(database=BrokenDatabase()), database_key=b"key"
+    )
+    with pytest.raises(ValueError):
+        runner.run()
+
+
+def test_later_runs_avoid_behaviour_explored_by_earlier_runs():
+    db = InMemoryExampleDatabase()
+    seen = []
+
+    def f(data):
+        seen[-1].add(data.draw_bits(8))
+
+    for i in range(2):
+        seen.append(set())
+        runner = ConjectureRunner(
+            f,
+            settings=settings(database=db, max_examples=50, persist_tree=True),
+            database_key=b"key",
+            random=Random(i),
+        )
+        runner.run()
+        assert list(db.fetch(runner.tree_key))
+
+    # Only the simplest example and the pareto front are tried again
+    assert len(seen[0] & seen[1]) <= 2
+
+
+def test_ignores_stored_tree_after_test_changes():
+    db = InMemoryExampleDatabase()
+
+    def f(data):
+        data.draw_bits(8)
+
+    def g(data):
+        data.draw_bytes(2)
+        data.draw_bits(1)
+
+    for test in (f, g):
+        runner = ConjectureRunner(
+            test,
+            settings=settings(database=db, max_examples=100, persist_tree=True),
+            database_key=b"key",
+        )
+        runner.run()
+    assert runner.valid_examples == 100
+    assert len(db.data[runner.tree_key]) == 1
+
+
+def test_does_not_store_tree_by_default():
+    db = InMemoryExampleDatabase()
+
+    def f(data):
+        data.draw_bits(8)
+
+    runner = ConjectureRunner(
+        f, settings=settings(database=db, max_examples=100), database_key=b"key"
+    )
+    runner.run()
+    assert runner.tree_key not in db.data
+
+
 def test_detects_too_small_block_starts():
     call_count = [0]
 
@@ -814,7 +969,7 @@ def test_exit_because_shrink_phase_timeout(monkeypatch):
         return val[0]
 
     def f(data):
-        if data.draw_bits(64) > 2 ** 33:
+        if data.draw_bits(64) > 2**33:
             data.mark_interesting()
 
     monkeypatch.setattr(time, "perf_counter", fast_time)
@@ -824,6 +979,289 @@ def test_exit_because_shrink_phase_timeout(monkeypatch):
     assert runner.statistics["stopped-because"] == "shrinking was very slow"
 
 
+def test_shrink_time_budget_can_be_disabled(monkeypatch):
+    val = [0]
+
+    def fast_time():
+        val[0] += 1000
+        return val[0]
+
+    def f(data):
+        if data.draw_bits(64) > 2**33:
+            data.mark_interesting()
+
+    monkeypatch.setattr(time, "perf_counter", fast_time)
+    runner = ConjectureRunner(
+        f, settings=settings(database=None, shrink_time_budget=None)
+    )
+    runner.run()
+    assert runner.exit_reason == ExitReason.finished
+
+
+def test_stops_shrinking_when_shrink_time_budget_runs_out(monkeypatch):
+    val = [0]
+
+    def fast_time():
+        val[0] += 1
+        return val[0]
+
+    def f(data):
+        if data.draw_bits(64) > 2**33:
+            data.mark_interesting()
+
+    monkeypatch.setattr(time, "perf_counter", fast_time)
+    runner = ConjectureRunner(
+        f, settings=settings(database=None, shrink_time_budget=20)
+    )
+    with capture_out() as o:
+        runner.run()
+    assert runner.exit_reason == ExitReason.very_slow_shrinking
+    assert "shrink_time_budget" in o.getvalue()
+    assert "PLEASE REPORT" not in o.getvalue()
+    assert "shrinking will resume" not in o.getvalue()
+    # We still report the best example found before running out of time
+    (result,) = runner.interesting_examples.values()
+    assert int_from_bytes(result.buffer) > 2**33
+
+
+
+@pytest.mark.parametrize(
+    "phases, resumes",
+    [(tuple(Phase), True), ((Phase.generate, Phase.shrink), False)],
+)
+def test_only_promises_to_resume_shrinking_if_it_can(phases, resumes, monkeypatch):
+    val = [0]
+
+    def fast_time():
+        val[0] += 1
+        return val[0]
+
+    def f(data):
+        if data.draw_bits(64) > 2**33:
+            data.mark_interesting()
+
+    monkeypatch.setattr(time, "perf_counter", fast_time)
+    runner = ConjectureRunner(
+        f,
+        settings=settings(
+            database=InMemoryExampleDatabase(), phases=phases, shrink_time_budget=20
+        ),
+        database_key=b"key",
+    )
+    with capture_out() as o:
+        runner.run()
+    assert runner.exit_reason == ExitReason.very_slow_shrinking
+    assert ("shrinking will resume" in o.getvalue()) == resumes
+
+def test_reports_shrink_progress_when_verbose():
+    def f(data):
+        if sum(data.draw_bits(8) for _ in range(10)) >= 10:
+            data.mark_interesting()
+
+    runner = ConjectureRunner(
+        f,
+        settings=settings(database=None, verbosity=Verbosity.verbose),
+        random=Random(0),
+    )
+    runner.cached_test_function([255] * 10)
+    with capture_out() as o:
+        runner.shrink_interesting_examples()
+    progress = re.findall(
+        r"Shrunk example from (\d+) to (\d+) bytes after (\d+) calls?",
+        o.getvalue(),
+    )
+    assert len(progress) == runner.shrinks
+    calls = [int(c) for _, _, c in progress]
+    assert calls == sorted(calls)
+    assert int(progress[0][0]) == 10
+    assert int(progress[-1][1]) == 10
+
+
+@pytest.mark.parametrize("budget", [10, None])
+def test_short_shrink_time_budget_runs_cheap_passes_first(budget, monkeypatch):
+    fixated = []
+    fixate_shrink_passes = Shrinker.fixate_shrink_passes
+
+    def record_fixate(self, passes):
+        fixated.append(passes)
+        return fixate_shrink_passes(self, passes)
+
+    monkeypatch.setattr(Shrinker, "fixate_shrink_passes", record_fixate)
+
+    def f(data):
+        if sum(data.draw_bits(8) for _ in range(10)) >= 100:
+            data.mark_interesting()
+
+    runner = ConjectureRunner(
+        f, settings=settings(database=None, shrink_time_budget=budget)
+    )
+    runner.cached_test_function([255] * 10)
+    runner.shrink_interesting_examples()
+    (result,) = runner.interesting_examples.values()
+    assert list(result.buffer) == [0] * 9 + [100]
+    if budget is None:
+        assert len(fixated) == 1
+    else:
+        assert len(fixated) == 2
+        assert "minimize_individual_blocks" in fixated[0]
+        assert len(fixated[0]) < len(fixated[1])
+
+
+def test_checkpoints_shrinking_when_stopped_early(monkeypatch):
+    monkeypatch.setattr(engine_module, "MAX_SHRINKS", 20)
+    db = InMemoryExampleDatabase()
+
+    def f(data):
+        if sum(data.draw_bits(8) for _ in range(20)) >= 100:
+            data.mark_interesting()
+
+    resumed = []
+    resume = Shrinker.resume
+
+    def record_resume(self, checkpoint):
+        result = resume(self, checkpoint)
+        resumed.append(result)
+        return result
+
+    monkeypatch.setattr(Shrinker, "resume", record_resume)
+
+    runner = ConjectureRunner(
+        f, settings=settings(database=db), database_key=b"key", random=Random(0)
+    )
+    runner.run()
+    assert runner.exit_reason == ExitReason.max_shrinks
+    (checkpoint,) = db.fetch(runner.shrink_checkpoint_key)
+    (buffer,) = db.fetch(runner.database_key)
+    assert decode_checkpoint(checkpoint)["buffer"] == buffer
+
+    for _ in range(100):
+        runner = ConjectureRunner(
+            f, settings=settings(database=db), database_key=b"key", random=Random(0)
+        )
+        runner.run()
+        assert resumed.pop()
+        if runner.exit_reason == ExitReason.finished:
+            break
+    assert runner.exit_reason == ExitReason.finished
+    assert not list(db.fetch(runner.shrink_checkpoint_key))
+    (result,) = runner.interesting_examples.values()
+    assert sum(result.buffer) == 100
+
+
+def test_does_not_checkpoint_shrinking_stopped_by_an_error(monkeypatch):
+    db = InMemoryExampleDatabase()
+
+    def shrink(self):
+        raise ValueError()
+
+    monkeypatch.setattr(Shrinker, "shrink", shrink)
+
+    def f(data):
+        if sum(data.draw_bits(8) for _ in range(20)) >= 100:
+            data.mark_interesting()
+
+    runner = ConjectureRunner(f, settings=settings(database=db), database_key=b"key")
+    with pytest.raises(ValueError):
+        runner.run()
+    assert not list(db.fetch(runner.shrink_checkpoint_key))
+
+
+def test_discards_shrink_checkpoints_of_fixed_bugs():
+    db = InMemoryExampleDatabase()
+    runner = ConjectureRunner(
+        lambda data: data.draw_bits(8),
+        settings=settings(database=db, max_examples=10),
+        database_key=b"key",
+    )
+    db.save(runner.shrink_checkpoint_key, b"not a checkpoint")
+    db.save(runner.shrink_checkpoint_key, bytes([0]) + b'{"buffer": "ff"}')
+    runner.run()
+    assert not list(db.fetch(runner.shrink_checkpoint_key))
+
+
+def test_stores_and_reuses_shrink_pass_statistics():
+    db = InMemoryExampleDatabase()
+
+    def f(data):
+        if sum(data.draw_bits(8) for _ in range(10)) >= 100:
+            data.mark_interesting()
+
+    runner = ConjectureRunner(
+        f, settings=settings(database=db), database_key=b"key", random=Random(0)
+    )
+    runner.run()
+    assert runner.pass_statistics
+    (stored,) = db.fetch(runner.pass_statistics_key)
+
+    # The next run starts with the stored statistics and adds to them
+    runner = ConjectureRunner(
+        lambda data: data.draw_bits(8),
+        settings=settings(database=db, max_examples=10),
+        database_key=b"key",
+    )
+    runner.run()
+    assert runner.pass_statistics
+    assert list(db.fetch(runner.pass_statistics_key)) == [stored]
+
+
+def test_ignores_invalid_shrink_pass_statistics():
+    db = InMemoryExampleDatabase()
+    runner = ConjectureRunner(
+        lambda data: data.draw_bits(8),
+        settings=settings(database=db, max_examples=10),
+        database_key=b"key",
+    )
+    db.save(runner.pass_statistics_key, b"not json")
+    db.save(runner.pass_statistics_key, b'{"pass": "not a pair"}')
+    runner.run()
+    assert runner.pass_statistics == {}
+
+
+def test_only_saves_shrink_pass_statistics_which_changed_meaningfully():
+    db = InMemoryExampleDatabase()
+    runner = ConjectureRunner(
+        lambda data: data.draw_bits(8),
+        settings=settings(database=db, max_examples=10),
+        database_key=b"key",
+    )
+    runner.run()
+    runner.pass_statistics = {"a": (10, 5), "b": (10, 1)}
+    runner.save_pass_statistics()
+    (stored,) = db.fetch(runner.pass_statistics_key)
+
+    # A few more calls which don't change the ranking aren't worth a write
+    runner.pass_statistics = {"a": (15, 7), "b": (15, 1)}
+    runner.save_pass_statistics()
+    assert list(db.fetch(runner.pass_statistics_key)) == [stored]
+
+    # But a new ranking is, as is twice as much evidence
+    for statistics in [{"a": (15, 1), "b": (15, 7)}, {"a": (30, 2), "b": (30, 9)}]:
+        runner.pass_statistics = statistics
+        runner.save_pass_statistics()
+        (new,) = db.fetch(runner.pass_statistics_key)
+        assert new != stored
+        stored = new
+
+
+def test_decays_shrink_pass_statistics(monkeypatch):
+    monkeypatch.setattr(engine_module, "MAX_PASS_STATISTICS_CALLS", 100)
+
+    @shrinking_from([255] * 10)
+    def shrinker(data):
+        if sum(data.draw_bits(8) for _ in range(10)) >= 100:
+            data.mark_interesting()
+
+    runner = shrinker.engine
+    runner.pass_statistics = {"minimize_individual_blocks": (95, 40)}
+    shrinker.fixate_shrink_passes(["minimize_individual_blocks"])
+    sp = shrinker.shrink_pass("minimize_individual_blocks")
+    assert sp.calls > 5
+    runner.record_pass_statistics(shrinker)
+    calls, progress = runner.pass_statistics[sp.name]
+    assert calls == (95 + sp.calls) // 2
+    assert progress == (40 + sp.shrinks + sp.deletions) // 2
+
+
 def test_dependent_block_pairs_can_lower_to_zero():
     @shrinking_from([1, 0, 1])
     def shrinker(data):
@@ -1234,7 +1672,7 @@ def test_populates_the_pareto_front():
 
         runner.run()
 
-        assert len(runner.pareto_front) == 2 ** 4
+        assert len(runner.pareto_front) == 2**4
 
 
 def test_pareto_front_contains_smallest_valid_when_not_targeting():
@@ -1276,7 +1714,7 @@ def test_pareto_front_contains_different_interesting_reasons():
 
         runner.run()
 
-        assert len(runner.pareto_front) == 2 ** 4
+        assert len(runner.pareto_front) == 2**4
 
 
 def test_database_contains_only_pareto_front():
@@ -1456,7 +1894,7 @@ def test_runs_optimisation_even_if_not_generating():
 
         runner.run()
 
-        assert runner.best_observed_targets["n"] == (2 ** 16) - 1
+        assert runner.best_observed_targets["n"] == (2**16) - 1
 
 
 def test_runs_optimisation_once_when_generating():
@@ -1541,6 +1979,26 @@ def test_does_result_for_reuse():
         assert calls[0] == 1
 
 
+def test_caches_result_for_extensions_of_the_buffer_read(monkeypatch):
+    def test(data):
+        data.draw_bits(8)
+
+    with deterministic_PRNG():
+        runner = ConjectureRunner(test, settings=TEST_SETTINGS)
+
+        d1 = runner.cached_test_function(b"\1\2")
+        assert d1.buffer == b"\1"
+
+        def simulate_test_function(data):
+            raise AssertionError("Unexpected cache miss")
+
+        monkeypatch.setattr(
+            runner.tree, "simulate_test_function", simulate_test_function
+        )
+        assert runner.cached_test_function(b"\1\3") is d1
+        assert runner.cached_test_function(b"\1") is d1
+
+
 def test_does_not_cache_overrun_if_extending():
     def test(data):
         data.draw_bits(64)
@@ -1594,3 +2052,133 @@ def test_can_be_set_to_ignore_limits():
             runner.cached_test_function([c])
 
         assert runner.tree.is_exhausted
+
+
+@pytest.mark.skipif(not can_use_workers(), reason="requires fork")
+def test_parallel_generation_counts_worker_results():
+    def test(data):
+        data.draw_bits(64)
+
+    with deterministic_PRNG():
+        runner = ConjectureRunner(
+            test, settings=settings(TEST_SETTINGS, max_examples=200, workers=4)
+        )
+        runner.run()
+
+    assert runner.valid_examples == 200
+    assert runner.exit_reason == ExitReason.max_examples
+    assert not runner.interesting_examples
+
+
+@pytest.mark.skipif(not can_use_workers(), reason="requires fork")
+def test_parallel_generation_caches_worker_results():
+    seen = []
+
+    def test(data):
+        seen.append(data.draw_bits(8))
+
+    with deterministic_PRNG():
+        runner = ConjectureRunner(
+            test, settings=settings(TEST_SETTINGS, max_examples=1000, workers=3)
+        )
+        runner.run()
+
+    assert runner.tree.is_exhausted
+    # Worker processes have their own copy of ``seen``, so any value missing
+    # from it was only run in a worker.
+    worker_only = set(range(256)) - set(seen)
+    assert worker_only
+    call_count = runner.call_count
+    for n in worker_only:
+        assert runner.cached_test_function([n]).status == Status.VALID
+    assert runner.call_count == call_count
+    assert not worker_only.intersection(seen)
+
+
+@pytest.mark.skipif(not can_use_workers(), reason="requires fork")
+def test_speculative_runs_are_counted_once(monkeypatch):
+    def test(data):
+        if data.draw_bits(8) == 3:
+            data.mark_interesting()
+
+    counts = []
+
+    def generate_new_examples(runner):
+        statuses = runner.run_speculatively([[i] for i in range(1, 5)])
+        counts.append(runner.call_count)
+        for i in range(1, 5):
+            runner.cached_test_function([i])
+        counts.append(runner.call_count)
+        return statuses
+
+    monkeypatch.setattr(
+        ConjectureRunner, "generate_new_examples", generate_new_examples
+    )
+    runner = ConjectureRunner(
+        test, settings=settings(TEST_SETTINGS, workers=4, phases=[Phase.generate])
+    )
+    runner.run()
+
+    # The three valid buffers are only run in the workers, and the
+    # interesting one is only run here.
+    assert counts == [3, 4]
+
+
+@pytest.mark.skipif(not can_use_workers(), reason="requires fork")
+def test_parallel_generation_reruns_failures_in_main_process():
+    seen = []
+
+    def test(data):
+        n = data.draw_bits(8)
+        seen.append(n)
+        if n >= 200:
+            data.mark_interesting()
+
+    with deterministic_PRNG():
+        runner = ConjectureRunner(
+            test, settings=settings(TEST_SETTINGS, max_examples=1000, workers=4)
+        )
+        runner.run()
+
+    (last_data,) = runner.interesting_examples.values()
+    assert last_data.buffer == bytes([200])
+    # Worker processes have their own copy of ``seen``, so anything we see
+    # here must have been run by the main process.
+    assert len(seen) < runner.call_count
+
+
+@pytest.mark.skipif(not can_use_workers(), reason="requires fork")
+def test_parallel_generation_exhausts_the_tree():
+    def test(data):
+        data.draw_bits(8)
+
+    with deterministic_PRNG():
+        runner = ConjectureRunner(
+            test, settings=settings(TEST_SETTINGS, max_examples=1000, workers=3)
+        )
+        runner.run()
+
+    assert runner.tree.is_exhausted
+    assert runner.exit_reason == ExitReason.finished
+
+
+@pytest.mark.skipif(not can_use_workers(), reason="requires fork")
+def test_worker_pool_sets_the_test_function_only_in_workers():
+    def test(data):
+        data.draw_bits(8)
+
+    with worker_pool(test, 2) as pool:
+        assert parallel._worker_test_function is None
+        results = run_in_workers(pool, [(b"\1", 10, i) for i in range(10)])
+
+    assert [r.buffer for r in results] == [b"\1"] * 10
+
+
+@pytest.mark.skipif(not can_use_workers(), reason="requires fork")
+def test_worker_pool_does_not_hide_keyboard_interrupt():
+    def test(data):
+        raise KeyboardInterrupt
+
+    with worker_pool(test, 2) as pool:
+        with pytest.raises(KeyboardInterrupt):
+            run_in_workers(pool, [(b"", 10, 0)])
@@ -0,0 +1,99 @@
+# This file is part of Hypothesis, which may be found at
+# https://github.com/HypothesisWorks/hypothesis/
+#
+# Most of this work is copyright (C) 2013-2021 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by others. See
+# CONTRIBUTING.rst for a full list of people who may hold copyright, and
+# consult the git log if you need to determine who owns an individual
+# contribution.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+#
+# END HEADER
+
+from hypothesis import given, strategies as st
+from hypothesis.internal.conjecture.data import Overrun
+from hypothesis.internal.conjecture.prefixcache import (
+    PrefixCache,
+    common_prefix_length,
+)
+
+
+def count_nodes(node):
+    return 1 + sum(count_nodes(c) for c in node.children.values())
+
+
+def count_bytes(node):
+    return len(node.label) + sum(count_bytes(c) for c in node.children.values())
+
+
+def expected_find(cache, buffer):
+    for key in sorted(cache, key=len):
+        if key == buffer or (buffer.startswith(key) and cache[key] is not Overrun):
+            return cache[key]
+    return None
+
+
+@given(st.binary(), st.binary(), st.integers(0, 10))
+def test_common_prefix_length(label, buffer, start):
+    start = min(start, len(buffer))
+    n = common_prefix_length(label, buffer, start)
+    assert buffer[start : start + n] == label[:n]
+    assert n == len(label) or start + n == len(buffer) or buffer[start + n] != label[n]
+
+
+def test_finds_results_for_extensions_of_keys():
+    cache = PrefixCache(10)
+    cache[b"\0\1"] = "a"
+    assert cache.find(b"\0\1") == "a"
+    assert cache.find(b"\0\1\2") == "a"
+    assert cache.find(b"\0") is None
+    assert cache.find(b"\1\1") is None
+    assert (cache.hits, cache.prefix_hits, cache.misses) == (1, 1, 2)
+
+
+def test_does_not_find_overrun_for_extensions():
+    cache = PrefixCache(10)
+    cache[b"\0"] = Overrun
+    assert cache.find(b"\0") is Overrun
+    assert cache.find(b"\0\0") is None
+    cache[b"\0\0"] = "a"
+    assert cache.find(b"\0\0\0") == "a"
+
+
+def test_finds_shortest_key_first():
+    cache = PrefixCache(10)
+    cache[b"\0\0\0"] = "long"
+    cache[b"\0"] = "short"
+    assert cache.find(b"\0\0\0\0") == "short"
+
+
+def test_pinned_keys_are_still_found():
+    cache = PrefixCache(2)
+    cache[b"\0"] = "a"
+    cache.pin(b"\0")
+    cache[b"\1"] = "b"
+    cache[b"\2"] = "c"
+    assert cache.find(b"\0\0") == "a"
+    assert cache.find(b"\1\0") is None
+    assert cache.find(b"\2\0") == "c"
+
+
+@given(
+    st.integers(1, 5),
+    st.lists(st.tuples(st.binary(max_size=4), st.booleans())),
+    st.lists(st.binary(max_size=5)),
+)
+def test_agrees_with_linear_search_and_keeps_trie_compact(size, writes, reads):
+    cache = PrefixCache(size)
+    for i, (key, overrun) in enumerate(writes):
+        cache[key] = Overrun if overrun else i
+        assert cache.nodes == count_nodes(cache.root)
+        assert cache.stored_bytes == count_bytes(cache.root)
+    for buffer in reads + [k for k, _ in writes]:
+        assert cache.find(buffer) == expected_find(cache, buffer)
+    cache.clear()
+    assert cache.nodes == 1
+    assert cache.find(b"") is None
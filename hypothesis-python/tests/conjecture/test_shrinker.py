@@ -17,9 +17,12 @@ import time
 
 import pytest
 
+from hypothesis import settings
 from hypothesis.internal.compat import int_to_bytes
 from hypothesis.internal.conjecture import floats as flt
+from hypothesis.internal.conjecture.data import Status
 from hypothesis.internal.conjecture.engine import ConjectureRunner
+from hypothesis.internal.conjecture.parallel import can_use_workers
 from hypothesis.internal.conjecture.shrinker import (
     Shrinker,
     ShrinkPass,
@@ -28,8 +31,14 @@ from hypothesis.internal.conjecture.shrinker import (
 )
 from hypothesis.internal.conjecture.shrinking import Float
 from hypothesis.internal.conjecture.utils import Sampler
+from hypothesis.internal.entropy import deterministic_PRNG
 
-from tests.conjecture.common import SOME_LABEL, run_to_buffer, shrinking_from
+from tests.conjecture.common import (
+    SOME_LABEL,
+    TEST_SETTINGS,
+    run_to_buffer,
+    shrinking_from,
+)
 
 
 @pytest.mark.parametrize("n", [1, 5, 8, 15])
@@ -550,3 +559,107 @@ def test_can_simultaneously_lower_non_duplicated_nearby_blocks(n_gap):
     shrinker.fixate_shrink_passes(["lower_blocks_together"])
 
     assert list(shrinker.buffer) == [1, 0] + [0] * n_gap + [0, 1]
+
+
+@pytest.mark.skipif(not can_use_workers(), reason="requires fork")
+def test_can_pass_to_descendants_speculatively(monkeypatch):
+    def tree(data):
+        data.start_example(1)
+        n = data.draw_bits(1)
+        label = data.draw_bits(8)
+        if n:
+            tree(data)
+            tree(data)
+        data.stop_example(1)
+        return label
+
+    initial = bytes([1, 10, 1, 0, 0, 0, 0, 10, 0, 0])
+    target = bytes([0, 10])
+
+    good = {initial, target}
+
+    def f(data):
+        tree(data)
+        if bytes(data.buffer) in good:
+            data.mark_interesting()
+
+    shrinkers = []
+
+    def shrink(self):
+        shrinkers.append(self)
+        self.fixate_shrink_passes(["pass_to_descendant"])
+
+    monkeypatch.setattr(Shrinker, "shrink", shrink)
+    monkeypatch.setattr(
+        ConjectureRunner,
+        "generate_new_examples",
+        lambda runner: runner.cached_test_function(initial),
+    )
+
+    runner = ConjectureRunner(f, settings=settings(TEST_SETTINGS, workers=4))
+    runner.run()
+
+    (shrinker,) = shrinkers
+    assert shrinker.shrink_target.buffer == target
+    assert shrinker.speculative_calls > 0
+    assert 0 <= shrinker.speculative_wasted < shrinker.speculative_calls
+
+
+def test_resuming_from_a_checkpoint_restores_pass_progress():
+    @shrinking_from([255] * 10)
+    def shrinker(data):
+        if sum(data.draw_bits(8) for _ in range(10)) >= 100:
+            data.mark_interesting()
+
+    passes = ["minimize_individual_blocks", block_program("X")]
+    shrinker.fixate_shrink_passes(passes)
+    checkpoint = shrinker.checkpoint()
+
+    resumed = shrinker.engine.new_shrinker(
+        shrinker.shrink_target, lambda d: d.status == Status.INTERESTING
+    )
+    assert resumed.resume(checkpoint)
+    for name in reversed(passes):
+        sp = resumed.shrink_pass(name)
+        assert sp.last_prefix == shrinker.shrink_pass(name).last_prefix
+        assert resumed.shrink_pass_choice_trees[sp].exhausted
+
+
+def test_cannot_resume_from_a_checkpoint_of_another_target():
+    @shrinking_from([255] * 10)
+    def shrinker(data):
+        if sum(data.draw_bits(8) for _ in range(10)) >= 100:
+            data.mark_interesting()
+
+    checkpoint = shrinker.checkpoint()
+    shrinker.fixate_shrink_passes(["minimize_individual_blocks"])
+    assert not shrinker.resume(checkpoint)
+    assert not shrinker.resume(b"")
+    assert not shrinker.resume(bytes([0]) + b"not json")
+
+
+def test_runs_the_most_productive_passes_first(monkeypatch):
+    @shrinking_from([255] * 10)
+    def shrinker(data):
+        if sum(data.draw_bits(8) for _ in range(10)) >= 100:
+            data.mark_interesting()
+
+    shrinker.engine.pass_statistics = {
+        "minimize_individual_blocks": (10, 50),
+        "pass_to_descendant": (100, 0),
+    }
+    lowering = shrinker.shrink_pass("minimize_individual_blocks")
+    descendant = shrinker.shrink_pass("pass_to_descendant")
+    assert lowering.yield_per_call > descendant.yield_per_call
+
+    ran = []
+    step = ShrinkPass.step
+
+    def record_step(self, *args, **kwargs):
+        ran.append(self.name)
+        return step(self, *args, **kwargs)
+
+    monkeypatch.setattr(ShrinkPass, "step", record_step)
+    shrinker.fixate_shrink_passes([descendant.name, lowering.name])
+    assert ran[0] == lowering.name
+    assert descendant.name in ran
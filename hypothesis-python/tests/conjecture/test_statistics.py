@@ -0,0 +1,88 @@
+# This file is part of Hypothesis, which may be found at
+# https://github.com/HypothesisWorks/hypothesis/
+#
+# Most of this work is copyright (C) 2013-2021 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by others. See
+# CONTRIBUTING.rst for a full list of people who may hold copyright, and
+# consult the git log if you need to determine who owns an individual
+# contribution.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+#
+# END HEADER
+
+import json
+from random import Random
+
+import pytest
+
+from hypothesis import given, strategies as st
+from hypothesis.internal.conjecture import statistics
+from hypothesis.internal.conjecture.statistics import (
+    GAMMA,
+    PhaseStatistics,
+    RuntimeHistogram,
+    value_at_rank,
+)
+
+
+@given(st.lists(st.floats(0, 1e6), min_size=1))
+def test_histogram_ranks_are_accurate(values):
+    histogram = RuntimeHistogram()
+    for v in values:
+        histogram.add(v)
+    summary = histogram.as_list()
+    assert sum(c for _, c in summary) == len(values) == histogram.count
+    for rank, exact in enumerate(sorted(values)):
+        approx = value_at_rank(summary, rank)
+        assert abs(approx - exact) <= exact * (GAMMA - 1) * 1.0001
+
+
+def test_histogram_is_exact_for_identical_values():
+    histogram = RuntimeHistogram()
+    for _ in range(10):
+        histogram.add(0.529)
+    assert histogram.as_list() == [[0.529, 10]]
+
+
+def test_histogram_rank_out_of_range():
+    histogram = RuntimeHistogram()
+    histogram.add(1.0)
+    with pytest.raises(IndexError):
+        value_at_rank(histogram.as_list(), 1)
+
+
+def test_histogram_has_bounded_size(monkeypatch):
+    monkeypatch.setattr(statistics, "MAX_BUCKETS", 10)
+    histogram = RuntimeHistogram()
+    for i in range(100):
+        histogram.add(2.0 ** -i)
+    assert len(histogram.as_list()) == 10
+    assert value_at_rank(histogram.as_list(), 99) == pytest.approx(1, rel=0.01)
+
+
+def test_histogram_merges_the_lowest_buckets_in_any_order(monkeypatch):
+    monkeypatch.setattr(statistics, "MAX_BUCKETS", 10)
+    histogram = RuntimeHistogram()
+    values = [2.0 ** i for i in range(-50, 50)]
+    Random(0).shuffle(values)
+    for v in values:
+        histogram.add(v)
+    summary = histogram.as_list()
+    assert len(summary) == 10
+    assert sum(c for _, c in summary) == 100
+    assert [v for v, _ in summary[1:]] == [2.0 ** i for i in range(41, 50)]
+
+
+def test_phase_statistics_are_json_compatible():
+    stats = PhaseStatistics()
+    stats.record(status="valid", runtime=0.5, drawtime=0.25, events={"a", "b"})
+    stats.record(status="invalid", runtime=0.0, drawtime=0.0, events={"a"})
+    result = stats.as_dict()
+    assert json.loads(json.dumps(result)) == result
+    assert result["num-test-cases"] == 2
+    assert result["statuses"] == {"valid": 1, "invalid": 1}
+    assert result["mean-drawtime-fraction"] == 0.25
+    assert result["events"] == {"a": 2, "b": 1}
@@ -14,12 +14,15 @@
 # END HEADER
 
 import itertools
+from random import Random
 
 import pytest
 
 from hypothesis import given, strategies as st
 from hypothesis.errors import Frozen, InvalidArgument
+from hypothesis.internal.compat import bit_length
 from hypothesis.internal.conjecture.data import (
+    DRAW_BYTES_LABEL,
     MAX_DEPTH,
     ConjectureData,
     DataObserver,
@@ -87,6 +90,36 @@ def test_drawing_zero_bits_is_free():
     assert x.draw_bits(0) == 0
 
 
+@pytest.mark.parametrize("n", [1, 7, 8, 9, 64, 1024])
+def test_draws_from_the_prefix_are_masked_to_n_bits(n):
+    x = ConjectureData.for_buffer(bytes([255]) * 128)
+    assert x.draw_bits(n) == (1 << n) - 1
+    assert x.index == len(x.buffer) == (n + 7) // 8
+
+
+@pytest.mark.parametrize("n", [4, 12, 60])
+def test_draws_past_the_end_of_the_prefix_are_masked_to_n_bits(n):
+    x = ConjectureData(max_length=8, prefix=b"\xff", random=Random(0))
+    result = x.draw_bits(n)
+    assert result >> max(n - 4, 0) == 15
+    assert bit_length(result) <= n
+    assert x.buffer[0] == 255 >> (8 * len(x.buffer) - n)
+
+
+@pytest.mark.parametrize("n", [1, 8, 64, 1024])
+def test_forced_draws_are_written_to_the_buffer(n):
+    x = ConjectureData(max_length=1024, prefix=b"", random=Random(0))
+    assert x.draw_bits(n, forced=(1 << n) - 1) == (1 << n) - 1
+    assert int.from_bytes(x.buffer, "big") == (1 << n) - 1
+    assert x.forced_indices == set(range(len(x.buffer)))
+
+
+def test_cannot_force_more_bits_than_are_drawn():
+    x = ConjectureData(max_length=8, prefix=b"", random=Random(0))
+    with pytest.raises(AssertionError):
+        x.draw_bits(8, forced=256)
+
+
 def test_can_mark_invalid():
     x = ConjectureData.for_buffer(b"")
     with pytest.raises(StopTest):
@@ -443,6 +476,37 @@ def test_child_indices():
         assert ex in d.examples[ex.parent].children
 
 
+def test_example_indexes_by_label_and_block():
+    d = ConjectureData.for_buffer(bytes(4))
+
+    d.start_example(1)  # examples[1]
+    d.draw_bits(1)  # examples[2]
+    d.start_example(2)  # examples[3]
+    d.draw_bits(1)  # examples[4]
+    d.stop_example()
+    d.stop_example()
+    d.start_example(1)  # examples[5]
+    d.draw_bits(1)  # examples[6]
+    d.stop_example()
+    d.freeze()
+
+    examples = d.examples
+    by_label = {
+        examples.labels[l]: list(indices)
+        for l, indices in enumerate(examples.examples_by_label_index)
+    }
+    assert by_label[1] == [1, 5]
+    assert by_label[2] == [3]
+    assert by_label[DRAW_BYTES_LABEL] == [2, 4, 6]
+    for l, indices in enumerate(examples.examples_by_label_index):
+        assert all(examples[i].label == examples.labels[l] for i in indices)
+
+    assert list(examples.block_examples) == [2, 4, 6]
+    for block, i in zip(d.blocks, examples.block_examples):
+        assert examples[i].start == block.start
+        assert examples[i].end == block.end
+
+
 def test_example_equality():
     d = ConjectureData.for_buffer(bytes(2))
 
@@ -19,10 +19,25 @@ import tempfile
 import time
 import unicodedata
 
+import pytest
+
 from hypothesis import assume, given, strategies as st
 from hypothesis.internal import charmap as cm
 
 
+@pytest.fixture
+def without_bundled_charmap(monkeypatch):
+    # Tests of our on-disk cache need to stop us using the bundled charmap,
+    # or we would never look at the cache.
+    monkeypatch.setattr(
+        cm, "bundled_charmap_file", lambda: os.path.join("nonexistent", "charmap")
+    )
+    saved = cm._charmap
+    cm._charmap = None
+    yield
+    cm._charmap = saved
+
+
 def test_charmap_contains_all_unicode():
     n = 0
     for vs in cm.charmap().values():
@@ -85,6 +100,7 @@ def test_exclude_only_excludes_from_that_category(cat, i):
     assert any(a <= i <= b for a, b in intervals)
 
 
+@pytest.mark.usefixtures("without_bundled_charmap")
 def test_reload_charmap():
     x = cm.charmap()
     assert x is cm.charmap()
@@ -94,6 +110,7 @@ def test_reload_charmap():
     assert x == y
 
 
+@pytest.mark.usefixtures("without_bundled_charmap")
 def test_recreate_charmap():
     x = cm.charmap()
     assert x is cm.charmap()
@@ -104,6 +121,7 @@ def test_recreate_charmap():
     assert x == y
 
 
+@pytest.mark.usefixtures("without_bundled_charmap")
 def test_uses_cached_charmap():
     cm.charmap()
 
@@ -147,6 +165,7 @@ def test_successive_union():
     assert x == ((0, sys.maxunicode),)
 
 
+@pytest.mark.usefixtures("without_bundled_charmap")
 def test_can_handle_race_between_exist_and_create(monkeypatch):
     x = cm.charmap()
     cm._charmap = None
@@ -156,6 +175,7 @@ def test_can_handle_race_between_exist_and_create(monkeypatch):
     assert x == y
 
 
+@pytest.mark.usefixtures("without_bundled_charmap")
 def test_exception_in_write_does_not_lead_to_broken_charmap(monkeypatch):
     def broken(*args, **kwargs):
         raise ValueError()
@@ -168,6 +188,7 @@ def test_exception_in_write_does_not_lead_to_broken_charmap(monkeypatch):
     cm.charmap()
 
 
+@pytest.mark.usefixtures("without_bundled_charmap")
 def test_regenerate_broken_charmap_file():
     cm.charmap()
     file_loc = cm.charmap_file()
@@ -183,6 +204,7 @@ def test_exclude_characters_are_included_in_key():
     assert cm.query() != cm.query(exclude_characters="0")
 
 
+@pytest.mark.usefixtures("without_bundled_charmap")
 def test_error_writing_charmap_file_is_suppressed(monkeypatch):
     def broken_mkstemp(dir):
         raise RuntimeError()
@@ -199,3 +221,46 @@ def test_error_writing_charmap_file_is_suppressed(monkeypatch):
         cm.charmap()
     finally:
         cm._charmap = saved
+
+
+def test_bundled_charmap_matches_unicodedata():
+    if not os.path.exists(cm.bundled_charmap_file()):
+        pytest.skip(f"No charmap bundled for Unicode {unicodedata.unidata_version}")
+    assert cm._read_charmap_file(cm.bundled_charmap_file()) == cm._compute_charmap()
+
+
+def test_charmap_file_round_trips(tmp_path):
+    path = str(tmp_path / "charmap.bin")
+    cm._write_charmap_file(path, cm.charmap())
+    assert cm._read_charmap_file(path) == cm.charmap()
+
+
+def test_rejects_truncated_charmap_file(tmp_path):
+    path = str(tmp_path / "charmap.bin")
+    cm._write_charmap_file(path, cm.charmap())
+    with open(path, "rb") as f:
+        contents = f.read()
+    with open(path, "wb") as f:
+        f.write(contents[:-8])
+    with pytest.raises(ValueError):
+        cm._read_charmap_file(path)
+
+
+def test_charmap_files_round_trip(tmp_path):
+    path = str(tmp_path / "charmap.bin")
+    charmap = {"Lu": ((65, 90),), "Zs": ((32, 32), (160, 160))}
+    cm._write_charmap_file(path, charmap)
+    loaded = cm._read_charmap_file(path)
+    assert loaded.interval_count("Zs") == 2
+    assert loaded == charmap
+
+
+def test_rejects_truncated_charmap_files(tmp_path):
+    path = str(tmp_path / "charmap.bin")
+    cm._write_charmap_file(path, {"Lu": ((65, 90),)})
+    with open(path, "rb") as f:
+        data = f.read()
+    with open(path, "wb") as f:
+        f.write(data[:-4])
+    with pytest.raises(ValueError):
+        cm._read_charmap_file(path)
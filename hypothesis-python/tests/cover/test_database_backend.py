@@ -19,12 +19,15 @@ import pytest
 
 from hypothesis import given, settings
 from hypothesis.database import (
+    BufferedExampleDatabase,
     DirectoryBasedExampleDatabase,
     ExampleDatabase,
     InMemoryExampleDatabase,
     MultiplexedDatabase,
     ReadOnlyDatabase,
+    SQLiteExampleDatabase,
 )
+from hypothesis.errors import InvalidArgument
 from hypothesis.strategies import binary, lists, tuples
 
 small_settings = settings(max_examples=50)
@@ -74,12 +77,18 @@ def test_does_not_error_when_fetching_when_not_exist(tmpdir):
     db.fetch(b"foo")
 
 
-@pytest.fixture(scope="function", params=["memory", "directory"])
+@pytest.fixture(
+    scope="function", params=["memory", "directory", "sqlite", "buffered"]
+)
 def exampledatabase(request, tmpdir):
     if request.param == "memory":
         return ExampleDatabase()
     if request.param == "directory":
         return DirectoryBasedExampleDatabase(str(tmpdir.join("examples")))
+    if request.param == "sqlite":
+        return SQLiteExampleDatabase(str(tmpdir.join("examples.sqlite3")))
+    if request.param == "buffered":
+        return BufferedExampleDatabase(InMemoryExampleDatabase())
     assert False
 
 
@@ -115,6 +124,29 @@ def test_an_absent_value_is_present_after_it_moves_to_self(exampledatabase):
     assert next(exampledatabase.fetch(b"a")) == b"b"
 
 
+def test_can_save_and_fetch_many(exampledatabase):
+    exampledatabase.save_many([(b"a", b"1"), (b"a", b"2"), (b"b", b"3")])
+    fetched = exampledatabase.fetch_many([b"a", b"b", b"c"])
+    assert {k: set(v) for k, v in fetched.items()} == {
+        b"a": {b"1", b"2"},
+        b"b": {b"3"},
+        b"c": set(),
+    }
+
+
+def test_can_delete_many(exampledatabase):
+    exampledatabase.save_many([(b"a", b"1"), (b"a", b"2"), (b"b", b"3")])
+    exampledatabase.delete_many([(b"a", b"1"), (b"b", b"3"), (b"c", b"4")])
+    assert set(exampledatabase.fetch(b"a")) == {b"2"}
+    assert set(exampledatabase.fetch(b"b")) == set()
+
+
+def test_bulk_operations_accept_empty_iterables(exampledatabase):
+    exampledatabase.save_many([])
+    exampledatabase.delete_many([])
+    assert exampledatabase.fetch_many([]) == {}
+
+
 def test_two_directory_databases_can_interact(tmpdir):
     path = str(tmpdir)
     db1 = DirectoryBasedExampleDatabase(path)
@@ -126,6 +158,63 @@ def test_two_directory_databases_can_interact(tmpdir):
     assert sorted(db1.fetch(b"foo")) == [b"bar", b"baz"]
 
 
+def test_two_sqlite_databases_can_interact(tmpdir):
+    path = str(tmpdir.join("examples.sqlite3"))
+    db1 = SQLiteExampleDatabase(path)
+    db2 = SQLiteExampleDatabase(path)
+    db1.save(b"foo", b"bar")
+    assert list(db2.fetch(b"foo")) == [b"bar"]
+    db2.save(b"foo", b"bar")
+    db2.save(b"foo", b"baz")
+    assert sorted(db1.fetch(b"foo")) == [b"bar", b"baz"]
+
+
+def test_sqlite_batches_are_only_visible_after_commit(tmpdir):
+    path = str(tmpdir.join("examples.sqlite3"))
+    db1 = SQLiteExampleDatabase(path)
+    db2 = SQLiteExampleDatabase(path)
+    with db1.batch():
+        db1.save(b"foo", b"bar")
+        with db1.batch():
+            db1.move(b"foo", b"baz", b"bar")
+        assert list(db2.fetch(b"baz")) == []
+    assert list(db2.fetch(b"foo")) == []
+    assert list(db2.fetch(b"baz")) == [b"bar"]
+
+
+def test_sqlite_batches_are_rolled_back_on_error(tmpdir):
+    db = SQLiteExampleDatabase(str(tmpdir.join("examples.sqlite3")))
+    db.save(b"foo", b"bar")
+    with pytest.raises(ValueError):
+        with db.batch():
+            db.save(b"foo", b"baz")
+            with db.batch():
+                db.delete(b"foo", b"bar")
+            raise ValueError
+    assert list(db.fetch(b"foo")) == [b"bar"]
+    db.save(b"foo", b"baz")
+    assert sorted(db.fetch(b"foo")) == [b"bar", b"baz"]
+
+
+def test_sqlite_can_migrate_from_directory_database(tmpdir):
+    directory = DirectoryBasedExampleDatabase(str(tmpdir.join("examples")))
+    directory.save(b"foo", b"bar")
+    directory.save(b"foo", b"baz")
+    directory.save(b"qux", b"")
+    db = SQLiteExampleDatabase(str(tmpdir.join("examples.sqlite3")))
+    db.save(b"foo", b"bar")
+    db.migrate_from(directory)
+    assert sorted(db.fetch(b"foo")) == [b"bar", b"baz"]
+    assert list(db.fetch(b"qux")) == [b""]
+    assert sorted(directory.fetch(b"foo")) == [b"bar", b"baz"]
+
+
+def test_sqlite_can_only_migrate_from_directory_database(tmpdir):
+    db = SQLiteExampleDatabase(str(tmpdir.join("examples.sqlite3")))
+    with pytest.raises(InvalidArgument):
+        db.migrate_from(InMemoryExampleDatabase())
+
+
 def test_can_handle_disappearing_files(tmpdir, monkeypatch):
     path = str(tmpdir)
     db = DirectoryBasedExampleDatabase(path)
@@ -147,6 +236,9 @@ def test_readonly_db_is_not_writable():
     wrapped.save(b"key", b"value3")
     assert set(wrapped.fetch(b"key")) == {b"value", b"value2"}
     assert set(wrapped.fetch(b"key2")) == set()
+    wrapped.save_many([(b"key", b"value4")])
+    wrapped.delete_many([(b"key", b"value")])
+    assert set(wrapped.fetch_many([b"key"])[b"key"]) == {b"value", b"value2"}
 
 
 def test_multiplexed_dbs_read_and_write_all():
@@ -166,3 +258,69 @@ def test_multiplexed_dbs_read_and_write_all():
     multi.delete(b"c", b"cc")
     for db in (a, b, multi):
         assert set(db.fetch(b"c")) == set()
+    multi.save_many([(b"d", b"dd")])
+    assert multi.fetch_many([b"b", b"d"]) == {b"b": got, b"d": [b"dd"]}
+    multi.delete_many([(b"b", b"aa"), (b"d", b"dd")])
+    for db in (a, b, multi):
+        assert set(db.fetch(b"d")) == set()
+    assert set(multi.fetch(b"b")) == {b"bb"}
+
+
+def test_buffered_db_only_writes_on_flush():
+    inner = InMemoryExampleDatabase()
+    buffered = BufferedExampleDatabase(inner)
+    inner.save(b"a", b"old")
+    buffered.save(b"a", b"new")
+    buffered.delete(b"a", b"old")
+    assert set(buffered.fetch(b"a")) == {b"new"}
+    assert set(inner.fetch(b"a")) == {b"old"}
+    buffered.flush()
+    assert set(inner.fetch(b"a")) == {b"new"}
+
+
+def test_buffered_db_coalesces_save_then_delete():
+    inner = InMemoryExampleDatabase()
+    buffered = BufferedExampleDatabase(inner)
+    buffered.save(b"a", b"1")
+    buffered.move(b"a", b"b", b"1")
+    buffered.delete(b"b", b"1")
+    assert buffered._pending == {(b"a", b"1"): False, (b"b", b"1"): False}
+    buffered.flush()
+    assert buffered._pending == {}
+    assert not any(inner.data.values())
+
+
+def test_buffered_db_keeps_pending_writes_if_flush_fails():
+    class UnavailableDatabase(InMemoryExampleDatabase):
+        available = False
+
+        def save_many(self, items):
+            if not self.available:
+                raise OSError
+            super().save_many(items)
+
+    inner = UnavailableDatabase()
+    buffered = BufferedExampleDatabase(inner)
+    buffered.save(b"a", b"1")
+    with pytest.raises(OSError):
+        buffered.flush()
+    assert buffered._pending == {(b"a", b"1"): True}
+    inner.available = True
+    buffered.flush()
+    assert set(inner.fetch(b"a")) == {b"1"}
+
+
+def test_buffered_db_flushes_when_too_many_writes_are_pending():
+    inner = InMemoryExampleDatabase()
+    buffered = BufferedExampleDatabase(inner, max_pending=3)
+    buffered.save_many([(b"a", b"1"), (b"a", b"2")])
+    assert not list(inner.fetch(b"a"))
+    buffered.save(b"a", b"3")
+    assert set(inner.fetch(b"a")) == {b"1", b"2", b"3"}
+
+
+def test_buffered_db_flushes_after_interval():
+    inner = InMemoryExampleDatabase()
+    buffered = BufferedExampleDatabase(inner, flush_interval=0)
+    buffered.save(b"a", b"1")
+    assert set(inner.fetch(b"a")) == {b"1"}
@@ -0,0 +1,139 @@
+# This file is part of Hypothesis, which may be found at
+# https://github.com/HypothesisWorks/hypothesis/
+#
+# Most of this work is copyright (C) 2013-2021 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by others. See
+# CONTRIBUTING.rst for a full list of people who may hold copyright, and
+# consult the git log if you need to determine who owns an individual
+# contribution.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+#
+# END HEADER
+
+import math
+import operator
+from functools import partial
+
+import pytest
+
+from hypothesis import given, strategies as st
+from hypothesis.errors import InvalidArgument
+from hypothesis.internal.filtering import integer_bounds, length_bounds
+from hypothesis.strategies._internal.numbers import BoundedIntStrategy
+from hypothesis.strategies._internal.strategies import FilteredStrategy
+
+from tests.common.debug import minimal
+
+
+@pytest.mark.parametrize(
+    "predicate, bounds",
+    [
+        (lambda x: x > 0, (1, None)),
+        (lambda x: x >= 0.5, (1, None)),
+        (lambda x: x < -2.5, (None, -3)),
+        (lambda x: 0 <= x < 10, (0, 9)),
+        (lambda x: 10 >= x, (None, 10)),
+        (lambda x: x == 3, (None, None)),
+        (lambda x: x > 0 and x <= 7 and x != 3, (1, 7)),
+        (lambda x: x > 0 or x < -10, (None, None)),
+        (lambda x: x > math.pi, (None, None)),
+        (lambda x, y=1: x > 0, (None, None)),
+        (lambda x: x > float("inf"), (None, None)),
+        (partial(operator.lt, 0), (1, None)),
+        (partial(operator.ge, 5), (None, 5)),
+        (abs, (None, None)),
+    ],
+)
+def test_integer_bounds(predicate, bounds):
+    assert integer_bounds(predicate) == bounds
+
+
+@pytest.mark.parametrize(
+    "predicate, bounds",
+    [
+        (bool, (1, None)),
+        (str.isidentifier, (1, None)),
+        (str.isascii, (None, None)),
+        (lambda s: s, (1, None)),
+        (lambda s: len(s) <= 3, (None, 3)),
+        (lambda s: 2 < len(s) < 5, (3, 4)),
+        (lambda s: len(s) > -1, (None, None)),
+        (lambda s: len(s.strip()) > 2, (None, None)),
+    ],
+)
+def test_length_bounds(predicate, bounds):
+    assert length_bounds(predicate) == bounds
+
+
+@pytest.mark.parametrize(
+    "strategy, predicate, start, end",
+    [
+        (st.integers(), lambda x: 0 < x < 100, 1, 99),
+        (st.integers(0, 1000), lambda x: x >= 990, 990, 1000),
+        (st.integers(min_value=5), lambda x: x < 10, 5, 9),
+        (st.integers(max_value=10), partial(operator.le, 3), 3, 10),
+    ],
+)
+def test_filtering_integers_narrows_bounds(strategy, predicate, start, end):
+    s = strategy.filter(predicate)
+    assert isinstance(s, FilteredStrategy)
+    narrowed = s.filtered_strategy.wrapped_strategy
+    assert isinstance(narrowed, BoundedIntStrategy)
+    assert (narrowed.start, narrowed.end) == (start, end)
+
+
+def test_chained_filters_narrow_together():
+    s = st.integers().filter(lambda x: x > 0)
+    s = s.filter(lambda x: x < 10)
+    narrowed = s.filtered_strategy.wrapped_strategy
+    assert (narrowed.start, narrowed.end) == (1, 9)
+    assert len(s.flat_conditions) == 2
+
+
+def test_narrowing_keeps_the_repr():
+    s = st.integers(0, 100).filter(lambda x: x > 50)
+    assert repr(s) == "integers(min_value=0, max_value=100).filter(lambda x: x > 50)"
+
+
+def test_narrowing_which_rules_out_every_value_falls_back_to_filtering():
+    s = st.integers(0, 10).filter(lambda x: x > 20)
+    narrowed = s.filtered_strategy.wrapped_strategy
+    assert (narrowed.start, narrowed.end) == (0, 10)
+
+
+def test_invalid_arguments_are_still_reported():
+    s = st.integers(min_value=10, max_value=0).filter(lambda x: x > 0)
+    with pytest.raises(InvalidArgument):
+        s.validate()
+
+
+@given(st.floats().filter(lambda x: 0 < x < 1))
+def test_filtered_floats_are_in_bounds(x):
+    assert 0 < x < 1
+
+
+def test_filtering_floats_narrows_bounds():
+    s = st.floats().filter(lambda x: x >= 1)
+    assert minimal(s) == 1
+    x = minimal(st.floats(allow_infinity=True).filter(lambda x: x < -1))
+    assert -2 < x < -1
+
+
+def test_filtering_floats_respects_allow_nan():
+    s = st.floats(allow_nan=True).filter(lambda x: x >= 1)
+    assert s.filtered_strategy.wrapped_strategy.allow_nan
+
+
+@given(st.text(alphabet="ab_1").filter(str.isidentifier))
+def test_filtered_text_is_nonempty(s):
+    assert s.isidentifier()
+
+
+def test_filtering_text_narrows_sizes():
+    s = st.text().filter(lambda s: 3 <= len(s) < 5)
+    narrowed = s.filtered_strategy.wrapped_strategy
+    assert (narrowed.min_size, narrowed.max_size) == (3, 4)
+    assert minimal(s) == "000"
@@ -108,3 +108,39 @@ def test_subtraction_of_intervals(x, y):
     for a, b in z:
         assert a <= b
     assert intervals_to_set(z) == intervals_to_set(x) - intervals_to_set(y)
+
+
+@given(Intervals, st.integers(-10, 250))
+def test_index_above_is_number_of_smaller_values(intervals, v):
+    assert intervals.index_above(v) == len([x for x in intervals if x < v])
+
+
+@given(Intervals, st.integers(-10, 250))
+def test_contains_matches_list(intervals, v):
+    assert (v in intervals) == (v in list(intervals))
+
+
+@given(Intervals, Intervals)
+def test_union_intersection_and_difference_match_sets(x, y):
+    xs = set(x)
+    ys = set(y)
+    for result, expected in [
+        (x | y, xs | ys),
+        (x & y, xs & ys),
+        (x - y, xs - ys),
+    ]:
+        assert set(result) == expected
+        # The results are normalised, so equal sets have equal intervals.
+        assert result == IntervalSet(build_intervals([(v, 0) for v in expected]))
+
+
+@given(Intervals)
+def test_equal_interval_sets_have_equal_hashes(x):
+    y = IntervalSet(x.intervals)
+    assert x == y
+    assert hash(x) == hash(y)
+
+
+@given(st.text())
+def test_from_string_covers_codepoints(s):
+    assert set(IntervalSet.from_string(s)) == set(map(ord, s))
@@ -33,7 +33,7 @@ from hypothesis.strategies._internal.strategies import (
     filter_not_satisfied,
 )
 
-from tests.common.utils import fails_with
+from tests.common.utils import counts_calls, fails_with
 
 an_enum = enum.Enum("A", "a b c")
 
@@ -82,6 +82,43 @@ def test_filtered_sampling_finds_rare_value(x):
     assert x == 99
 
 
+@given(sampled_from(range(25000)).filter(lambda x: x == 23456))
+def test_filtered_sampling_finds_rare_value_in_large_collection(x):
+    assert x == 23456
+
+
+def test_filtered_sampling_checks_each_element_once():
+    @counts_calls
+    def cond(x):
+        return x == 7
+
+    s = sampled_from(range(100)).filter(cond)
+    for i in range(20):
+        data = ConjectureData.for_buffer(bytes([i]) * 100)
+        assert s.do_draw(data) == 7
+    assert cond.calls <= 100 + 3 * 20 + 20
+
+
+def test_filtered_sampling_does_not_depend_on_earlier_draws():
+    s = sampled_from(range(30000)).filter(lambda x: x % 1000 == 999)
+    buffers = [bytes([i, 255 - i]) * 50 for i in range(10)]
+    first = [s.do_draw(ConjectureData.for_buffer(b)) for b in buffers]
+    second = [s.do_draw(ConjectureData.for_buffer(b)) for b in reversed(buffers)]
+    assert first == second[::-1]
+
+
+def test_filtered_sampling_fallback_is_uniform():
+    # The allowed elements are in the first and third blocks of a collection
+    # whose second block has none, so choosing a block first would favour the
+    # later element.
+    s = sampled_from(range(30000)).filter(lambda x: x in (5, 29999))
+    allowed = s.allowed_indices()
+    chosen = [
+        allowed.choose(ConjectureData.for_buffer(bytes([i]) * 8)) for i in range(256)
+    ]
+    assert chosen.count(5) == chosen.count(29999) == 128
+
+
 @given(st.sets(st.sampled_from(range(50)), min_size=50))
 def test_efficient_sets_of_samples(x):
     assert x == set(range(50))
@@ -448,6 +448,12 @@ def test_derandomise_with_explicit_database_is_invalid():
         {"deadline": 0},
         {"deadline": True},
         {"deadline": False},
+        {"workers": 0},
+        {"workers": 2.5},
+        {"shrink_time_budget": -1},
+        {"shrink_time_budget": 0},
+        {"shrink_time_budget": True},
+        {"shrink_time_budget": "1"},
     ],
 )
 def test_invalid_settings_are_errors(kwargs):
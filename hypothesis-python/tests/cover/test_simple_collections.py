@@ -18,21 +18,31 @@ from random import Random
 
 import pytest
 
-from hypothesis import given, settings
+from hypothesis import find, given, settings
+from hypothesis.errors import InvalidArgument
+from hypothesis.internal.conjecture import utils as cu
+from hypothesis.internal.conjecture.data import ConjectureData, Status, StopTest
 from hypothesis.strategies import (
     booleans,
+    data,
     dictionaries,
     fixed_dictionaries,
+    floats,
     frozensets,
     integers,
+    just,
     lists,
     none,
     nothing,
+    sampled_from,
     sets,
     text,
     tuples,
 )
 
+from hypothesis.strategies._internal.collections import ListStrategy
+from hypothesis.strategies._internal.strategies import SearchStrategy
+
 from tests.common.debug import find_any, minimal
 from tests.common.utils import flaky
 
@@ -187,3 +197,106 @@ def test_lists_unique_by_tuple_funcs(ls):
     firstitems, seconditems = zip(*ls)
     assert len(set(firstitems)) == len(firstitems)
     assert len(set(seconditems)) == len(seconditems)
+
+
+@given(lists(integers(0, 200), unique=True, min_size=190))
+def test_can_fill_most_of_a_range_with_unique_integers(ls):
+    assert len(set(ls)) == len(ls) >= 190
+    assert all(0 <= x <= 200 for x in ls)
+
+
+@given(lists(integers(5, 10), unique=True))
+def test_unique_integer_lists_can_use_whole_range(ls):
+    assert len(set(ls)) == len(ls) <= 6
+    assert all(5 <= x <= 10 for x in ls)
+
+
+def test_unique_integer_lists_shrink_to_smallest_values():
+    assert minimal(lists(integers(3, 100), unique=True, min_size=5)) == [3, 4, 5, 6, 7]
+
+
+def test_dictionaries_with_integer_keys_shrink_to_smallest_keys():
+    assert minimal(dictionaries(integers(0, 10), booleans(), min_size=3)) == {
+        0: False,
+        1: False,
+        2: False,
+    }
+
+
+def test_unique_integer_lists_too_large_for_range_are_invalid():
+    with pytest.raises(InvalidArgument):
+        lists(integers(0, 9), unique=True, min_size=11).validate()
+
+
+class ListOneAtATime(ListStrategy):
+    # Draws elements as ListStrategy did before do_draw_many existed.
+
+    def calc_label(self):
+        return ListStrategy(self.element_strategy).label
+
+    def do_draw(self, data):
+        elements = cu.many(data, min_size=0, max_size=float("inf"), average_size=5)
+        result = []
+        while elements.more():
+            result.append(data.draw(self.element_strategy))
+        return result
+
+
+def examples_of(data):
+    data.freeze()
+    return [(ex.label, ex.start, ex.end, ex.discarded) for ex in data.examples]
+
+
+@pytest.mark.parametrize(
+    "element_strategy",
+    [
+        integers(0, 10),
+        integers(0, 2 ** 40),
+        integers(),
+        booleans(),
+        sampled_from("abc"),
+        sampled_from(range(10)).filter(lambda x: x % 3),
+        just(None),
+        floats(),
+        text(max_size=2),
+    ],
+    ids=repr,
+)
+@pytest.mark.parametrize("seed", range(5))
+def test_drawing_many_elements_matches_drawing_each(element_strategy, seed):
+    buffer = Random(seed).getrandbits(8 * 1000).to_bytes(1000, "big")
+    bulk = ConjectureData.for_buffer(buffer)
+    expected = ConjectureData.for_buffer(buffer)
+    assert bulk.draw(ListStrategy(element_strategy)) == expected.draw(
+        ListOneAtATime(element_strategy)
+    )
+    assert bulk.buffer == expected.buffer
+    assert examples_of(bulk) == examples_of(expected)
+
+
+def test_cannot_find_lists_of_elements_which_do_not_support_find():
+    with pytest.raises(InvalidArgument):
+        find(lists(data(), min_size=1), lambda x: True)
+
+
+
+class InvalidStrategy(SearchStrategy):
+    def do_validate(self):
+        raise InvalidArgument("never valid")
+
+    def do_draw(self, data):
+        return None
+
+
+def test_drawing_many_elements_validates_the_element_strategy():
+    data = ConjectureData.for_buffer(bytes([1]) * 10)
+    with pytest.raises(InvalidArgument):
+        ListStrategy(InvalidStrategy()).do_draw(data)
+
+
+def test_drawing_many_elements_from_an_empty_strategy_is_invalid():
+    data = ConjectureData.for_buffer(bytes([1]) * 10)
+    elements = cu.many(data, min_size=1, max_size=3, average_size=2)
+    with pytest.raises(StopTest):
+        nothing().draw_many(data, elements)
+    assert data.status == Status.INVALID
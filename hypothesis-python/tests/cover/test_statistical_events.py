@@ -44,7 +44,7 @@ def call_for_statistics(test_function):
 
 
 def unique_events(stats):
-    return set(sum((t["events"] for t in stats["generate-phase"]["test-cases"]), []))
+    return set(stats["generate-phase"]["events"])
 
 
 def test_notes_hard_to_satisfy():
@@ -13,7 +13,14 @@
 #
 # END HEADER
 
-from hypothesis.strategies._internal.strings import OneCharStringStrategy
+from random import Random
+
+import pytest
+
+from hypothesis import strategies as st
+from hypothesis.internal.conjecture.data import ConjectureData
+from hypothesis.internal.conjecture.engine import BUFFER_SIZE
+from hypothesis.strategies._internal.strings import OneCharStringStrategy, TextStrategy
 
 
 def test_rewriting_integers_covers_right_range():
@@ -21,3 +28,39 @@ def test_rewriting_integers_covers_right_range():
 
     rewritten = [strategy.rewrite_integer(i) for i in range(256)]
     assert sorted(rewritten) == sorted(range(256))
+
+
+@pytest.mark.parametrize(
+    "alphabet",
+    [
+        st.characters(),
+        st.characters(max_codepoint=127),
+        st.characters(whitelist_categories=["Lu"]),
+        st.sampled_from("abc"),
+        st.just("a"),
+    ],
+)
+@pytest.mark.parametrize("seed", range(5))
+def test_text_draws_same_data_as_joined_lists(alphabet, seed):
+    def draw(strategy):
+        data = ConjectureData(BUFFER_SIZE, b"", random=Random(seed))
+        return data.draw(strategy), bytes(data.buffer)
+
+    assert draw(st.text(alphabet)) == draw(st.lists(alphabet).map("".join))
+
+
+def test_text_is_a_text_strategy():
+    assert isinstance(st.text().wrapped_strategy, TextStrategy)
+
+
+@pytest.mark.parametrize("max_codepoint", [127, None])
+@pytest.mark.parametrize("size", [10, 1000, 100000])
+def test_can_draw_text_of_fixed_size(size, max_codepoint):
+    strategy = st.text(
+        st.characters(max_codepoint=max_codepoint), min_size=size, max_size=size
+    )
+    data = ConjectureData(10 * size, b"", random=Random(0))
+    result = data.draw(strategy)
+    assert len(result) == size
+    if max_codepoint is not None:
+        assert max(map(ord, result)) <= max_codepoint
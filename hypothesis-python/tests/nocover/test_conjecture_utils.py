@@ -44,3 +44,9 @@ def test_gives_the_correct_probabilities():
             i += 256
         else:
             i += 1
+
+
+def test_sampler_for_reuses_samplers_for_equal_weights():
+    sampler = cu.sampler_for((1.0, 2.0, 3.0))
+    assert cu.sampler_for((1.0, 2.0, 3.0)) is sampler
+    assert sampler.table == cu.Sampler([1.0, 2.0, 3.0]).table
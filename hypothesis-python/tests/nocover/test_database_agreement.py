@@ -18,7 +18,11 @@ import shutil
 import tempfile
 
 from hypothesis import strategies as st
-from hypothesis.database import DirectoryBasedExampleDatabase, InMemoryExampleDatabase
+from hypothesis.database import (
+    DirectoryBasedExampleDatabase,
+    InMemoryExampleDatabase,
+    SQLiteExampleDatabase,
+)
 from hypothesis.stateful import Bundle, RuleBasedStateMachine, rule
 
 
@@ -32,6 +36,7 @@ class DatabaseComparison(RuleBasedStateMachine):
             DirectoryBasedExampleDatabase(exampledir),
             InMemoryExampleDatabase(),
             DirectoryBasedExampleDatabase(exampledir),
+            SQLiteExampleDatabase(os.path.join(self.tempd, "examples.sqlite3")),
         ]
 
     keys = Bundle("keys")
@@ -60,6 +65,24 @@ class DatabaseComparison(RuleBasedStateMachine):
         for db in self.dbs:
             db.move(k1, k2, v)
 
+    @rule(items=st.lists(st.tuples(keys, values)))
+    def save_many(self, items):
+        for db in self.dbs:
+            db.save_many(items)
+
+    @rule(items=st.lists(st.tuples(keys, values)))
+    def delete_many(self, items):
+        for db in self.dbs:
+            db.delete_many(items)
+
+    @rule(ks=st.lists(keys))
+    def fetch_many_agrees_with_fetch(self, ks):
+        for db in self.dbs:
+            fetched = db.fetch_many(ks)
+            assert set(fetched) == set(ks)
+            for k in ks:
+                assert sorted(fetched[k]) == sorted(set(db.fetch(k))), db
+
     @rule(k=keys)
     def values_agree(self, k):
         last = None
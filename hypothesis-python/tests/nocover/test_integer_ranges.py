@@ -13,10 +13,13 @@
 #
 # END HEADER
 
+from random import Random
+
 import pytest
 
 from hypothesis import given
-from hypothesis.internal.conjecture.utils import integer_range
+from hypothesis.internal.conjecture.data import ConjectureData
+from hypothesis.internal.conjecture.utils import integer_range, integer_range_drawer
 from hypothesis.strategies import integers
 from hypothesis.strategies._internal.strategies import SearchStrategy
 
@@ -58,3 +61,17 @@ def test_bounded_integers_distribution_of_bit_width_issue_1387_regression():
     huge = sum(x > 1e97 for x in values)
     assert huge != 0
     assert huge <= 0.3 * len(values)  # expected ~1/8
+
+
+@pytest.mark.parametrize(
+    "lower, upper", [(0, 0), (3, 3), (0, 1), (-10, 10), (0, 2 ** 24), (0, 2 ** 70)]
+)
+@pytest.mark.parametrize("seed", range(3))
+def test_integer_range_drawer_matches_integer_range(lower, upper, seed):
+    def draw(f):
+        data = ConjectureData(1000, b"", random=Random(seed))
+        values = [f(data) for _ in range(20)]
+        return values, bytes(data.buffer)
+
+    drawer = integer_range_drawer(lower, upper)
+    assert draw(drawer) == draw(lambda data: integer_range(data, lower, upper))
@@ -72,6 +72,30 @@ def test_can_minimize_float_arrays():
     assert x.sum() in (1, 50)
 
 
+@pytest.mark.parametrize(
+    "dtype", ["int8", "uint16", ">i4", "float16", "float64", "complex128"]
+)
+def test_dense_numeric_arrays_minimize_to_zeros(dtype):
+    x = minimal(nps.arrays(dtype, (4, 5), fill=st.nothing()))
+    assert x.shape == (4, 5)
+    assert not x.any()
+
+
+@settings(suppress_health_check=[HealthCheck.large_base_example])
+@given(nps.arrays("float64", (30, 30), fill=st.nothing()))
+def test_can_generate_large_dense_numeric_arrays(x):
+    assert x.shape == (30, 30)
+    assert x.base is None
+    assert x.flags.writeable
+
+
+def test_dense_numeric_arrays_include_interesting_values():
+    find_any(
+        nps.arrays("float64", 20, fill=st.nothing()),
+        lambda x: np.isinf(x).any(),
+    )
+
+
 class Foo:
     pass
 
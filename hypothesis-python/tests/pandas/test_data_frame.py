@@ -18,7 +18,7 @@ import numpy as np
 from hypothesis import HealthCheck, given, reject, settings, strategies as st
 from hypothesis.extra import numpy as npst, pandas as pdst
 
-from tests.common.debug import find_any
+from tests.common.debug import find_any, minimal
 from tests.pandas.helpers import supported_by_pandas
 
 
@@ -243,3 +243,48 @@ def test_will_fill_missing_columns_in_tuple_row(df):
 )
 def test_can_generate_unique_columns(df):
     assert set(df[0]) == set(range(10))
+
+
+@given(
+    pdst.data_frames(
+        [pdst.column("A", elements=st.lists(st.none(), max_size=2))],
+        index=pdst.range_indexes(1, 5),
+    )
+)
+def test_can_generate_columns_of_sequences(df):
+    for value in df["A"]:
+        assert isinstance(value, list)
+
+
+@settings(suppress_health_check=[HealthCheck.large_base_example])
+@given(
+    pdst.data_frames(
+        pdst.columns(["A", "B"], dtype=float, fill=st.nothing()),
+        index=pdst.range_indexes(200, 200),
+    )
+)
+def test_can_generate_large_dense_numeric_columns(df):
+    assert len(df) == 200
+    assert df["A"].dtype == df["B"].dtype == np.dtype(float)
+
+
+def test_dense_numeric_columns_shrink_to_zeros():
+    df = minimal(
+        pdst.data_frames(
+            pdst.columns(["A"], dtype=int, fill=st.nothing()),
+            index=pdst.range_indexes(5, 5),
+        )
+    )
+    assert list(df["A"]) == [0] * 5
+
+
+@given(
+    pdst.data_frames(
+        pdst.columns(["A", "B"], dtype=int),
+        rows=st.integers(0, 100).map(lambda x: (x, x + 1)),
+        index=pdst.range_indexes(50, 50),
+    )
+)
+def test_rows_are_assigned_to_the_right_columns(df):
+    assert len(df) == 50
+    assert (df["B"] == df["A"] + 1).all()
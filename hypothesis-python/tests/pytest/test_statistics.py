@@ -13,11 +13,15 @@
 #
 # END HEADER
 
+import json
 from distutils.version import LooseVersion
 
 import pytest
 
-from hypothesis.extra.pytestplugin import PRINT_STATISTICS_OPTION
+from hypothesis.extra.pytestplugin import (
+    PRINT_STATISTICS_OPTION,
+    STATISTICS_JSON_OPTION,
+)
 
 pytest_plugins = "pytester"
 
@@ -86,6 +90,17 @@ def test_prints_statistics_given_option_under_xdist_with_junitxml(testdir):
     assert "< 10% of examples satisfied assumptions" in out
 
 
+@pytest.mark.parametrize("args", [(), ("-n", "2")])
+def test_writes_statistics_as_json_given_option(testdir, args):
+    path = testdir.tmpdir.join("stats.json")
+    get_output(testdir, TESTSUITE, f"{STATISTICS_JSON_OPTION}={path}", *args)
+    stats = {s["nodeid"].split("::")[-1]: s for s in json.loads(path.read())}
+    assert set(stats) == {"test_all_valid", "test_iterations"}
+    generate = stats["test_all_valid"]["generate-phase"]
+    assert generate["statuses"] == {"valid": generate["num-test-cases"]}
+    assert "satisfied assumptions" in stats["test_iterations"]["stopped-because"]
+
+
 UNITTEST_TESTSUITE = """
 
 from hypothesis import given
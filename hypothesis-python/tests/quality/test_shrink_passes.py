@@ -0,0 +1,136 @@
+# This file is part of Hypothesis, which may be found at
+# https://github.com/HypothesisWorks/hypothesis/
+#
+# Most of this work is copyright (C) 2013-2021 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by others. See
+# CONTRIBUTING.rst for a full list of people who may hold copyright, and
+# consult the git log if you need to determine who owns an individual
+# contribution.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+#
+# END HEADER
+
+"""Tests and benchmarks for the shrink pass statistics which we store in the
+example database, on problems like those in ``test_shrink_quality.py``.
+
+Run this module to print the total number of calls made by the shrink phase
+for each problem, over several runs which either start from no shrink pass
+statistics or share them through the database as repeated runs of a test
+would, with ``python -m tests.quality.test_shrink_passes``.
+"""
+
+from random import Random
+
+import pytest
+
+from hypothesis import HealthCheck, Phase, settings, strategies as st
+from hypothesis.database import InMemoryExampleDatabase
+from hypothesis.internal.conjecture.engine import ConjectureRunner
+from hypothesis.internal.conjecture.shrinker import sort_key
+
+PROBLEMS = {
+    "sum_of_list": (st.lists(st.integers()), lambda x: sum(x) > 1000),
+    "list_of_strings": (
+        st.lists(st.text()),
+        lambda x: len(x) >= 10 and sum(map(len, x)) >= 30,
+    ),
+    "sets_of_sets": (st.sets(st.frozensets(st.integers())), lambda x: len(x) >= 4),
+    "floats_and_int": (
+        st.tuples(st.floats(), st.floats(), st.integers()),
+        lambda x: x[0] + x[1] > 1000 and x[2] > 100,
+    ),
+    "dictionary": (
+        st.dictionaries(st.integers(), st.text()),
+        lambda x: len(x) >= 5 and any(len(v) > 3 for v in x.values()),
+    ),
+    "nested_lists": (
+        st.lists(st.lists(st.integers(0, 100))),
+        lambda x: len(x) > 3 and sum(map(sum, x)) > 500,
+    ),
+}
+
+
+def shrink_calls(problem, seed, database):
+    """Find and shrink a failing example for ``problem``, and return the
+    number of calls made by the shrink phase and the runner."""
+    strategy, predicate = PROBLEMS[problem]
+
+    def test_function(data):
+        if predicate(data.draw(strategy)):
+            data.mark_interesting()
+
+    runner = ConjectureRunner(
+        test_function,
+        settings=settings(
+            database=database,
+            max_examples=1000,
+            phases=[Phase.reuse, Phase.generate, Phase.shrink],
+            suppress_health_check=HealthCheck.all(),
+        ),
+        random=Random(seed),
+        database_key=problem.encode(),
+    )
+    calls_before_shrinking = []
+    shrink_interesting_examples = runner.shrink_interesting_examples
+
+    def record_calls():
+        calls_before_shrinking.append(runner.call_count)
+        shrink_interesting_examples()
+
+    runner.shrink_interesting_examples = record_calls
+    runner.run()
+    return runner.call_count - calls_before_shrinking[0], runner
+
+
+def total_shrink_calls(problem, n_runs, share_statistics):
+    """Return the total number of calls made by the shrink phase in
+    ``n_runs`` runs with different seeds. Each run starts with an empty
+    database, except that the shrink pass statistics are carried over from
+    the previous run if ``share_statistics`` is true."""
+    total = 0
+    statistics = {}
+    for seed in range(n_runs):
+        db = InMemoryExampleDatabase()
+        if share_statistics:
+            db.data.update(statistics)
+        calls, runner = shrink_calls(problem, seed, db)
+        total += calls
+        key = runner.pass_statistics_key
+        statistics = {key: db.data[key]}
+    return total
+
+
+def shrunk_buffers(runner):
+    return sorted(
+        (v.buffer for v in runner.interesting_examples.values()), key=sort_key
+    )
+
+
+@pytest.mark.parametrize("problem", sorted(PROBLEMS))
+def test_stored_shrink_pass_statistics_do_not_hurt_shrinking(problem):
+    db = InMemoryExampleDatabase()
+    calls, runner = shrink_calls(problem, 1, db)
+    assert calls > 0
+    key = runner.pass_statistics_key
+    statistics = {key: db.data[key]}
+    assert statistics[key]
+
+    _, fresh = shrink_calls(problem, 0, InMemoryExampleDatabase())
+    db = InMemoryExampleDatabase()
+    db.data.update(statistics)
+    _, shared = shrink_calls(problem, 0, db)
+    assert shared.pass_statistics != fresh.pass_statistics
+    assert [sort_key(b) for b in shrunk_buffers(shared)] <= [
+        sort_key(b) for b in shrunk_buffers(fresh)
+    ]
+
+
+if __name__ == "__main__":
+    print(f"{'problem':>16} {'fresh':>8} {'shared':>8}")
+    for problem in PROBLEMS:
+        fresh = total_shrink_calls(problem, n_runs=8, share_statistics=False)
+        shared = total_shrink_calls(problem, n_runs=8, share_statistics=True)
+        print(f"{problem:>16} {fresh:>8} {shared:>8}")
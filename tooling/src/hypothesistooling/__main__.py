@@ -466,6 +466,15 @@ def audit_rust_in_ruby():
     hr.cargo("audit")
 
 
+@task()
+def update_charmap():
+    """Write the charmap that Hypothesis bundles for the Unicode version of
+    the running Python, so that users do not have to compute it."""
+    from hypothesis.internal import charmap as cm
+
+    cm._write_charmap_file(cm.bundled_charmap_file(), cm._compute_charmap())
+
+
 @task()
 def python(*args):
     os.execv(sys.executable, (sys.executable,) + args)